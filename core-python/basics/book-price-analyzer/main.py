@@ -1,19 +1,46 @@
 """Book Price Analyzer"""
 
-from module.book_price_analyzer import read_books, calculate_stats, write_expensive_books
+import argparse
+
+from module.book_cache import cached_books
+from module.book_price_analyzer import iter_books, analyze_books
+from module.parallel_scanner import analyze_books_parallel
 
 def main() -> None:
     """Execute main program"""
+    parser = argparse.ArgumentParser(description="Summarize book prices")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="scan with N processes over a memory-mapped file (0 = serial stream)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always re-parse books.txt instead of using the binary cache",
+    )
+    args = parser.parse_args()
+
     input_file: str = "books.txt"
     output_file: str = "expensive_books.txt"
-    books: list[tuple[str, float]] = read_books(input_file)
 
-    if books:
-        total, avg = calculate_stats(books)
+    if args.workers:
+        result = analyze_books_parallel(input_file, output_file, workers=args.workers)
+    elif args.no_cache:
+        # Stream books straight from the file: one pass, constant memory
+        result = analyze_books(iter_books(input_file), output_file)
+    else:
+        # Same stream, but warm starts read the parsed columns from the cache
+        result = analyze_books(cached_books(input_file), output_file)
+
+    if result is None:
+        return  # the write error is already reported
+    count, total, avg = result
+    if count:
         print("Book Price Summary:")
         print(f"Total Price: ${total:.2f}")
         print(f"Average Price: ${avg:.2f}")
-        write_expensive_books(books, output_file)
     else:
         print("No valid book data to process.")
 
@@ -0,0 +1,332 @@
+"""Binary sidecar cache of parsed book catalogs
+
+Cache file layout (native byte order):
+
+    header | source path | padding to 8 bytes | prices (float64 * count) | titles | skipped
+
+Titles are UTF-8, each terminated by a newline (a parsed title never
+contains one); so are the "Skipping invalid line" messages of the parse,
+which warm starts print again. The header records the source size and
+mtime, so a changed books.txt invalidates its cache automatically.
+"""
+
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from typing import IO, Iterable, Iterator, NamedTuple
+
+from module.book_price_analyzer import iter_books
+from module.book_table import BookTable
+
+MAGIC: bytes = b"BOOKCAC2"
+# magic, size, mtime_ns, count, titles_len, skipped_len, path_len
+HEADER = struct.Struct("=8sQqQQQQ")
+
+DEFAULT_CACHE_DIR: str = ".book_cache"
+DEFAULT_MAX_BYTES: int = 256 << 20
+SPILL_ROWS: int = 65536  # rows buffered before spilling to the temp files
+BLOCK_BYTES: int = 1 << 20  # titles decoded per block on warm iteration
+
+
+def cache_path(file_path: str, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """Return the cache file used for a source file"""
+    key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{key}.bin")
+
+
+class _Cache(NamedTuple):
+    """A mapped cache file and the offsets of its sections"""
+
+    mm: mmap.mmap
+    rows: int
+    prices_at: int
+    titles_at: int
+    titles_len: int
+    skipped_len: int
+
+
+def _open_cache(file_path: str, cache_dir: str) -> _Cache | None:
+    """Map a valid cache into memory, or return None if missing or stale"""
+
+    try:
+        stat = os.stat(file_path)
+        with open(cache_path(file_path, cache_dir), "rb") as file:
+            mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # missing source/cache, or empty cache file
+        return None
+
+    try:
+        magic, size, mtime_ns, count, titles_len, skipped_len, path_len = HEADER.unpack_from(mm)
+        path_at = HEADER.size
+        prices_at = -(-(path_at + path_len) // 8) * 8
+        titles_at = prices_at + 8 * count
+        valid = (
+            magic == MAGIC
+            and size == stat.st_size
+            and mtime_ns == stat.st_mtime_ns
+            and mm[path_at : path_at + path_len]
+            == os.path.abspath(file_path).encode("utf-8")
+            and len(mm) == titles_at + titles_len + skipped_len
+        )
+    except struct.error:
+        valid = False
+    if not valid:
+        mm.close()
+        return None
+
+    # Touch the cache so pruning evicts least recently used entries first
+    try:
+        os.utime(cache_path(file_path, cache_dir))
+    except OSError:  # read-only cache: still usable
+        pass
+    return _Cache(mm, count, prices_at, titles_at, titles_len, skipped_len)
+
+
+def _replay_skipped(cache: _Cache) -> None:
+    """Print the skip messages of the parse that built the cache"""
+    start = cache.titles_at + cache.titles_len
+    for message in cache.mm[start : start + cache.skipped_len].decode("utf-8").splitlines():
+        print(message)
+
+
+def load_cached_table(
+    file_path: str, cache_dir: str = DEFAULT_CACHE_DIR
+) -> BookTable | None:
+    """Return a BookTable whose prices are memory-mapped from the cache, or None"""
+
+    opened = _open_cache(file_path, cache_dir)
+    if opened is None:
+        return None
+    _replay_skipped(opened)
+    mm, prices_at, titles_at, titles_len = opened.mm, opened.prices_at, opened.titles_at, opened.titles_len
+    prices = memoryview(mm)[prices_at:titles_at].cast("d")
+    titles = mm[titles_at : titles_at + titles_len].decode("utf-8").split("\n")[:-1]
+    return BookTable(titles, prices)
+
+
+def iter_cached(
+    file_path: str, cache_dir: str = DEFAULT_CACHE_DIR
+) -> Iterator[tuple[str, float]] | None:
+    """Return an iterator over cached (title, price) rows, or None if stale"""
+
+    opened = _open_cache(file_path, cache_dir)
+    if opened is None:
+        return None
+    return _iter_rows(opened)
+
+
+def _iter_rows(cache: _Cache) -> Iterator[tuple[str, float]]:
+    """Yield rows block by block, so memory stays bounded on warm starts too"""
+
+    mm, prices_at, titles_at, titles_len = cache.mm, cache.prices_at, cache.titles_at, cache.titles_len
+    with mm:
+        _replay_skipped(cache)
+        prices = memoryview(mm)[prices_at:titles_at].cast("d")
+        try:
+            row = 0
+            start, end = titles_at, titles_at + titles_len
+            while start < end:
+                stop = mm.rfind(b"\n", start, min(start + BLOCK_BYTES, end)) + 1
+                if stop <= start:  # a single title longer than one block
+                    stop = mm.find(b"\n", start, end) + 1
+                titles = mm[start:stop].decode("utf-8").split("\n")[:-1]
+                yield from zip(titles, prices[row : row + len(titles)])
+                row += len(titles)
+                start = stop
+        finally:
+            prices.release()
+
+
+def cache_books(
+    books: Iterable[tuple[str, float]],
+    file_path: str,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    skipped: list[str] | None = None,
+) -> Iterator[tuple[str, float]]:
+    """Pass books through unchanged while writing them to the cache
+
+    The cache is only committed when the stream is fully consumed. Skip
+    messages appended to `skipped` while books are read (see
+    cached_books) are stored with it, and drained from the list. Caching
+    is best-effort: if the cache cannot be written, the error is printed,
+    caching stops and the books are still passed through.
+    """
+
+    skipped = [] if skipped is None else skipped
+    try:
+        stat = os.stat(file_path)  # taken first: edits during the read invalidate it
+        os.makedirs(cache_dir, exist_ok=True)
+        parts = _temp_files(cache_dir, 3)
+    except OSError as e:
+        print(f"Error writing cache for {file_path}: {e}")
+        yield from books
+        return
+
+    prices_tmp, titles_tmp, skipped_tmp = parts
+    caching = True
+    try:
+        count = 0
+        prices: array = array("d")
+        titles: list[str] = []
+        for title, price in books:
+            if caching:
+                prices.append(price)
+                titles.append(title)
+                if len(titles) >= SPILL_ROWS:
+                    try:
+                        count += _spill(prices, titles, prices_tmp, titles_tmp)
+                        _spill_lines(skipped, skipped_tmp)
+                    except OSError as e:  # e.g. disk full: keep analyzing without the cache
+                        print(f"Error writing cache for {file_path}: {e}")
+                        caching = False
+                        del prices[:]
+                        titles.clear()
+            if not caching:
+                skipped.clear()
+            yield title, price
+        if not caching:
+            return
+        try:
+            count += _spill(prices, titles, prices_tmp, titles_tmp)
+            _spill_lines(skipped, skipped_tmp)
+            _commit_cache(file_path, cache_dir, stat, count, prices_tmp, titles_tmp, skipped_tmp)
+        except OSError as e:
+            print(f"Error writing cache for {file_path}: {e}")
+            return
+    finally:
+        for part in parts:
+            part.close()  # temporary files: removed on close
+    try:
+        prune_cache(cache_dir, max_bytes, keep=cache_path(file_path, cache_dir))
+    except OSError as e:
+        print(f"Error pruning cache {cache_dir}: {e}")
+
+
+def _temp_files(cache_dir: str, count: int) -> list[IO[bytes]]:
+    """Open `count` anonymous temp files in cache_dir, all or none"""
+    parts: list[IO[bytes]] = []
+    try:
+        for _ in range(count):
+            parts.append(tempfile.TemporaryFile(dir=cache_dir))
+    except OSError:
+        for part in parts:
+            part.close()
+        raise
+    return parts
+
+
+def _commit_cache(
+    file_path: str,
+    cache_dir: str,
+    stat: os.stat_result,
+    count: int,
+    prices_tmp: IO[bytes],
+    titles_tmp: IO[bytes],
+    skipped_tmp: IO[bytes],
+) -> None:
+    """Assemble the spilled sections into the cache file, atomically"""
+    path_bytes = os.path.abspath(file_path).encode("utf-8")
+    header = HEADER.pack(
+        MAGIC,
+        stat.st_size,
+        stat.st_mtime_ns,
+        count,
+        titles_tmp.tell(),
+        skipped_tmp.tell(),
+        len(path_bytes),
+    )
+    padding = -(len(header) + len(path_bytes)) % 8
+
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(header + path_bytes + b"\0" * padding)
+            for part in (prices_tmp, titles_tmp, skipped_tmp):
+                part.seek(0)
+                shutil.copyfileobj(part, out)
+        os.replace(tmp_path, cache_path(file_path, cache_dir))
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _spill(
+    prices: array, titles: list[str], prices_tmp: IO[bytes], titles_tmp: IO[bytes]
+) -> int:
+    """Append buffered rows to the temp files, clear the buffers, return the count"""
+    if not titles:
+        return 0
+    prices.tofile(prices_tmp)
+    count = len(titles)
+    del prices[:]
+    _spill_lines(titles, titles_tmp)
+    return count
+
+
+def _spill_lines(lines: list[str], out: IO[bytes]) -> None:
+    """Append newline-terminated lines to a temp file and clear the list"""
+    if lines:
+        out.write(("\n".join(lines) + "\n").encode("utf-8"))
+        lines.clear()
+
+
+def prune_cache(cache_dir: str, max_bytes: int, keep: str | None = None) -> None:
+    """Delete least recently used cache files until the directory fits max_bytes"""
+
+    entries: list[tuple[float, int, str]] = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(".bin"):
+            path = os.path.join(cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path != keep:
+            os.remove(path)
+            total -= size
+
+
+def cached_books(
+    file_path: str,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> Iterator[tuple[str, float]]:
+    """Stream books from the cache when fresh, else parse the text and cache it
+
+    Either way the same "Skipping invalid line" messages are printed.
+    """
+
+    rows = iter_cached(file_path, cache_dir)
+    if rows is not None:
+        return rows
+    if not os.path.isfile(file_path):
+        return iter_books(file_path)  # prints the usual "not found" error
+    skipped: list[str] = []
+
+    def record(message: str) -> None:
+        print(message)
+        skipped.append(message)
+
+    books = iter_books(file_path, on_invalid=record)
+    return cache_books(books, file_path, cache_dir, max_bytes, skipped=skipped)
+
+
+def load_book_table(
+    file_path: str,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> BookTable:
+    """Return a BookTable, memory-mapped from the cache when it is fresh"""
+
+    table = load_cached_table(file_path, cache_dir)
+    if table is None:
+        table = BookTable.from_books(cached_books(file_path, cache_dir, max_bytes))
+    return table
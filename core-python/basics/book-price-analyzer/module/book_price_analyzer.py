@@ -1,49 +1,102 @@
-def read_books(file_path: str) -> list[tuple[str, float]]:
-    """Open a text file and returns a list of (title, price) tuple"""
+from typing import Callable, Iterable, Iterator
+
+from modules.bulk_writer import BulkWriter
+
+EXPENSIVE_ROW: str = "%s: $%.2f\n"  # same text as f"{title}: ${price:.2f}\n"
+
+
+def iter_books(
+    file_path: str, on_invalid: Callable[[str], None] = print
+) -> Iterator[tuple[str, float]]:
+    """Yield (title, price) tuples one line at a time
+
+    on_invalid receives the "Skipping invalid line" message of each
+    malformed line (printed by default).
+    """
 
-    books: list[tuple[str, float]] = []
     try:
         with open(file_path, "r", encoding="utf-8") as file:
             for line in file:
                 # Each line: "title,price"
                 parts = line.strip().split(",")
                 if len(parts) != 2:
-                    print(f"Skipping invalid line: {line.strip()}")
+                    on_invalid(f"Skipping invalid line: {line.strip()}")
                     continue
                 try:
                     title, price_str = parts
                     price: float = float(price_str)
-                    books.append((title, price))
+                    yield title, price
                 except ValueError:
                     continue
                     # print(f"Error: Invalid price format on title: '{parts[0]}'.")
-        return books
     except FileNotFoundError:
         print(f"Error: File {file_path} not found.")
-        return []
 
 
-def calculate_stats(books: list[tuple[str, float]]) -> tuple[float, float]:
-    """Return total and avg price from a list of books"""
-    if not books:
+def read_books(file_path: str) -> list[tuple[str, float]]:
+    """Open a text file and returns a list of (title, price) tuple"""
+    return list(iter_books(file_path))
+
+
+def calculate_stats(books: Iterable[tuple[str, float]]) -> tuple[float, float]:
+    """Return total and avg price from a list (or stream) of books"""
+    total: float = 0.0
+    count: int = 0
+    for _, price in books:
+        total += price
+        count += 1
+    if not count:
         return 0.0, 0.0
-    prices = [price for _, price in books]
-    total = sum(prices)
-    avg = total / len(prices)
-    return total, avg
+    return total, total / count
 
 
 def write_expensive_books(
-    books: list[tuple[str, float]], output_file: str, threshold: float = 20.0
+    books: Iterable[tuple[str, float]],
+    output_file: str,
+    threshold: float = 20.0,
+    atomic: bool = False,
 ) -> None:
     """Save titles and price of expensive books"""
 
     try:
-        with open(output_file, "w", encoding="utf-8") as file:
+        with BulkWriter(output_file, atomic=atomic) as writer:
+            writer.write_rows(
+                EXPENSIVE_ROW, (book for book in books if book[1] >= threshold)
+            )
+        print(f"Expensive books written to {output_file} ({writer.summary()})")
+    except IOError as e:
+        print(f"Error writing to {output_file}: {e}")
+
+
+def analyze_books(
+    books: Iterable[tuple[str, float]],
+    output_file: str,
+    threshold: float = 20.0,
+    atomic: bool = False,
+) -> tuple[int, float, float] | None:
+    """Single pass over books: write expensive ones, return (count, total, avg)
+
+    Only the running total, the count and one output chunk are kept, so
+    memory stays constant whatever the size of the stream. Returns None
+    (after printing the error) when the output cannot be written.
+    """
+
+    total: float = 0.0
+    count: int = 0
+    try:
+        with BulkWriter(output_file, atomic=atomic) as writer:
+            expensive: list[tuple[str, float]] = []
             for title, price in books:
+                total += price
+                count += 1
                 if price >= threshold:
-                    file.write(f"{title}: ${price:.2f}\n")
-        print(f"Expensive books written to {output_file}")
+                    expensive.append((title, price))
+                    if len(expensive) >= writer.chunk_rows:
+                        writer.write_rows(EXPENSIVE_ROW, expensive)
+                        expensive.clear()
+            writer.write_rows(EXPENSIVE_ROW, expensive)
+        print(f"Expensive books written to {output_file} ({writer.summary()})")
     except IOError as e:
         print(f"Error writing to {output_file}: {e}")
-
+        return None
+    return count, total, (total / count if count else 0.0)
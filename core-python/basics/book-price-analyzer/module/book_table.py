@@ -0,0 +1,102 @@
+"""Columnar, array-backed book store"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, Sequence
+
+from module.book_price_analyzer import iter_books
+
+
+class BookTable:
+    """Keep titles in one interned list and prices in a contiguous array('d')"""
+
+    def __init__(
+        self, titles: list[str] | None = None, prices: Sequence[float] | None = None
+    ) -> None:
+        self.titles: list[str] = titles if titles is not None else []
+        # Any buffer of doubles works here (array('d'), memoryview.cast('d'), ...)
+        self.prices: Sequence[float] = prices if prices is not None else array("d")
+        if len(self.titles) != len(self.prices):
+            raise ValueError("titles and prices must have the same length")
+        self._order: array | None = None  # row ids sorted by price
+        self._sorted: array | None = None  # prices in ascending order
+
+    @classmethod
+    def from_books(cls, books: Iterable[tuple[str, float]]) -> "BookTable":
+        """Build a table from (title, price) tuples"""
+        table = cls()
+        for title, price in books:
+            table.append(title, price)
+        return table
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "BookTable":
+        """Build a table straight from a books.txt-style file"""
+        return cls.from_books(iter_books(file_path))
+
+    def append(self, title: str, price: float) -> None:
+        """Add one book and invalidate the sorted index"""
+        if not isinstance(self.prices, array):
+            self.prices = array("d", self.prices)
+        self.titles.append(sys.intern(title))
+        self.prices.append(price)
+        self._order = self._sorted = None
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __iter__(self) -> Iterator[tuple[str, float]]:
+        return zip(self.titles, self.prices)
+
+    def total(self) -> float:
+        """Return the sum of all prices"""
+        return sum(self.prices, 0.0)
+
+    def mean(self) -> float:
+        """Return the average price, 0.0 for an empty table"""
+        return self.total() / len(self) if len(self) else 0.0
+
+    def min(self) -> float:
+        """Return the lowest price"""
+        return min(self.prices) if len(self) else 0.0
+
+    def max(self) -> float:
+        """Return the highest price"""
+        return max(self.prices) if len(self) else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Return the q-th percentile (0-100), linearly interpolated"""
+        if not 0 <= q <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        if not len(self):
+            return 0.0
+        _, ranked = self._sorted_index()
+        pos = (len(ranked) - 1) * q / 100
+        low = int(pos)
+        high = min(low + 1, len(ranked) - 1)
+        return ranked[low] + (ranked[high] - ranked[low]) * (pos - low)
+
+    def count_at_least(self, threshold: float) -> int:
+        """Return how many books cost >= threshold (binary search only)"""
+        _, ranked = self._sorted_index()
+        return len(ranked) - bisect_left(ranked, threshold)
+
+    def at_least(
+        self, threshold: float, file_order: bool = True
+    ) -> list[tuple[str, float]]:
+        """Return books with price >= threshold, in file or ascending price order"""
+        order, ranked = self._sorted_index()
+        by_price = order[bisect_left(ranked, threshold) :]
+        rows: Iterable[int] = sorted(by_price) if file_order else by_price
+        titles, prices = self.titles, self.prices
+        return [(titles[row], prices[row]) for row in rows]
+
+    def _sorted_index(self) -> tuple[array, array]:
+        """Build (once) and return row ids and prices in ascending price order"""
+        if self._order is None or self._sorted is None:
+            prices = self.prices
+            order = sorted(range(len(prices)), key=prices.__getitem__)
+            self._order = array("q", order)
+            self._sorted = array("d", [prices[row] for row in order])
+        return self._order, self._sorted
@@ -0,0 +1,133 @@
+"""Parallel, memory-mapped scanner for large book catalogs"""
+
+import io
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from modules.bulk_writer import BulkWriter
+from module.book_price_analyzer import EXPENSIVE_ROW
+
+# (total, count, expensive rows, skipped lines) for one byte range
+PartialResult = tuple[float, int, list[tuple[str, float]], list[str]]
+
+MIN_CHUNK_BYTES: int = 1 << 20  # below this a file is scanned in-process
+MAX_CHUNK_BYTES: int = 64 << 20  # keeps each worker's decoded slice bounded
+
+
+def split_ranges(file_path: str, parts: int) -> list[tuple[int, int]]:
+    """Cut a file into at most `parts` newline-aligned (start, end) byte ranges"""
+
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return []
+    if parts <= 1:
+        return [(0, size)]
+
+    ranges: list[tuple[int, int]] = []
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            for i in range(1, parts):
+                # Move each cut forward to just after the next newline
+                newline = mm.find(b"\n", max(start, size * i // parts))
+                if newline == -1:
+                    break
+                end = newline + 1
+                if end > start:
+                    ranges.append((start, end))
+                    start = end
+            if start < size:
+                ranges.append((start, size))
+    return ranges
+
+
+def scan_range(file_path: str, start: int, end: int, threshold: float) -> PartialResult:
+    """Parse one byte range exactly like iter_books() and return its partial result"""
+
+    total: float = 0.0
+    count: int = 0
+    expensive: list[tuple[str, float]] = []
+    skipped: list[str] = []
+
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = mm[start:end].decode("utf-8")
+
+    # newline=None gives the same universal-newline splitting as open()
+    for line in io.StringIO(text, newline=None):
+        parts = line.strip().split(",")
+        if len(parts) != 2:
+            skipped.append(line.strip())
+            continue
+        try:
+            title, price_str = parts
+            price: float = float(price_str)
+        except ValueError:
+            continue
+        total += price
+        count += 1
+        if price >= threshold:
+            expensive.append((title, price))
+    return total, count, expensive, skipped
+
+
+def _scan_task(task: tuple[str, int, int, float]) -> PartialResult:
+    """Unpack a task tuple for ProcessPoolExecutor.map"""
+    return scan_range(*task)
+
+
+def scan_books_parallel(
+    file_path: str, threshold: float = 20.0, workers: int | None = None
+) -> Iterator[PartialResult]:
+    """Yield partial results of a parallel scan, in file order"""
+
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(file_path)
+    if size < MIN_CHUNK_BYTES:
+        workers = 1
+    parts = max(workers, -(-size // MAX_CHUNK_BYTES))
+    tasks = [
+        (file_path, start, end, threshold)
+        for start, end in split_ranges(file_path, parts)
+    ]
+
+    if workers == 1:
+        yield from map(_scan_task, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() hands results back in submission order, i.e. file order
+        yield from executor.map(_scan_task, tasks)
+
+
+def analyze_books_parallel(
+    file_path: str,
+    output_file: str,
+    threshold: float = 20.0,
+    workers: int | None = None,
+    atomic: bool = False,
+) -> tuple[int, float, float] | None:
+    """Parallel counterpart of analyze_books(): (count, total, avg), None on write errors"""
+
+    if not os.path.isfile(file_path):
+        print(f"Error: File {file_path} not found.")
+        return 0, 0.0, 0.0
+
+    total: float = 0.0
+    count: int = 0
+    try:
+        with BulkWriter(output_file, atomic=atomic) as writer:
+            for part_total, part_count, expensive, skipped in scan_books_parallel(
+                file_path, threshold, workers
+            ):
+                for line in skipped:
+                    print(f"Skipping invalid line: {line}")
+                total += part_total
+                count += part_count
+                writer.write_rows(EXPENSIVE_ROW, expensive)
+        print(f"Expensive books written to {output_file} ({writer.summary()})")
+    except IOError as e:
+        print(f"Error writing to {output_file}: {e}")
+        return None
+    return count, total, (total / count if count else 0.0)
@@ -0,0 +1,97 @@
+import os
+import pytest
+from pathlib import Path
+from module import book_cache
+from module.book_cache import cache_path, cached_books, iter_cached, load_book_table, load_cached_table
+from module.book_price_analyzer import analyze_books, iter_books
+
+TEXT: str = "The Great Gatsby,15.99\nbroken line\n1984,22.50\nInvalid,abc\nCafé,7.25\n"
+
+@pytest.fixture
+def books_file(tmp_path: Path) -> Path:
+    """Small catalog with a malformed line and an invalid price."""
+    path = tmp_path / "books.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    return path
+
+def test_cache_round_trip(books_file: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that cold and warm runs give the same rows and the same messages."""
+    cache_dir = str(tmp_path / "cache")
+    expected = list(iter_books(str(books_file)))
+    expected_out = capsys.readouterr().out
+    assert iter_cached(str(books_file), cache_dir) is None, "Should have no cache yet"
+    cold = list(cached_books(str(books_file), cache_dir))
+    assert cold == expected and capsys.readouterr().out == expected_out, "Cold run should parse the text"
+    assert os.path.exists(cache_path(str(books_file), cache_dir)), "Should write the cache"
+    rows = iter_cached(str(books_file), cache_dir)
+    assert rows is not None and list(rows) == expected, "Warm run should read the cache"
+    assert capsys.readouterr().out == expected_out, "Warm run should replay the skip messages"
+    table = load_cached_table(str(books_file), cache_dir)
+    assert table is not None and list(table) == expected, "Should map the cache into a BookTable"
+    assert capsys.readouterr().out == expected_out, "Should replay the skip messages for tables too"
+
+def test_cache_spills_and_blocks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test spilling to temp files and block-wise warm reads with tiny limits."""
+    monkeypatch.setattr(book_cache, "SPILL_ROWS", 3)
+    monkeypatch.setattr(book_cache, "BLOCK_BYTES", 16)
+    path = tmp_path / "many.txt"
+    path.write_text("".join(f"Title {i},{i}.5\n" if i % 4 else f"bad {i}\n" for i in range(50)), encoding="utf-8")
+    cache_dir = str(tmp_path / "cache")
+    cold = list(cached_books(str(path), cache_dir))
+    cold_out = capsys.readouterr().out
+    assert list(cached_books(str(path), cache_dir)) == cold and len(cold) == 37, "Should round-trip every row"
+    assert capsys.readouterr().out == cold_out and cold_out.count("Skipping") == 13, "Should replay every message"
+
+def test_cache_invalidation(books_file: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that an edited source, a partial read or a corrupt file are not served."""
+    cache_dir = str(tmp_path / "cache")
+    rows = cached_books(str(books_file), cache_dir)
+    next(rows)
+    assert iter_cached(str(books_file), cache_dir) is None, "Should only commit a fully read stream"
+    list(cached_books(str(books_file), cache_dir))
+    books_file.write_text(TEXT + "New Book,30.00\n", encoding="utf-8")
+    assert iter_cached(str(books_file), cache_dir) is None, "Should invalidate on a size change"
+    assert load_book_table(str(books_file), cache_dir).max() == 30.0, "Should rebuild from the text"
+    Path(cache_path(str(books_file), cache_dir)).write_bytes(b"garbage")
+    assert iter_cached(str(books_file), cache_dir) is None, "Should reject a corrupt cache"
+    capsys.readouterr()
+    assert list(cached_books(str(tmp_path / "missing.txt"), cache_dir)) == [], "Should handle a missing file"
+    assert "not found" in capsys.readouterr().out, "Should print the usual error"
+
+def test_prune_cache(tmp_path: Path) -> None:
+    """Test that pruning drops the least recently used files but keeps the current one."""
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    for age, name in enumerate(["old", "mid", "new"]):
+        path = cache_dir / f"{name}.bin"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + age, 1000 + age))
+    book_cache.prune_cache(str(cache_dir), 200, keep=str(cache_dir / "old.bin"))
+    assert sorted(p.name for p in cache_dir.iterdir()) == ["new.bin", "old.bin"], "Should evict by mtime, sparing keep"
+
+def test_unwritable_cache_keeps_analysis(books_file: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that a cache dir shadowed by a regular file only disables caching."""
+    shadow = tmp_path / ".book_cache"
+    shadow.write_text("not a directory")
+    expected = list(iter_books(str(books_file)))
+    capsys.readouterr()
+    result = analyze_books(cached_books(str(books_file), str(shadow)), str(tmp_path / "out.txt"))
+    out = capsys.readouterr().out
+    assert result is not None and result[0] == len(expected), "Should still analyze every book"
+    assert "Error writing cache" in out and "Error writing to" not in out, "Should report the cache, not the output"
+    assert (tmp_path / "out.txt").exists() and shadow.read_text() == "not a directory", "Output written, file untouched"
+
+def test_cache_write_failure_midstream(
+    books_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that a failing spill stops caching but keeps yielding rows."""
+    cache_dir = tmp_path / "cache"
+
+    def full_disk(*args: object) -> int:
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(book_cache, "SPILL_ROWS", 1)
+    monkeypatch.setattr(book_cache, "_spill", full_disk)
+    assert list(cached_books(str(books_file), str(cache_dir))) == list(iter_books(str(books_file)))
+    assert "No space left on device" in capsys.readouterr().out, "Should report the cache error"
+    assert os.listdir(cache_dir) == [], "Should leave no cache or temp files"
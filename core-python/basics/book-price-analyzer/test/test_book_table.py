@@ -0,0 +1,44 @@
+import pytest
+from array import array
+from pathlib import Path
+from module.book_table import BookTable
+
+BOOKS: list[tuple[str, float]] = [("A", 15.0), ("B", 22.5), ("C", 19.75), ("D", 40.0), ("E", 22.5)]
+
+def test_book_table_stats() -> None:
+    """Test totals, extremes and percentiles against plain Python."""
+    table = BookTable.from_books(BOOKS)
+    prices = [price for _, price in BOOKS]
+    assert len(table) == 5 and list(table) == BOOKS, "Should keep books in input order"
+    assert table.total() == sum(prices) and table.mean() == sum(prices) / 5, "Should sum prices"
+    assert (table.min(), table.max()) == (15.0, 40.0), "Should find the extremes"
+    assert table.percentile(0) == 15.0 and table.percentile(100) == 40.0, "Should bound percentiles"
+    assert table.percentile(50) == 22.5, "Should give the median"
+    assert table.percentile(25) == 19.75, "Should interpolate between ranks"
+    with pytest.raises(ValueError, match="Percentile"):
+        table.percentile(101)
+
+def test_book_table_threshold_queries() -> None:
+    """Test threshold queries in file and price order, and index invalidation."""
+    table = BookTable.from_books(BOOKS)
+    assert table.count_at_least(22.5) == 3, "Should include prices equal to the threshold"
+    assert table.at_least(20.0) == [("B", 22.5), ("D", 40.0), ("E", 22.5)], "Should keep file order"
+    assert [price for _, price in table.at_least(20.0, file_order=False)] == [22.5, 22.5, 40.0], "Should sort by price"
+    table.append("F", 99.0)
+    assert table.count_at_least(50.0) == 1 and table.max() == 99.0, "Should rebuild the index after append"
+
+def test_book_table_empty_and_buffers(tmp_path: Path) -> None:
+    """Test an empty table, foreign price buffers and from_file."""
+    empty = BookTable()
+    assert (empty.mean(), empty.min(), empty.max(), empty.percentile(50)) == (0.0, 0.0, 0.0, 0.0), "Should default to 0"
+    assert empty.count_at_least(0.0) == 0 and empty.at_least(0.0) == [], "Should find nothing"
+    view = memoryview(array("d", [3.0, 1.0]))
+    table = BookTable(["x", "y"], view)
+    assert table.at_least(2.0) == [("x", 3.0)], "Should query any buffer of doubles"
+    table.append("z", 5.0)
+    assert isinstance(table.prices, array) and len(table) == 3, "Should copy a read-only buffer on append"
+    with pytest.raises(ValueError, match="same length"):
+        BookTable(["x"], array("d"))
+    path = tmp_path / "books.txt"
+    path.write_text("A,15.00\nbroken\nB,abc\nC,25.00\n", encoding="utf-8")
+    assert list(BookTable.from_file(str(path))) == [("A", 15.0), ("C", 25.0)], "Should skip invalid lines"
@@ -0,0 +1,76 @@
+import sys
+import pytest
+from pathlib import Path
+from main import main
+from module import parallel_scanner
+from module.book_price_analyzer import analyze_books, iter_books
+from module.parallel_scanner import analyze_books_parallel, scan_range, split_ranges
+
+LINES: list[str] = [
+    f"Book {i},{i * 1.37 % 40:.2f}" if i % 7 else ("Invalid,abc" if i % 2 else "no price here")
+    for i in range(500)
+]
+
+@pytest.fixture
+def catalog(tmp_path: Path) -> Path:
+    """Books file with invalid prices, malformed lines and a unicode title."""
+    path = tmp_path / "books.txt"
+    path.write_text("\n".join(LINES + ["Café à Paris,25.50", "Last,30.00"]) + "\n", encoding="utf-8")
+    return path
+
+def test_split_ranges_cover_file(catalog: Path) -> None:
+    """Test that ranges are contiguous, newline-aligned and cover the whole file."""
+    data = catalog.read_bytes()
+    for parts in (1, 2, 3, 7, 64):
+        ranges = split_ranges(str(catalog), parts)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(data), f"{parts} parts should cover the file"
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:])), "Should be contiguous"
+        assert all(data[end - 1 : end] == b"\n" for _, end in ranges[:-1]), "Should cut after a newline"
+
+def test_scan_ranges_match_serial(catalog: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that any split (cuts requested mid-line) gives the serial books and skipped lines."""
+    books = list(iter_books(str(catalog)))
+    skipped = [line.removeprefix("Skipping invalid line: ") for line in capsys.readouterr().out.splitlines()]
+    for parts in (1, 2, 5, 33):
+        partials = [scan_range(str(catalog), start, end, 20.0) for start, end in split_ranges(str(catalog), parts)]
+        assert sum(p[1] for p in partials) == len(books), f"{parts} parts should count every book"
+        assert sum(p[0] for p in partials) == pytest.approx(sum(price for _, price in books)), "Should sum prices"
+        expensive = [book for p in partials for book in p[2]]
+        assert expensive == [book for book in books if book[1] >= 20.0], "Should keep expensive books in order"
+        assert [line for p in partials for line in p[3]] == skipped, "Should skip the same lines"
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyze_books_parallel_identical_output(
+    workers: int, catalog: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that the parallel scan writes the same file and prints the same messages as the serial one."""
+    # Small chunks: the test file is split into many ranges and really uses the pool
+    monkeypatch.setattr(parallel_scanner, "MIN_CHUNK_BYTES", 0)
+    monkeypatch.setattr(parallel_scanner, "MAX_CHUNK_BYTES", 1024)
+    serial_out, parallel_out = tmp_path / "serial.txt", tmp_path / "parallel.txt"
+    serial = analyze_books(iter_books(str(catalog)), str(serial_out))
+    serial_messages = capsys.readouterr().out.splitlines()[:-1]  # last line: rows/sec summary
+    result = analyze_books_parallel(str(catalog), str(parallel_out), workers=workers)
+    assert capsys.readouterr().out.splitlines()[:-1] == serial_messages, "Should print the same skip messages"
+    assert result is not None and serial is not None, "Should write both files"
+    assert result[0] == serial[0] and result[1:] == pytest.approx(serial[1:]), "Should return the same stats"
+    assert parallel_out.read_bytes() == serial_out.read_bytes(), "Should write an identical file"
+
+def test_analyze_books_parallel_missing_file(tmp_path: Path) -> None:
+    """Test a missing input file."""
+    assert analyze_books_parallel(str(tmp_path / "none.txt"), str(tmp_path / "out.txt")) == (0, 0.0, 0.0)
+
+def test_write_error_is_not_empty_input(
+    catalog: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that an unwritable output returns None, and main does not call it empty input."""
+    assert analyze_books(iter_books(str(catalog)), str(tmp_path)) is None, "Serial: directory as output"
+    assert analyze_books_parallel(str(catalog), str(tmp_path), workers=1) is None, "Parallel: directory as output"
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "books.txt").write_text(catalog.read_text())
+    (tmp_path / "expensive_books.txt").mkdir()
+    monkeypatch.setattr(sys, "argv", ["main.py", "--no-cache"])
+    capsys.readouterr()
+    main()
+    out = capsys.readouterr().out
+    assert "Error writing to expensive_books.txt" in out and "No valid book data" not in out, "Only the write error"
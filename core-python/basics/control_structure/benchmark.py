@@ -0,0 +1,120 @@
+"""Benchmark action processing and JSON Lines ingestion (actions/sec)
+
+python3 benchmark.py            # legacy match vs dispatch table
+python3 benchmark.py --ingest   # per-line json.loads vs block-wise ActionStream
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import random
+import time
+from typing import Any, Callable
+
+from module.action_ingest import ActionStream, orjson
+from module.control_structure import process_action, process_actions, summarize_actions
+
+
+def legacy_process_action(action: dict[str, Any]) -> str:
+    """The original implementation: structural match, exceptions for errors"""
+    try:
+        match action:
+            case {"type": "login", "user": str(user), "time": int(time)}:
+                return f"User {user} logged in at timestamp {time}"
+            case {"type": "logout", "user": str(user)}:
+                return f"User {user} logged out"
+            case {"type": "error", "code": int(code)}:
+                return f"Error occurred with code {code}"
+            case {"type": "invalid"}:
+                raise ValueError(f"Invalid action format: {action}")
+            case _:
+                raise TypeError(f"Error processing action: {action}")
+    except (KeyError, TypeError) as e:
+        return f"{e}"
+    except ValueError as e:
+        return f"{e}"
+
+
+def synthetic_actions(count: int, seed: int = 42) -> list[Any]:
+    """Return `count` actions, about 5% of them malformed"""
+    rng = random.Random(seed)
+    users = [f"user{i}" for i in range(1000)]
+    actions: list[Any] = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.5:
+            actions.append({"type": "login", "user": rng.choice(users), "time": rng.randint(0, 10**9)})
+        elif roll < 0.85:
+            actions.append({"type": "logout", "user": rng.choice(users)})
+        elif roll < 0.95:
+            actions.append({"type": "error", "code": rng.choice([400, 404, 500])})
+        else:
+            actions.append(rng.choice([{"type": "invalid"}, {"user": "x"}, None, {"type": "login"}]))
+    return actions
+
+
+def time_runs(label: str, count: int, runs: list[tuple[str, Callable[[], object]]]) -> None:
+    """Print the throughput of each run over `count` actions"""
+    print(f"{label} {count:,} actions:")
+    for name, run in runs:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<28} {count / elapsed:>12,.0f} actions/sec ({elapsed:.2f}s)")
+
+
+def naive_read(path: str) -> list[Any]:
+    """One json.loads call per line, the straightforward way"""
+    actions: list[Any] = []
+    with open(path, "rb") as file:
+        for line in file:
+            try:
+                actions.append(json.loads(line))
+            except ValueError:
+                continue
+    return actions
+
+
+def benchmark_ingest(count: int) -> None:
+    """Write `count` JSON Lines events (0.1% broken) and read them back"""
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as file:
+        for i, action in enumerate(synthetic_actions(count)):
+            file.write('{"type": "login", "user"\n' if i % 1000 == 999 else json.dumps(action) + "\n")
+    try:
+        runs: list[tuple[str, Callable[[], object]]] = [
+            ("json.loads per line", lambda: naive_read(file.name)),
+            ("ActionStream (json)", lambda: list(ActionStream(file.name, loads=json.loads))),
+        ]
+        if orjson is not None:
+            runs.append(("ActionStream (orjson)", lambda: list(ActionStream(file.name))))
+        runs.append(("summarize_actions(stream)", lambda: summarize_actions(ActionStream(file.name))))
+        time_runs("Ingesting", count, runs)
+    finally:
+        os.remove(file.name)
+
+
+def main() -> None:
+    """Time each implementation over the same actions"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actions", type=int, default=1_000_000)
+    parser.add_argument("--ingest", action="store_true", help="benchmark JSON Lines ingestion")
+    args = parser.parse_args()
+
+    if args.ingest:
+        benchmark_ingest(args.actions)
+        return
+    actions = synthetic_actions(args.actions)
+    time_runs(
+        "Processing",
+        args.actions,
+        [
+            ("legacy match", lambda: [legacy_process_action(a) for a in actions]),
+            ("process_action", lambda: [process_action(a) for a in actions]),
+            ("process_actions (batch)", lambda: process_actions(actions)),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
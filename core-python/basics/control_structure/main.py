@@ -1,12 +1,20 @@
 """Control Structure"""
 
-from typing import Any
-from module.control_structure import process_action, get_unique_users, summarize_actions
+import argparse
+from typing import Any, Iterable
+from module.action_ingest import ActionStream
+from module.control_structure import analyze_actions
 
 def main() -> None:
     """Main entry point of the program"""
 
-    actions: list[dict[str, Any]] = [
+    parser = argparse.ArgumentParser(description="Process user actions")
+    parser.add_argument(
+        "source", nargs="?", help="JSON Lines file of actions, or - for stdin"
+    )
+    args = parser.parse_args()
+
+    actions: Iterable[Any] = [
         {"type": "login", "user": "Alice", "time": 1001},
         {"type": "logout", "user": "Bob"},
         {"type": "error", "code": 404},
@@ -15,22 +23,27 @@ def main() -> None:
         {"user": "Charlie"},  # Missing type
         None,  # Invalid type
     ]
+    stream = ActionStream(args.source) if args.source else None
+    if stream is not None:
+        actions = stream
+
+    # One pass: messages, unique users and summary together
+    analysis = analyze_actions(actions, render=True)
 
     # Process individual actions
     print("Processing Actions:")
-    for action in actions:
-        result = process_action(action)
+    for result in analysis.messages or []:
         print(result)
 
     # Get unique users
-    unique_users = get_unique_users(actions)
-    print(f"\nUnique Users: {unique_users}")
+    print(f"\nUnique Users: {analysis.users}")
 
     # Summarize actions
-    summary = summarize_actions(actions)
     print("\nAction Summary:")
-    for action_type, count in summary.items():
+    for action_type, count in analysis.summary.items():
         print(f"{action_type.capitalize()}: {count}")
+    if stream is not None and stream.skipped:
+        print(f"\nSkipped {stream.skipped} malformed line(s)")
 
 
 if __name__ == "__main__":
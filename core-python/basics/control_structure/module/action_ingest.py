@@ -0,0 +1,183 @@
+"""Block-wise JSON Lines ingestion of actions from a file or stdin"""
+
+import json
+import secrets
+import sys
+from typing import IO, Any, Callable, Iterator
+
+try:
+    import orjson
+except ImportError:  # optional dependency, a faster drop-in for json.loads
+    orjson = None  # type: ignore[assignment]
+
+BLOCK_SIZE: int = 1 << 20
+
+Loads = Callable[[bytes], Any]
+
+
+def default_loads() -> Loads:
+    """orjson.loads when installed, json.loads otherwise"""
+    return orjson.loads if orjson is not None else json.loads
+
+
+def iter_line_blocks(source: str | IO[bytes], block_size: int = BLOCK_SIZE) -> Iterator[list[bytes]]:
+    """Read a file, "-" (stdin) or binary stream in blocks of complete lines"""
+    if block_size < 1:
+        raise ValueError("block_size must be at least 1")
+    if isinstance(source, str):
+        if source == "-":
+            yield from iter_line_blocks(sys.stdin.buffer, block_size)
+            return
+        with open(source, "rb") as file:
+            yield from iter_line_blocks(file, block_size)
+            return
+    rest = b""
+    while block := source.read(block_size):
+        lines = (rest + block).split(b"\n")
+        rest = lines.pop()  # partial last line, completed by the next block
+        yield lines
+    if rest:
+        yield [rest]
+
+
+def _is_object_line(line: bytes) -> bool:
+    return line[:1] == b"{" and line[-1:] == b"}"
+
+
+# Bulk decoding keys each line by a per-process secret, so no line can
+# forge or hide another line's key (see _decode_keyed). The keys are built
+# once, for at most _KEYED_LINES lines per loads() call
+_KEY_PREFIX: str = secrets.token_hex(8)
+_KEYED_LINES: int = 4096
+_NAMES: tuple[str, ...] = tuple(f"{_KEY_PREFIX}{i:x}" for i in range(_KEYED_LINES))
+_KEYS: tuple[bytes, ...] = tuple(b'\n"%s":' % name.encode() for name in _NAMES)
+
+
+def _decode_keyed(lines: list[bytes], loads: Loads) -> list[Any] | None:
+    """Decode lines as one {key_i: line_i} object; None unless each maps to its line
+
+    A key starts on a new line and JSON strings cannot hold a raw newline,
+    so a line cannot swallow the next key inside a string. Swallowing it
+    inside an open object or array, or adding '{..}, "k": {..}' on one
+    line, leaves the decoded keys different from the expected ones.
+    Longer runs are decoded _KEYED_LINES lines at a time.
+    """
+    count = len(lines)
+    if count > _KEYED_LINES:
+        actions: list[Any] = []
+        for start in range(0, count, _KEYED_LINES):
+            part = _decode_keyed(lines[start : start + _KEYED_LINES], loads)
+            if part is None:
+                return None
+            actions.extend(part)
+        return actions
+    try:
+        # map() stops at the shorter input, so the keys need no slicing
+        decoded = loads(b"{" + b",".join(map(bytes.__add__, _KEYS, lines)) + b"}")
+    except ValueError:
+        return None
+    if (
+        not isinstance(decoded, dict)
+        or len(decoded) != count
+        or not all(map(str.__eq__, decoded, _NAMES))
+    ):
+        return None
+    return list(decoded.values())
+
+
+def _decode_all(lines: list[bytes], loads: Loads) -> list[Any] | None:
+    """Decode every line, one result per line, or return None if any fails"""
+    if orjson is not None and loads is orjson.loads:
+        # orjson: one C call per line costs no more than one bulk call
+        try:
+            return list(map(loads, lines))
+        except ValueError:
+            return None
+    return _decode_keyed(lines, loads)
+
+
+def _parse_run(lines: list[bytes], loads: Loads, actions: list[Any]) -> int:
+    """Decode lines that look like objects with as few loads() calls as possible"""
+    if len(lines) > 8:
+        decoded = _decode_all(lines, loads)
+        if decoded is not None:
+            actions.extend(decoded)
+            return 0
+        # Bisect: bad lines cost O(log n) extra bulk calls each
+        middle = len(lines) // 2
+        return _parse_run(lines[:middle], loads, actions) + _parse_run(
+            lines[middle:], loads, actions
+        )
+    skipped = 0
+    for line in lines:
+        try:
+            actions.append(loads(line))
+        except ValueError:  # JSONDecodeError, UnicodeDecodeError
+            skipped += 1
+    return skipped
+
+
+def parse_lines(lines: list[bytes], loads: Loads) -> tuple[list[Any], int]:
+    """Decode a block of lines; return (actions, number of malformed lines)
+
+    Runs of lines holding one JSON object each are decoded as a single
+    JSON object keyed by line (or mapped through orjson.loads in C), so
+    most lines cost no Python-level loads() call. Other lines (null,
+    numbers, broken JSON) are decoded one by one. loads must reject raw
+    newlines inside strings, as json.loads and orjson.loads do.
+    """
+    lines = [line for line in lines if line.strip()]
+    actions: list[Any] = []
+    if not lines:
+        return actions, 0
+    # Lines hold no b"\n", so these counts check every line start and end in C
+    blob = b"\n".join(lines)
+    gaps = len(lines) - 1
+    if (
+        _is_object_line(blob)
+        and blob.count(b"\n{") == gaps
+        and blob.count(b"}\n") == gaps
+    ):
+        return actions, _parse_run(lines, loads, actions)
+
+    skipped = 0
+    run: list[bytes] = []
+    for line in lines:
+        if _is_object_line(line):
+            run.append(line)
+            continue
+        skipped += _parse_run(run, loads, actions)
+        run = []
+        skipped += _parse_run([line], loads, actions)
+    return actions, skipped + _parse_run(run, loads, actions)
+
+
+class ActionStream:
+    """Iterate the actions of a JSON Lines file, stdin ("-") or binary stream
+
+    Counts decoded actions and skipped (malformed) lines as it goes.
+    """
+
+    def __init__(
+        self,
+        source: str | IO[bytes],
+        block_size: int = BLOCK_SIZE,
+        loads: Loads | None = None,
+    ) -> None:
+        self.source = source
+        self.block_size = block_size
+        self.loads = loads or default_loads()
+        self.actions: int = 0
+        self.skipped: int = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for lines in iter_line_blocks(self.source, self.block_size):
+            actions, skipped = parse_lines(lines, self.loads)
+            self.actions += len(actions)
+            self.skipped += skipped
+            yield from actions
+
+
+def read_actions(source: str | IO[bytes], block_size: int = BLOCK_SIZE) -> Iterator[Any]:
+    """Lazily yield decoded actions, skipping malformed lines"""
+    return iter(ActionStream(source, block_size))
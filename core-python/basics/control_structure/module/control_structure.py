@@ -1,27 +1,114 @@
-from typing import Any
+from collections.abc import Mapping
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
 
-def process_action(action: dict[str, Any]) -> str:
+from module.event_batch import EventBatch
+from module.sketches import HyperLogLog
+
+# Renders one action, or returns None when its fields are missing or mistyped
+Handler = Callable[[Mapping[str, Any]], str | None]
+# Required (field, type) pairs and the message template of an action type
+ActionSpec = tuple[tuple[tuple[str, type], ...], str]
+
+ACTION_SPECS: dict[str, ActionSpec] = {
+    "login": ((("user", str), ("time", int)), "User %s logged in at timestamp %s"),
+    "logout": ((("user", str),), "User %s logged out"),
+    "error": ((("code", int),), "Error occurred with code %s"),
+}
+INVALID_MESSAGE: str = "Invalid action format: %s"
+UNKNOWN_MESSAGE: str = "Error processing action: %s"
+
+
+def compile_handler(spec: ActionSpec) -> Handler:
+    """Build a handler checking the fields of one action type, no exceptions"""
+    fields, template = spec
+    # A missing field reads as None, which none of the field types accept
+    if len(fields) == 1:
+        ((name, kind),) = fields
+
+        def handler(action: Mapping[str, Any]) -> str | None:
+            value = action.get(name)
+            return template % (value,) if isinstance(value, kind) else None
+
+    elif len(fields) == 2:
+        (name1, kind1), (name2, kind2) = fields
+
+        def handler(action: Mapping[str, Any]) -> str | None:
+            value1 = action.get(name1)
+            value2 = action.get(name2)
+            if isinstance(value1, kind1) and isinstance(value2, kind2):
+                return template % (value1, value2)
+            return None
+
+    else:
+
+        def handler(action: Mapping[str, Any]) -> str | None:
+            values = tuple(action.get(name) for name, _ in fields)
+            for value, (_, kind) in zip(values, fields):
+                if not isinstance(value, kind):
+                    return None
+            return template % values
+
+    return handler
+
+
+def compile_dispatcher(specs: dict[str, ActionSpec] = ACTION_SPECS) -> dict[str, Handler]:
+    """Return the type -> handler table for a set of action specs"""
+    return {action_type: compile_handler(spec) for action_type, spec in specs.items()}
+
+
+DISPATCH: dict[str, Handler] = compile_dispatcher()
+
+
+def render_action(
+    action: Any, dispatch: dict[str, Handler] = DISPATCH
+) -> str | None:
+    """Return the message of a well-formed action, None for anything else"""
+    if action.__class__ is dict or isinstance(action, Mapping):
+        action_type = action.get("type")
+        # Only str keys can be in the table (and lists are unhashable)
+        if isinstance(action_type, str):
+            handler = dispatch.get(action_type)
+            if handler is not None:
+                return handler(action)
+    return None
+
+
+def process_action(action: Mapping[str, Any]) -> str:
     """Return a msg based on action type"""
-    try:
-        match action:
-            case {"type": "login", "user": str(user), "time": int(time)}:
-                return f"User {user} logged in at timestamp {time}"
-            case {"type": "logout", "user": str(user)}:
-                return f"User {user} logged out"
-            case {"type": "error", "code": int(code)}:
-                return f"Error occurred with code {code}"
-            case {"type": "invalid"}:
-                raise ValueError(f"Invalid action format: {action}")
-            case _:
-                raise TypeError(f"Error processing action: {action}")
-    except (KeyError, TypeError) as e:
-        return f"{e}"
-    except ValueError as e:
-        return f"{e}"
-
-def get_unique_users(actions: list[dict[str, Any]]) -> set[str]:
+    message = render_action(action)
+    if message is not None:
+        return message
+    # Rare path: only now build the error message
+    if isinstance(action, Mapping) and action.get("type") == "invalid":
+        return INVALID_MESSAGE % (action,)
+    return UNKNOWN_MESSAGE % (action,)
+
+
+def process_actions(
+    actions: Iterable[Any], dispatch: dict[str, Handler] = DISPATCH
+) -> list[str | None]:
+    """Render a batch of actions; None marks the ones process_action rejects"""
+    results: list[str | None] = []
+    append = results.append
+    for action in actions:
+        if action.__class__ is dict or isinstance(action, Mapping):
+            action_type = action.get("type")
+            if isinstance(action_type, str):
+                handler = dispatch.get(action_type)
+                if handler is not None:
+                    append(handler(action))
+                    continue
+        append(None)
+    return results
+
+
+def get_unique_users(actions: Iterable[Any] | EventBatch) -> set[str]:
     """Return a set of user names from action data"""
 
+    if isinstance(actions, EventBatch):
+        return actions.get_unique_users()
+
     users: set[str] = set()
     for action in actions:
         try:
@@ -32,9 +119,23 @@ def get_unique_users(actions: list[dict[str, Any]]) -> set[str]:
     return users
 
 
-def summarize_actions(actions: list[dict[str, Any]]) -> dict[str, int]:
+def estimate_unique_users(actions: Iterable[Any], error: float = 0.02) -> int:
+    """Approximate len(get_unique_users(actions)) in fixed memory (HyperLogLog)"""
+    users = HyperLogLog.from_error(error)
+    for action in actions:
+        if action.__class__ is dict or isinstance(action, Mapping):
+            user = action.get("user")
+            if isinstance(user, str):
+                users.add(user)
+    return users.count()
+
+
+def summarize_actions(actions: Iterable[Any] | EventBatch) -> dict[str, int]:
     """Counts occurrences of each action type"""
 
+    if isinstance(actions, EventBatch):
+        return actions.summarize_actions()
+
     summary: dict[str, int] = {"login": 0, "logout": 0, "error": 0, "invalid": 0}
     for action in actions:
         try:
@@ -50,3 +151,94 @@ def summarize_actions(actions: list[dict[str, Any]]) -> dict[str, int]:
         except (TypeError, AttributeError):
             summary["invalid"] += 1
     return summary
+
+
+class ActionSnapshot(NamedTuple):
+    """Point-in-time copy of an ActionAnalysis"""
+
+    processed: int
+    users: frozenset[str]
+    summary: dict[str, int]
+    messages: list[str] | None
+
+
+class ActionAnalysis:
+    """Unique users, per-type counts and (optionally) messages in one pass
+
+    Gives the same results as get_unique_users, summarize_actions and
+    process_action applied to the same actions, without walking them three
+    times or keeping them in memory.
+    """
+
+    def __init__(self, render: bool = False) -> None:
+        self.processed: int = 0
+        self.users: set[str] = set()
+        self.summary: dict[str, int] = dict.fromkeys([*ACTION_SPECS, "invalid"], 0)
+        self.messages: list[str] | None = [] if render else None
+        # Users as of the last snapshot, reused until a new user shows up
+        self._frozen_users: frozenset[str] | None = None
+
+    def add(self, actions: Iterable[Any]) -> "ActionAnalysis":
+        """Fold more actions (any iterable or generator) into the results"""
+        users, summary, messages = self.users, self.summary, self.messages
+        dispatch = DISPATCH
+        processed = self.processed
+        known_users = len(users)
+        for action in actions:
+            processed += 1
+            if action.__class__ is dict or isinstance(action, Mapping):
+                user = action.get("user")
+                if isinstance(user, str):
+                    users.add(user)
+                action_type = action.get("type")
+                # Only str keys can be in the table (and lists are unhashable)
+                if isinstance(action_type, str):
+                    handler = dispatch.get(action_type)
+                    if handler is not None:
+                        # .get: DISPATCH may hold types added after ACTION_SPECS
+                        summary[action_type] = summary.get(action_type, 0) + 1
+                        if messages is not None:
+                            message = handler(action)
+                            messages.append(message if message is not None else process_action(action))
+                        continue
+            summary["invalid"] += 1
+            if messages is not None:
+                messages.append(process_action(action))
+        self.processed = processed
+        if len(users) != known_users:
+            self._frozen_users = None
+        return self
+
+    def snapshot(self) -> ActionSnapshot:
+        """Copy the current results and hand over the messages rendered so far
+
+        The message buffer starts empty again, so memory stays bounded when
+        snapshots are taken regularly over an unbounded stream. The users are
+        only copied again once new ones arrived: snapshots in between share
+        one frozenset instead of paying O(users) each.
+        """
+        messages = self.messages
+        if messages is not None:
+            self.messages = []
+        if self._frozen_users is None:
+            self._frozen_users = frozenset(self.users)
+        return ActionSnapshot(
+            self.processed, self._frozen_users, dict(self.summary), messages
+        )
+
+
+def analyze_actions(actions: Iterable[Any], render: bool = False) -> ActionAnalysis:
+    """Collect unique users, per-type counts and optionally messages in one pass"""
+    return ActionAnalysis(render).add(actions)
+
+
+def iter_snapshots(
+    actions: Iterable[Any], every: int = 10_000, render: bool = False
+) -> Iterator[ActionSnapshot]:
+    """Analyze a (possibly unbounded) stream, yielding a snapshot every N actions"""
+    if every < 1:
+        raise ValueError("every must be at least 1")
+    analysis = ActionAnalysis(render)
+    actions = iter(actions)
+    while chunk := list(islice(actions, every)):
+        yield analysis.add(chunk).snapshot()
@@ -0,0 +1,107 @@
+"""Struct-of-arrays event batch: a few bytes per action instead of a dict"""
+
+import json
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Any, Iterable
+
+# Type codes in EventBatch.types; 0 is everything summarize_actions calls invalid
+TYPE_NAMES: tuple[str, ...] = ("invalid", "login", "logout", "error")
+TYPE_CODES: dict[str, int] = {name: code for code, name in enumerate(TYPE_NAMES) if code}
+
+NO_USER: int = -1
+NO_VALUE: int = -(1 << 63)  # missing or non-integer time / code
+_INT64 = range(NO_VALUE + 1, 1 << 63)
+
+
+class EventBatch:
+    """Actions stored column by column
+
+    types is a bytearray of type codes, users an array('i') of interned
+    user IDs (index into .names), times and codes are array('q'). That
+    is 21 bytes per action (plus each distinct user name once), against
+    several hundred for a dict.
+    """
+
+    def __init__(self) -> None:
+        self.types = bytearray()
+        self.users = array("i")
+        self.times = array("q")
+        self.codes = array("q")
+        self.names: list[str] = []
+        self._user_ids: dict[str, int] = {}
+
+    @classmethod
+    def from_actions(cls, actions: Iterable[Any]) -> "EventBatch":
+        """Build a batch from any iterable of actions (dicts or anything else)"""
+        batch = cls()
+        batch.extend(actions)
+        return batch
+
+    @classmethod
+    def from_jsonl(cls, lines: Iterable[str | bytes]) -> "EventBatch":
+        """Build a batch from JSON Lines, one line at a time
+
+        Each line goes straight into the columns, so neither the lines
+        nor the decoded dicts are kept. Blank and malformed lines are skipped.
+        """
+        batch = cls()
+        loads, append = json.loads, batch.append
+        for line in lines:
+            try:
+                append(loads(line))
+            except ValueError:  # JSONDecodeError, UnicodeDecodeError
+                continue
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def append(self, action: Any) -> None:
+        """Add one action, keeping only the fields the summaries use"""
+        type_code, user_id, time, code = 0, NO_USER, NO_VALUE, NO_VALUE
+        if action.__class__ is dict or isinstance(action, Mapping):
+            action_type = action.get("type")
+            if isinstance(action_type, str):
+                type_code = TYPE_CODES.get(action_type, 0)
+            user = action.get("user")
+            if isinstance(user, str):
+                user_id = self._user_ids.get(user, NO_USER)
+                if user_id == NO_USER:
+                    user_id = self._user_ids[user] = len(self.names)
+                    self.names.append(sys.intern(user))
+            value = action.get("time")
+            if isinstance(value, int) and value in _INT64:
+                time = value
+            value = action.get("code")
+            if isinstance(value, int) and value in _INT64:
+                code = value
+        self.types.append(type_code)
+        self.users.append(user_id)
+        self.times.append(time)
+        self.codes.append(code)
+
+    def extend(self, actions: Iterable[Any]) -> None:
+        """Add many actions"""
+        for action in actions:
+            self.append(action)
+
+    def summarize_actions(self) -> dict[str, int]:
+        """Same result as summarize_actions() on the original actions"""
+        # bytearray.count runs in C, one scan per type
+        summary = {name: self.types.count(code) for code, name in enumerate(TYPE_NAMES) if code}
+        summary["invalid"] = self.types.count(0)
+        return summary
+
+    def get_unique_users(self) -> set[str]:
+        """Same result as get_unique_users() on the original actions"""
+        # Names are interned only when an action carries them
+        return set(self.names)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the columns (user names excluded)"""
+        return len(self.types) + sum(
+            column.itemsize * len(column) for column in (self.users, self.times, self.codes)
+        )
@@ -0,0 +1,247 @@
+"""Fixed-memory, mergeable sketches: distinct users and heavy hitters"""
+
+import heapq
+import math
+from array import array
+from collections.abc import Mapping
+from hashlib import blake2b
+from typing import Any, Iterable
+
+
+def hash128(item: str) -> int:
+    """Stable 128-bit hash (same in every process, unlike hash())"""
+    return int.from_bytes(blake2b(item.encode("utf-8"), digest_size=16).digest(), "little")
+
+
+class HyperLogLog:
+    """Distinct count estimate with a relative error of about 1.04 / sqrt(2**p)
+
+    Uses 2**precision one-byte registers: precision 12 is 4 KiB for ~1.6%.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    @classmethod
+    def from_error(cls, error: float) -> "HyperLogLog":
+        """Smallest sketch whose standard error is at most `error`"""
+        if not 0 < error < 1:
+            raise ValueError("error must be between 0 and 1")
+        return cls(max(4, math.ceil(math.log2((1.04 / error) ** 2))))
+
+    def add(self, item: str) -> None:
+        self.add_hash(hash128(item))
+
+    def add_hash(self, hashed: int) -> None:
+        """Add an item by its hash128() value"""
+        p = self.precision
+        low = hashed & 0xFFFFFFFFFFFFFFFF
+        index = low & ((1 << p) - 1)
+        # Rank: position of the first 1 bit in the remaining 64 - p bits
+        rank = 64 - p - (low >> p).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        """Estimated number of distinct items added"""
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small range: linear counting is more accurate
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold in a sketch of another shard (same precision)"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.registers)
+
+
+class CountMinSketch:
+    """Frequency estimates that never undercount
+
+    With width = ceil(e / epsilon) and depth = ceil(ln(1 / delta)), an
+    estimate exceeds the true count by more than epsilon * total with
+    probability at most delta.
+    """
+
+    def __init__(self, width: int = 272, depth: int = 5) -> None:
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be at least 1")
+        self.width = width
+        self.depth = depth
+        self.total: int = 0
+        self.counters = array("Q", bytes(8 * width * depth))
+
+    @classmethod
+    def from_error(cls, epsilon: float = 0.01, delta: float = 0.01) -> "CountMinSketch":
+        """Sketch sized for an additive error epsilon * total with probability 1 - delta"""
+        if not (0 < epsilon < 1 and 0 < delta < 1):
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)))
+
+    def _cells(self, hashed: int) -> list[int]:
+        # Double hashing: row i uses h1 + i * h2 (Kirsch-Mitzenmacher). An odd
+        # h2 keeps the rows apart for power-of-two widths; h2 == 0 would put
+        # an item in the same column of every row
+        h1, h2 = hashed & 0xFFFFFFFFFFFFFFFF, (hashed >> 64) | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, item: str, count: int = 1) -> None:
+        self.add_hash(hash128(item), count)
+
+    def add_hash(self, hashed: int, count: int = 1) -> None:
+        """Add an item by its hash128() value"""
+        counters = self.counters
+        for cell in self._cells(hashed):
+            counters[cell] += count
+        self.total += count
+
+    def estimate(self, item: str) -> int:
+        """Upper-bound estimate of how often item was added"""
+        counters = self.counters
+        return min(counters[cell] for cell in self._cells(hash128(item)))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """Fold in a sketch of another shard (same width and depth)"""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge sketches with different dimensions")
+        self.counters = array("Q", map(sum, zip(self.counters, other.counters)))
+        self.total += other.total
+        return self
+
+    @property
+    def nbytes(self) -> int:
+        return self.counters.itemsize * len(self.counters)
+
+
+class SpaceSaving:
+    """Top-k heavy hitters in k counters (Metwally et al.)
+
+    Every reported count overestimates the true one by at most the count
+    of the entry it replaced, itself at most total / capacity.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        # One (count, item) per entry; a count may be stale (too low) after hits
+        self._heap: list[tuple[int, str]] = []
+
+    def add(self, item: str, count: int = 1) -> None:
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+            self.errors[item] = 0
+            heapq.heappush(self._heap, (count, item))
+        else:
+            # Replace the smallest entry; its count becomes the new error
+            heap = self._heap
+            floor, smallest = heap[0]
+            while counts[smallest] != floor:
+                # Counts only grow, so refresh stale entries until the top is exact
+                heapq.heapreplace(heap, (counts[smallest], smallest))
+                floor, smallest = heap[0]
+            del counts[smallest], self.errors[smallest]
+            counts[item] = floor + count
+            self.errors[item] = floor
+            heapq.heapreplace(heap, (floor + count, item))
+
+    def top(self, n: int = 10) -> list[tuple[str, int]]:
+        """Return the n most frequent items with their (over)estimated counts"""
+        return sorted(self.counts.items(), key=lambda entry: -entry[1])[:n]
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Fold in a summary of another shard, keeping the capacity largest"""
+        # An item missing from one side may have had up to its minimum count
+        floor_self = min(self.counts.values(), default=0) if len(self.counts) >= self.capacity else 0
+        floor_other = min(other.counts.values(), default=0) if len(other.counts) >= other.capacity else 0
+        counts: dict[str, int] = {}
+        errors: dict[str, int] = {}
+        for item in self.counts.keys() | other.counts.keys():
+            counts[item] = self.counts.get(item, floor_self) + other.counts.get(item, floor_other)
+            errors[item] = self.errors.get(item, floor_self) + other.errors.get(item, floor_other)
+        kept = sorted(counts, key=lambda item: -counts[item])[: self.capacity]
+        self.counts = {item: counts[item] for item in kept}
+        self.errors = {item: errors[item] for item in kept}
+        self._heap = [(count, item) for item, count in self.counts.items()]
+        heapq.heapify(self._heap)
+        return self
+
+
+class ActionSketch:
+    """Approximate get_unique_users / summarize_actions in fixed memory
+
+    Each user is hashed once and feeds the distinct-user HyperLogLog, the
+    per-user Count-Min Sketch and the top-users Space-Saving summary.
+    """
+
+    def __init__(
+        self,
+        user_error: float = 0.02,
+        epsilon: float = 0.02,
+        delta: float = 0.01,
+        top_capacity: int = 64,
+    ) -> None:
+        self.users = HyperLogLog.from_error(user_error)
+        self.user_counts = CountMinSketch.from_error(epsilon, delta)
+        self.top_users = SpaceSaving(top_capacity)
+        self.top_types = SpaceSaving(top_capacity)
+
+    def add(self, actions: Iterable[Any]) -> "ActionSketch":
+        """Fold actions in, counting users and types like the exact functions"""
+        users, user_counts = self.users, self.user_counts
+        add_user, add_type = self.top_users.add, self.top_types.add
+        for action in actions:
+            if action.__class__ is dict or isinstance(action, Mapping):
+                user = action.get("user")
+                if isinstance(user, str):
+                    hashed = hash128(user)
+                    users.add_hash(hashed)
+                    user_counts.add_hash(hashed)
+                    add_user(user)
+                action_type = action.get("type")
+                if action_type in ("login", "logout", "error"):
+                    add_type(action_type)
+                    continue
+            add_type("invalid")
+        return self
+
+    def unique_users(self) -> int:
+        """Estimated number of distinct users"""
+        return self.users.count()
+
+    def merge(self, other: "ActionSketch") -> "ActionSketch":
+        """Fold in the sketch of another shard or process"""
+        self.users.merge(other.users)
+        self.user_counts.merge(other.user_counts)
+        self.top_users.merge(other.top_users)
+        self.top_types.merge(other.top_types)
+        return self
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory of the fixed-size parts"""
+        return self.users.nbytes + self.user_counts.nbytes
+
+
+def sketch_actions(actions: Iterable[Any], **options: Any) -> ActionSketch:
+    """Build an ActionSketch (see its options) over any iterable of actions"""
+    return ActionSketch(**options).add(actions)
@@ -0,0 +1,78 @@
+"""Test cases for JSON Lines ingestion"""
+
+import io
+import json
+from typing import Any
+import pytest
+from module.action_ingest import ActionStream, default_loads, iter_line_blocks, parse_lines
+from module.control_structure import summarize_actions
+
+ACTIONS: list[Any] = [
+    {"type": "login", "user": "Alice", "time": 1001},
+    {"type": "logout", "user": "Bob"},
+    {"type": "error", "code": 404},
+    None,
+    {"type": "invalid"},
+] * 5
+
+
+def per_line(lines: list[bytes]) -> tuple[list[Any], int]:
+    """Reference: decode every non-blank line on its own"""
+    actions, skipped = [], 0
+    for line in lines:
+        if line.strip():
+            try:
+                actions.append(json.loads(line))
+            except ValueError:
+                skipped += 1
+    return actions, skipped
+
+
+def test_parse_lines_matches_per_line_decoding() -> None:
+    """Test bulk decoding against one json.loads per line, with bad lines."""
+    lines = [json.dumps(action).encode() for action in ACTIONS]
+    assert parse_lines(lines, json.loads) == (ACTIONS, 0), "Clean block should decode in bulk"
+    lines[3:3] = [b"{bad}", b"", b'{"a": 1}, {"b": 2}', b"\xff{}", b"[1", b"  ", b'{"type": "login"}\r']
+    lines[15] = lines[15][:-2]
+    assert parse_lines(lines, json.loads) == per_line(lines), "Should skip exactly the bad lines"
+
+
+def test_parse_lines_longer_than_one_keyed_call() -> None:
+    """Test runs longer than the prebuilt keys, clean and with a bad line past them."""
+    lines = [json.dumps({"user": f"user{i}"}).encode() for i in range(20_000)]
+    assert parse_lines(lines, json.loads) == per_line(lines), "Long clean run should decode in chunks"
+    lines[12_345] = b'{"user": 1}, {"b": 2}'
+    assert parse_lines(lines, json.loads) == per_line(lines), "Should skip the one bad line"
+
+
+@pytest.mark.parametrize("loads", [json.loads, default_loads()])
+def test_parse_lines_rejects_lines_that_only_parse_joined(loads: Any) -> None:
+    """Test lines whose errors cancel out once joined fall back to per-line decoding."""
+    good = [json.dumps(action).encode() for action in ACTIONS[:3]] * 3
+    tricks = [
+        [b'{"k": [{}', b'{}]}', b'{"a": 1}, {"b": 2}'],
+        [b'{"k": {"x": 1', b'{}}}', b'{"a": 1}, "zz": {"b": 2}'],
+        [b'{"k": "a', b'b"}', b'{"a": 1}, {"b": 2}'],
+    ]
+    for trick in tricks:
+        lines = good[:8] + trick + good[8:]
+        assert parse_lines(lines, loads) == per_line(lines), f"Should skip {trick} like per-line decoding"
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1 << 20])
+def test_action_stream_blocks(block_size: int) -> None:
+    """Test that lines split across blocks decode the same."""
+    data = "\n".join(json.dumps(action) for action in ACTIONS) + "\nbroken"
+    stream = ActionStream(io.BytesIO(data.encode()), block_size=block_size, loads=json.loads)
+    assert list(stream) == ACTIONS, "Should decode every complete action"
+    assert (stream.actions, stream.skipped) == (len(ACTIONS), 1), "Should count actions and skipped lines"
+
+
+def test_action_stream_feeds_summaries(tmp_path) -> None:
+    """Test reading a file straight into summarize_actions."""
+    path = tmp_path / "actions.jsonl"
+    path.write_text("\n".join(json.dumps(action) for action in ACTIONS) + "\n")
+    assert summarize_actions(ActionStream(str(path))) == summarize_actions(ACTIONS), "Summary should match"
+    assert sum(len(lines) for lines in iter_line_blocks(str(path), 64)) == len(ACTIONS), "No lines lost"
+    with pytest.raises(ValueError):
+        list(iter_line_blocks(str(path), 0))
@@ -3,7 +3,13 @@
 from typing import Any
 import pytest
 from module.control_structure import (
+    DISPATCH,
+    analyze_actions,
+    compile_dispatcher,
+    compile_handler,
+    iter_snapshots,
     process_action,
+    process_actions,
     get_unique_users,
     summarize_actions,
 )
@@ -56,6 +62,44 @@ def test_process_action_edge_cases() -> None:
     ), "Invalid time type should return error"
 
 
+def test_process_actions_batch() -> None:
+    """Test batch processing with None for rejected actions."""
+    actions: list[Any] = [
+        {"type": "login", "user": "Alice", "time": 1001},
+        {"type": "invalid"},
+        None,
+        {"type": ["login"]},  # Unhashable type value
+        {"type": "error", "code": 500, "extra": True},
+    ]
+    assert process_actions(actions) == [
+        "User Alice logged in at timestamp 1001",
+        None,
+        None,
+        None,
+        "Error occurred with code 500",
+    ], "Batch should render valid actions and mark the rest with None"
+    assert process_action({"type": ["login"]}).startswith(
+        "Error processing action"
+    ), "Unhashable type should return error"
+
+
+def test_compile_dispatcher_custom_spec() -> None:
+    """Test a dispatch table compiled from custom specs."""
+    dispatch = compile_dispatcher(
+        {"move": ((("user", str), ("x", int), ("y", int)), "%s moved to %s,%s")}
+    )
+    actions: list[Any] = [
+        {"type": "move", "user": "Ann", "x": 1, "y": 2},
+        {"type": "move", "user": "Ann", "x": 1},
+        {"type": "login", "user": "Ann", "time": 1},
+    ]
+    assert process_actions(actions, dispatch) == [
+        "Ann moved to 1,2",
+        None,
+        None,
+    ], "Only the custom type with all fields should render"
+
+
 def test_get_unique_users() -> None:
     """Test extraction of unique users from actions."""
     actions: list[dict[str, Any]] = [
@@ -110,3 +154,45 @@ def test_summarize_actions_edge_cases() -> None:
     assert (
         summarize_actions(actions) == expected
     ), "Invalid types should count as invalid"
+
+
+def test_analyze_actions_matches_separate_passes() -> None:
+    """Test that the fused pass equals the three separate functions."""
+    actions: list[Any] = [
+        {"type": "login", "user": "Alice", "time": 1001},
+        {"type": "logout", "user": "Bob"},
+        {"type": "error", "code": 404},
+        {"type": "invalid", "user": "Dan"},
+        {"type": ["login"], "user": "Eve"},
+        {"type": "login", "user": "Fay"},  # Missing time
+        {"user": "Charlie"},
+        None,
+    ]
+    analysis = analyze_actions(iter(actions), render=True)
+    assert analysis.users == get_unique_users(actions), "Users should match"
+    assert analysis.summary == summarize_actions(actions), "Summary should match"
+    assert analysis.messages == [process_action(a) for a in actions], "Messages should match"
+    assert analysis.processed == len(actions), "Should count processed actions"
+    assert analyze_actions(actions).messages is None, "Messages are rendered only on request"
+
+
+def test_iter_snapshots() -> None:
+    """Test periodic snapshots over a generator."""
+    stream = ({"type": "logout", "user": f"user{i % 3}"} for i in range(7))
+    snapshots = list(iter_snapshots(stream, every=3, render=True))
+    assert [snap.processed for snap in snapshots] == [3, 6, 7], "Snapshot every 3 actions and at the end"
+    assert snapshots[-1].summary["logout"] == 7, "Counts should accumulate"
+    assert snapshots[0].users == {"user0", "user1", "user2"}, "Users seen so far"
+    assert [len(snap.messages or []) for snap in snapshots] == [3, 3, 1], "Messages since the last snapshot"
+    assert snapshots[1].users is snapshots[0].users, "Should reuse the users until a new one arrives"
+    with pytest.raises(ValueError):
+        list(iter_snapshots([], every=0))
+
+
+def test_analyze_actions_unlisted_type(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a type added to DISPATCH after ACTION_SPECS is counted, not a KeyError."""
+    monkeypatch.setitem(DISPATCH, "ping", compile_handler(((), "Ping")))
+    analysis = analyze_actions([{"type": "ping"}, {"type": "ping"}, {"type": "login"}], render=True)
+    assert analysis.summary["ping"] == 2, "Should count the new type"
+    assert analysis.summary["login"] == 1, "Should count listed types as before"
+    assert analysis.messages is not None and analysis.messages[:2] == ["Ping", "Ping"]
@@ -0,0 +1,46 @@
+"""Test cases for the struct-of-arrays event batch"""
+
+import json
+from typing import Any
+from module.control_structure import get_unique_users, summarize_actions
+from module.event_batch import NO_USER, NO_VALUE, EventBatch
+
+ACTIONS: list[Any] = [
+    {"type": "login", "user": "Alice", "time": 1001},
+    {"type": "logout", "user": "Bob"},
+    {"type": "error", "code": 404},
+    {"type": "login", "user": "Alice", "time": 1002},
+    {"type": "invalid"},
+    {"user": "Charlie"},
+    None,
+    {"type": ["login"], "user": "Dan", "time": "soon"},
+]
+
+
+def test_batch_summaries_match_dict_functions() -> None:
+    """Test that the columnar summaries equal the per-dict functions."""
+    batch = EventBatch.from_actions(ACTIONS)
+    assert len(batch) == len(ACTIONS), "Every action should be stored"
+    assert summarize_actions(batch) == summarize_actions(ACTIONS), "Summary should match"
+    assert list(summarize_actions(batch)) == ["login", "logout", "error", "invalid"], "Key order should match"
+    assert get_unique_users(batch) == get_unique_users(ACTIONS), "Users should match"
+
+
+def test_batch_columns() -> None:
+    """Test the stored columns and interned user IDs."""
+    batch = EventBatch.from_actions(ACTIONS[:4])
+    assert list(batch.types) == [1, 2, 3, 1], "Type codes"
+    assert list(batch.users) == [0, 1, NO_USER, 0], "Repeated users share an ID"
+    assert batch.names == ["Alice", "Bob"], "Names are stored once"
+    assert list(batch.times) == [1001, NO_VALUE, NO_VALUE, 1002], "Times column"
+    assert batch.codes[2] == 404, "Codes column"
+    assert batch.nbytes == 4 * 21, "21 bytes per action"
+
+
+def test_from_jsonl_skips_malformed_lines() -> None:
+    """Test building a batch from JSON Lines (str or bytes)."""
+    lines = [json.dumps(action) for action in ACTIONS] + ["", "{not json", "\n"]
+    batch = EventBatch.from_jsonl(lines)
+    assert len(batch) == len(ACTIONS), "Malformed lines should be skipped"
+    assert summarize_actions(batch) == summarize_actions(ACTIONS), "Summary should match"
+    assert len(EventBatch.from_jsonl(line.encode() for line in lines)) == len(ACTIONS), "Bytes lines"
@@ -0,0 +1,88 @@
+"""Test cases for the approximate sketches"""
+
+import pickle
+import random
+from collections import Counter
+from typing import Any
+import pytest
+from module.control_structure import estimate_unique_users, get_unique_users, summarize_actions
+from module.sketches import CountMinSketch, HyperLogLog, SpaceSaving, sketch_actions
+
+
+def zipf_actions(count: int, seed: int = 7) -> list[dict[str, Any]]:
+    """Actions whose users follow a heavy-tailed distribution"""
+    rng = random.Random(seed)
+    types = ["login", "logout", "error", "invalid"]
+    return [
+        {"type": rng.choice(types), "user": f"user{int(rng.paretovariate(1.1))}"}
+        for _ in range(count)
+    ]
+
+
+def test_hyperloglog_error_and_merge() -> None:
+    """Test distinct counts within a few standard errors, also after merging."""
+    left, right = HyperLogLog(12), HyperLogLog(12)
+    for i in range(20_000):
+        (left if i % 2 else right).add(f"user{i}")
+        left.add(f"user{i % 100}")  # Duplicates must not count
+    merged = pickle.loads(pickle.dumps(left)).merge(right)
+    assert abs(merged.count() - 20_000) < 20_000 * 0.05, "Merged estimate should be within 5%"
+    assert HyperLogLog.from_error(0.02).nbytes == 4096, "2% error needs 4 KiB of registers"
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(10))
+
+
+def test_count_min_never_undercounts() -> None:
+    """Test Count-Min Sketch estimates against exact counts."""
+    actions = zipf_actions(5000)
+    counts = Counter(action["user"] for action in actions)
+    sketch = CountMinSketch.from_error(epsilon=0.01, delta=0.01)
+    for user in counts.elements():
+        sketch.add(user)
+    for user, count in counts.items():
+        estimate = sketch.estimate(user)
+        assert count <= estimate <= count + 0.05 * sketch.total, f"Estimate for {user} out of bounds"
+
+
+def test_count_min_rows_differ_for_power_of_two_width() -> None:
+    """Test that an even second hash still spreads an item over distinct columns."""
+    sketch = CountMinSketch(width=256, depth=8)
+    sketch.add_hash(12345)  # upper 64 bits, the second hash, are 0
+    columns = [i % sketch.width for i, counter in enumerate(sketch.counters) if counter]
+    assert len(set(columns)) == sketch.depth, "Each row should use its own column"
+
+
+def test_space_saving_top_users() -> None:
+    """Test heavy hitters, including after merging two shards."""
+    actions = zipf_actions(20_000)
+    exact = [user for user, _ in Counter(a["user"] for a in actions).most_common(3)]
+    left, right = SpaceSaving(32), SpaceSaving(32)
+    for i, action in enumerate(actions):
+        (left if i % 2 else right).add(action["user"])
+    assert [user for user, _ in left.merge(right).top(3)] == exact, "Top users should match"
+
+
+def test_space_saving_evicts_smallest_count() -> None:
+    """Test that eviction picks the current minimum even after hits raised a count."""
+    summary = SpaceSaving(2)
+    summary.add("a")
+    summary.add("b")
+    summary.add("a", 5)
+    summary.add("c")
+    assert summary.counts == {"a": 6, "c": 2} and summary.errors == {"a": 0, "c": 1}, "Should evict b"
+    summary.add("d")
+    assert summary.counts == {"a": 6, "d": 3} and summary.errors == {"a": 0, "d": 2}, "Should evict c"
+    summary.merge(SpaceSaving(2))
+    summary.add("e", 4)
+    assert summary.counts == {"a": 6, "e": 7}, "Should evict d after a merge"
+
+
+def test_action_sketch_matches_exact_functions() -> None:
+    """Test the sketch against get_unique_users and summarize_actions."""
+    actions: list[Any] = zipf_actions(10_000) + [None, {"type": ["x"]}, {"user": 5}]
+    sketch = sketch_actions(actions[:5000]).merge(sketch_actions(actions[5000:]))
+    exact_users = len(get_unique_users(actions))
+    assert abs(sketch.unique_users() - exact_users) <= max(3, exact_users * 0.06), "Distinct users"
+    assert abs(estimate_unique_users(actions) - exact_users) <= max(3, exact_users * 0.06)
+    assert dict(sketch.top_types.top(4)) == summarize_actions(actions), "Few types are counted exactly"
+    assert sketch.nbytes < 16 * 1024, "Fixed-size parts should stay within a few KiB"
@@ -0,0 +1,50 @@
+"""Benchmark generate_report with and without the cache on a Zipf corpus"""
+
+import argparse
+import random
+import time
+from itertools import accumulate
+
+from module.email_cache import LRUCache
+from module.email_validator import generate_report
+
+
+def zipf_emails(count: int, distinct: int, s: float = 1.1, seed: int = 42) -> list[str]:
+    """Return `count` addresses drawn from `distinct` ones with Zipf(s) weights"""
+    rng = random.Random(seed)
+    domains = ["gmail.com", "yahoo.com", "work.com", "outlook.com", "corp.example.org"]
+    pool = [
+        f"user{i}.{rng.choice(['personal', 'work', 'team'])}@{rng.choice(domains)}"
+        if i % 20
+        else f"broken{i}"
+        for i in range(distinct)
+    ]
+    weights = list(accumulate(1 / rank**s for rank in range(1, distinct + 1)))
+    return rng.choices(pool, cum_weights=weights, k=count)
+
+
+def main() -> None:
+    """Time the report on the same corpus, uncached then cached"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--emails", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=100_000)
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    emails = zipf_emails(args.emails, args.distinct)
+    categories = ("personal", "work", "family")
+    print(f"{args.emails:,} addresses, {args.distinct:,} distinct (Zipf s=1.1):")
+    runs: list[tuple[str, LRUCache | bool]] = [
+        ("no cache", False),
+        (f"LRU cache ({args.cache_size:,})", LRUCache(args.cache_size)),
+    ]
+    for name, cache in runs:
+        start = time.perf_counter()
+        generate_report(emails, *categories, show_invalid=True, cache=cache)
+        elapsed = time.perf_counter() - start
+        rate = f", hit rate {cache.hit_rate:.1%}" if isinstance(cache, LRUCache) else ""
+        print(f"{name:<20} {args.emails / elapsed:>12,.0f} emails/sec ({elapsed:.2f}s{rate})")
+
+
+if __name__ == "__main__":
+    main()
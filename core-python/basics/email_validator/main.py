@@ -1,6 +1,7 @@
 """Email Validator"""
 
 from module.email_validator import generate_report, print_report
+from module.domain_report import DomainReport
 
 def main() -> None:
     """Main program"""
@@ -26,6 +27,11 @@ def main() -> None:
     report3 = generate_report(emails, show_invalid=True)
     print_report(report3)
 
+    print("\nReport 4: Top domains (compact report)")
+    report4 = DomainReport.from_emails(emails)
+    for domain, count in report4.top(3):
+        print(f"  {domain}: {count}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,133 @@
+import sys
+from array import array
+from heapq import nlargest
+from operator import itemgetter
+from typing import Any, Iterable, Iterator
+
+from module.email_validator import iter_report_entries
+
+
+class DomainReport:
+    """Compact report: interned domain IDs and emails in one shared buffer
+
+    Every email is stored as UTF-8 bytes in a single bytearray; per email
+    only its end offset (8 bytes) and domain ID (4 bytes) are kept, instead
+    of one str object plus a list slot per email and a list per domain.
+    """
+
+    def __init__(self) -> None:
+        self.domains: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._counts = array("I")
+        self._buffer = bytearray()
+        self._ends = array("Q")
+        self._owners = array("I")
+        # Rows grouped by domain (counting sort), built on first lookup
+        self._rows: array | None = None
+        self._starts: list[int] = []
+
+    @classmethod
+    def from_emails(
+        cls, emails: Iterable[str], *categories: str, **options: Any
+    ) -> "DomainReport":
+        """Build a report with the same options as generate_report"""
+        report = cls()
+        for domain, email in iter_report_entries(emails, *categories, **options):
+            report.add(domain, email)
+        return report
+
+    def add(self, domain: str, email: str) -> None:
+        """Append one email under its domain"""
+        domain_id = self._ids.get(domain)
+        if domain_id is None:
+            domain_id = len(self.domains)
+            self._ids[domain] = domain_id
+            self.domains.append(sys.intern(domain))
+            self._counts.append(0)
+        self._counts[domain_id] += 1
+        # surrogatepass: lone surrogates round-trip like in the dict report
+        self._buffer += email.encode("utf-8", "surrogatepass")
+        self._ends.append(len(self._buffer))
+        self._owners.append(domain_id)
+        self._rows = None
+
+    def __len__(self) -> int:
+        """Number of domains, like len() of the dict report"""
+        return len(self.domains)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.domains)
+
+    def __contains__(self, domain: object) -> bool:
+        return domain in self._ids
+
+    @property
+    def total(self) -> int:
+        """Number of emails in the report"""
+        return len(self._ends)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the email storage in bytes"""
+        return (
+            len(self._buffer)
+            + self._ends.itemsize * len(self._ends)
+            + self._owners.itemsize * len(self._owners)
+        )
+
+    def count(self, domain: str) -> int:
+        """Number of emails for a domain (0 if unknown)"""
+        domain_id = self._ids.get(domain)
+        return 0 if domain_id is None else self._counts[domain_id]
+
+    def counts(self) -> dict[str, int]:
+        """Return {domain: email count} in first-seen order"""
+        return dict(zip(self.domains, self._counts))
+
+    def top(self, n: int) -> list[tuple[str, int]]:
+        """Return the n domains with most emails, ties in first-seen order"""
+        return nlargest(n, zip(self.domains, self._counts), key=itemgetter(1))
+
+    def emails(self, domain: str) -> Iterator[str]:
+        """Lazily decode the emails of one domain, in insertion order"""
+        domain_id = self._ids.get(domain)
+        if domain_id is None:
+            return
+        rows = self._grouped()
+        start = self._starts[domain_id]
+        for row in rows[start : start + self._counts[domain_id]]:
+            yield self._email(row)
+
+    def items(self) -> Iterator[tuple[str, Iterator[str]]]:
+        """Lazily yield (domain, emails) pairs, like dict.items()"""
+        for domain in self.domains:
+            yield domain, self.emails(domain)
+
+    def to_dict(self) -> dict[str, list[str]]:
+        """Convert to the dict[str, list[str]] format of generate_report"""
+        report: dict[str, list[str]] = {domain: [] for domain in self.domains}
+        groups = list(report.values())
+        for row, domain_id in enumerate(self._owners):
+            groups[domain_id].append(self._email(row))
+        return report
+
+    def _email(self, row: int) -> str:
+        start = self._ends[row - 1] if row else 0
+        return self._buffer[start : self._ends[row]].decode("utf-8", "surrogatepass")
+
+    def _grouped(self) -> array:
+        if self._rows is None:
+            # Counting sort of row numbers by domain ID keeps insertion order
+            starts: list[int] = []
+            position = 0
+            for count in self._counts:
+                starts.append(position)
+                position += count
+            self._starts = starts
+            cursor = starts.copy()
+            rows = array("I", bytes(4 * len(self._owners)))
+            for row, domain_id in enumerate(self._owners):
+                rows[cursor[domain_id]] = row
+                cursor[domain_id] += 1
+            self._rows = rows
+        return self._rows
@@ -0,0 +1,107 @@
+import time
+from functools import lru_cache, partial, update_wrapper, wraps
+from typing import Any, Callable, NamedTuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_CACHE_SIZE: int = 65536
+
+
+class CacheInfo(NamedTuple):
+    """Counters of an LRUCache"""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class LRUCache:
+    """Size, TTL and hit/miss counters for memoized one-argument functions
+
+    Entries live in one functools.lru_cache (implemented in C), shared by
+    every function wrapped with this cache, so maxsize bounds them all: a
+    hit costs about a third of re-validating an address, while an
+    OrderedDict based LRU costs about as much as the work it saves.
+
+    With ttl (seconds) set, results are keyed by the ttl-long time window
+    they were computed in (int(clock() // ttl)): none is served more than
+    ttl seconds after it was computed, but one computed late in a window
+    expires early, with that window. Stale entries age out through the
+    normal LRU eviction.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        # Keyed by (function, argument, window): functions hash by identity
+        self._cached = lru_cache(maxsize=maxsize)(_call)
+
+    def wrap(self, func: Callable[[str], T]) -> Callable[[str], T]:
+        """Return a memoized version of func counted by this cache
+
+        Wrapping allocates nothing: wrap the same function object again
+        (e.g. once per report) and its earlier entries are hits.
+        """
+        cached, ttl, clock = self._cached, self.ttl, self.clock
+        wrapper: Callable[[str], T]
+        if ttl is None:
+            # A partial calls the C lru_cache directly: no Python frame per lookup
+            wrapper = update_wrapper(partial(cached, func), func)
+        else:
+
+            @wraps(func)
+            def wrapper(arg: str) -> T:
+                return cached(func, arg, int(clock() // ttl))
+
+        wrapper.cache = self  # type: ignore[attr-defined]
+        return wrapper
+
+    def info(self) -> CacheInfo:
+        """Return counters over all wrapped functions"""
+        stats = self._cached.cache_info()
+        # Every miss stores one entry; entries only leave by eviction
+        return CacheInfo(
+            stats.hits, stats.misses, stats.misses - stats.currsize, stats.currsize, self.maxsize
+        )
+
+    @property
+    def hits(self) -> int:
+        return self.info().hits
+
+    @property
+    def misses(self) -> int:
+        return self.info().misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache"""
+        stats = self.info()
+        lookups = stats.hits + stats.misses
+        return stats.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        self._cached.cache_clear()
+
+
+def _call(func: Callable[[str], T], arg: str, _window: int = 0) -> T:
+    return func(arg)
+
+
+def memoize(
+    func: Callable[[str], T], cache: LRUCache | None = None
+) -> Callable[[str], T]:
+    """Wrap a one-argument function with an LRUCache (exposed as .cache)"""
+    return (LRUCache() if cache is None else cache).wrap(func)
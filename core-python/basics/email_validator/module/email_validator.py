@@ -1,3 +1,18 @@
+import re
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Protocol
+
+from module.email_cache import DEFAULT_CACHE_SIZE, LRUCache, memoize
+
+
+class EmailRecord(NamedTuple):
+    """An address parsed once: local part, domain ("" if invalid), validity"""
+
+    local: str
+    domain: str
+    valid: bool
+
+
 def is_valid_email(email: str) -> bool:
     """Return True if email has '@' and a domain, False otherwise"""
     try:
@@ -13,34 +28,118 @@ def extract_domain(email: str) -> str:
     return email.split("@")[1] if is_valid_email(email) else ""
 
 
-def generate_report(
-    emails: list[str], *categories: str, **options: bool
-) -> dict[str, list[str]]:
-    """Groups valid emails by domain, optionally filtering by category"""
+def parse_email(email: str) -> EmailRecord:
+    """Split an email on '@' once; same rules as is_valid_email/extract_domain"""
+    parts = email.split("@", 2)
+    valid = len(parts) > 1 and "." in parts[1]
+    return EmailRecord(parts[0], parts[1] if valid else "", valid)
+
+
+def validate_many(emails: Iterable[str]) -> Iterator[EmailRecord]:
+    """Lazily parse a list or stream of emails, each exactly once"""
+    return map(parse_email, emails)
+
+
+def category_matcher(categories: Iterable[str]) -> Callable[[str], bool]:
+    """Return a function telling if an email contains any of the categories
+
+    All categories are combined into one precompiled pattern, so each
+    email is lower-cased and scanned once instead of once per category.
+    """
+    words = sorted({category.lower() for category in categories})
+    search = re.compile("|".join(map(re.escape, words))).search
+    return lambda email: search(email.lower()) is not None
+
+
+def iter_report_entries(
+    emails: Iterable[str], *categories: str, **options: Any
+) -> Iterator[tuple[str, str]]:
+    """Lazily yield (domain, email) pairs that belong in a report
+
+    Options: show_invalid (bool); cache memoizes the report key of
+    repeated addresses: True for a cache of this call only (sized by
+    cache_size and cache_ttl), or an LRUCache to share across calls, whose
+    maxsize bounds the entries of all of them.
+    """
 
-    report: dict[str, list[str]] = {}
     show_invalid: bool = options.get("show_invalid", False)
+    # Check if email matches any category (e.g., 'personal', 'work')
+    matches_category = category_matcher(categories) if categories else None
+    cache: LRUCache | bool = options.get("cache", False)
 
-    for email in emails:
-        if is_valid_email(email):
-            domain = extract_domain(email)
-            # Check if email matches any category (e.g., 'personal', 'work')
-            matches_category = any(
-                category.lower() in email.lower() for category in categories
+    if cache:
+        report_key = _report_key_function(categories, show_invalid)
+        if not isinstance(cache, LRUCache):
+            cache = LRUCache(
+                options.get("cache_size", DEFAULT_CACHE_SIZE),
+                options.get("cache_ttl"),
             )
-            if not categories or matches_category:
-                if domain not in report:
-                    report[domain] = []
-                report[domain].append(email)
+        cached_key = memoize(report_key, cache)
+        for email in emails:
+            key = cached_key(email)
+            if key is not None:
+                yield key, email
+        return
+
+    for email in emails:
+        # Same rule as parse_email(), inlined: one split per address
+        parts = email.split("@", 2)
+        if len(parts) > 1 and "." in parts[1]:
+            if matches_category is None or matches_category(email):
+                yield parts[1], email
         elif show_invalid:
-            if "invalid" not in report:
-                report["invalid"] = []
-            report["invalid"].append(email)
+            yield "invalid", email
+
+
+@lru_cache(maxsize=64)
+def _report_key_function(
+    categories: tuple[str, ...], show_invalid: bool
+) -> Callable[[str], str | None]:
+    """One report-key function per set of options
+
+    Reports with the same options get the same function object, so the
+    entries they leave in a shared LRUCache are hits for each other.
+    """
+    matches_category = category_matcher(categories) if categories else None
+
+    def report_key(email: str) -> str | None:
+        """Domain, "invalid" or None (left out) for one address"""
+        parts = email.split("@", 2)
+        if len(parts) > 1 and "." in parts[1]:
+            if matches_category is None or matches_category(email):
+                return parts[1]
+            return None
+        return "invalid" if show_invalid else None
+
+    return report_key
+
+
+def generate_report(
+    emails: Iterable[str], *categories: str, **options: Any
+) -> dict[str, list[str]]:
+    """Groups valid emails by domain, optionally filtering by category
+
+    Pass cache=True to memoize repeated addresses (see iter_report_entries).
+    """
+
+    report: dict[str, list[str]] = {}
+    for domain, email in iter_report_entries(emails, *categories, **options):
+        if domain not in report:
+            report[domain] = []
+        report[domain].append(email)
     return report
 
 
-def print_report(report: dict[str, list[str]]) -> None:
-    """Displays emails grouped by domain"""
+class ReportLike(Protocol):
+    """Anything print_report can walk: a plain dict or a DomainReport"""
+
+    def __len__(self) -> int: ...
+
+    def items(self) -> Iterable[tuple[str, Iterable[str]]]: ...
+
+
+def print_report(report: ReportLike) -> None:
+    """Displays emails grouped by domain (a dict or a DomainReport)"""
 
     if not report:
         print("No emails to report")
@@ -0,0 +1,108 @@
+"""Chunked multi-process and asyncio report generation with in-order merging"""
+
+import asyncio
+import os
+from itertools import islice
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from module.email_cache import LRUCache
+from module.email_validator import generate_report
+from modules.ordered_pool import map_ordered
+
+CHUNK_SIZE: int = 50_000
+BATCH_SIZE: int = 1000
+
+Report = dict[str, list[str]]
+
+
+def iter_chunks(emails: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[list[str]]:
+    """Cut a list or stream of emails into lists of at most chunk_size"""
+    emails = iter(emails)
+    while chunk := list(islice(emails, chunk_size)):
+        yield chunk
+
+
+def merge_reports(total: Report, partial: Report) -> Report:
+    """Append a later partial report into the running total
+
+    Merging partials in input order keeps each domain's emails, and the
+    domains themselves, in the order generate_report would give. The
+    lists of `partial` are reused, not copied.
+    """
+    for domain, emails in partial.items():
+        if domain in total:
+            total[domain].extend(emails)
+        else:
+            total[domain] = emails
+    return total
+
+
+def _report_chunk(
+    chunk: list[str], categories: tuple[str, ...], options: dict[str, Any]
+) -> Report:
+    return generate_report(chunk, *categories, **options)
+
+
+def generate_report_parallel(
+    emails: Iterable[str],
+    *categories: str,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    max_pending: int | None = None,
+    **options: Any,
+) -> Report:
+    """generate_report over chunks in a process pool, same result and order
+
+    At most `max_pending` chunks (default: 2 per worker) are in flight, so
+    a stream of emails is never read far ahead of the workers. cache=True
+    gives each chunk its own cache; a shared LRUCache cannot cross process
+    boundaries and is only accepted with workers=1.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if workers > 1 and isinstance(options.get("cache"), LRUCache):
+        raise ValueError("An LRUCache cannot be shared with worker processes: pass cache=True or workers=1")
+    chunks = iter_chunks(emails, chunk_size)
+
+    total: Report = {}
+    for partial in map_ordered(
+        _report_chunk, chunks, categories, options, workers=workers, max_pending=max_pending
+    ):
+        merge_reports(total, partial)
+    return total
+
+
+async def iter_queue(queue: "asyncio.Queue[str | None]") -> AsyncIterator[str]:
+    """Yield emails from an asyncio.Queue until a None sentinel arrives"""
+    while (email := await queue.get()) is not None:
+        yield email
+
+
+async def report_updates(
+    source: AsyncIterable[str],
+    *categories: str,
+    batch_size: int = BATCH_SIZE,
+    **options: Any,
+) -> AsyncIterator[Report]:
+    """Yield a partial report for every batch_size emails of an async source
+
+    Each update holds only the new entries; fold them with merge_reports()
+    to get the full report. Between batches control goes back to the event
+    loop, so a large source never blocks other tasks for long.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    batch: list[str] = []
+    async for email in source:
+        batch.append(email)
+        if len(batch) >= batch_size:
+            update = generate_report(batch, *categories, **options)
+            batch = []
+            if update:
+                yield update
+            await asyncio.sleep(0)
+    if batch:
+        update = generate_report(batch, *categories, **options)
+        if update:
+            yield update
@@ -0,0 +1,54 @@
+import pytest
+from module.email_validator import generate_report, print_report
+from module.domain_report import DomainReport
+
+EMAILS: list[str] = [
+    "alice@gmail.com",
+    "bob@work.com",
+    "invalid.email",
+    "carol@gmail.com",
+    "dave.personal@yahoo.com",
+    "erin@gmail.com",
+    "frank@work.com",
+]
+
+def test_to_dict_matches_generate_report() -> None:
+    """Test that the compact report converts to the dict format."""
+    for categories, options in [((), {}), (("personal",), {}), ((), {"show_invalid": True})]:
+        report = DomainReport.from_emails(EMAILS, *categories, **options)
+        expected = generate_report(EMAILS, *categories, **options)
+        assert report.to_dict() == expected, f"Should match generate_report for {categories} {options}"
+        assert list(report.to_dict()) == list(expected), "Domains should keep first-seen order"
+
+def test_counts_and_top() -> None:
+    """Test per-domain counts and top-N domains."""
+    report = DomainReport.from_emails(EMAILS)
+    assert len(report) == 3, "Length should be the number of domains"
+    assert report.total == 6, "Total should count valid emails"
+    assert report.count("gmail.com") == 3, "Should count emails per domain"
+    assert report.count("unknown.com") == 0, "Unknown domain should count 0"
+    assert report.top(2) == [("gmail.com", 3), ("work.com", 2)], "Should rank domains"
+    assert report.counts() == {"gmail.com": 3, "work.com": 2, "yahoo.com": 1}
+
+def test_lazy_emails_after_more_adds() -> None:
+    """Test per-domain iteration, including after new rows are added."""
+    report = DomainReport.from_emails(EMAILS)
+    assert list(report.emails("work.com")) == ["bob@work.com", "frank@work.com"]
+    report.add("work.com", "zoë@work.com")
+    assert list(report.emails("work.com"))[-1] == "zoë@work.com", "Should see non-ASCII rows added later"
+    assert list(report.emails("nope.org")) == [], "Unknown domain should yield nothing"
+
+def test_lone_surrogates_match_generate_report() -> None:
+    """Test emails with lone surrogates (e.g. from os.fsdecode) like the dict report."""
+    emails = ["bad\udcff@work.com", "ok@work.com", "x\ud800y@gmail.com"]
+    report = DomainReport.from_emails(emails)
+    assert report.to_dict() == generate_report(emails), "Should store and decode lone surrogates"
+
+def test_print_report_accepts_domain_report(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that print_report prints a compact report like a dict."""
+    print_report(generate_report(EMAILS))
+    expected = capsys.readouterr().out
+    print_report(DomainReport.from_emails(EMAILS))
+    assert capsys.readouterr().out == expected, "Output should be identical"
+    print_report(DomainReport())
+    assert capsys.readouterr().out == "No emails to report\n", "Empty report message"
@@ -0,0 +1,71 @@
+import pytest
+from module.email_cache import LRUCache, memoize
+from module.email_validator import generate_report
+
+def test_memoize_counts_hits_and_evicts() -> None:
+    """Test hit/miss counters and LRU eviction."""
+    calls: list[str] = []
+
+    def upper(text: str) -> str:
+        calls.append(text)
+        return text.upper()
+
+    cache = LRUCache(maxsize=2)
+    cached = memoize(upper, cache)
+    assert [cached(x) for x in ["a", "b", "a", "c", "b"]] == ["A", "B", "A", "C", "B"]
+    assert calls == ["a", "b", "c", "b"], "'b' should be evicted as least recently used"
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions, info.size) == (1, 4, 2, 2), "Counters should add up"
+    assert getattr(cached, "cache") is cache, "Wrapped function should expose its cache"
+    cache.clear()
+    assert cache.info().size == 0 and cache.hit_rate == 0.0, "Clear should reset the cache"
+
+def test_ttl_expires_entries() -> None:
+    """Test that entries are recomputed once their TTL window has passed (windows, not per-entry ages)."""
+    now = [100.0]
+    calls: list[str] = []
+    cache = LRUCache(maxsize=8, ttl=10, clock=lambda: now[0])
+
+    def length(text: str) -> int:
+        calls.append(text)
+        return len(text)
+
+    cached = memoize(length, cache)
+    cached("abc")
+    now[0] = 109.0
+    cached("abc")
+    assert len(calls) == 1, "Entry should still be fresh"
+    now[0] = 110.0
+    cached("abc")
+    assert len(calls) == 2, "Entry should expire after ttl"
+
+def test_generate_report_with_cache() -> None:
+    """Test that caching does not change the report."""
+    emails = ["a.work@x.com", "bad", "b@y.org", "a.work@x.com", "bad"] * 3
+    cache = LRUCache(maxsize=16)
+    for categories in [(), ("work",)]:
+        expected = generate_report(emails, *categories, show_invalid=True)
+        assert generate_report(emails, *categories, show_invalid=True, cache=True) == expected
+        assert generate_report(emails, *categories, show_invalid=True, cache=cache) == expected
+    assert cache.hits > cache.misses, "Repeated addresses should hit the cache"
+
+def test_shared_cache_stays_bounded() -> None:
+    """Test that one cache reused across many reports never exceeds maxsize."""
+    cache = LRUCache(maxsize=100)
+    for report in range(50):
+        emails = [f"user{report}_{i}@d{i % 7}.com" for i in range(100)]
+        generate_report(emails, cache=cache)
+        assert cache.info().size <= 100, "Entries of all reports should share maxsize"
+    repeated = [f"user49_{i}@d{i % 7}.com" for i in range(100)]
+    hits = cache.hits
+    generate_report(repeated, cache=cache)
+    assert cache.hits - hits == 100, "A later report with the same options should hit earlier entries"
+    generate_report(repeated, "work", cache=cache)
+    assert cache.hits - hits == 100, "Other options should not reuse those entries"
+
+def test_invalid_cache_options() -> None:
+    """Test validation of cache settings."""
+    with pytest.raises(ValueError, match="maxsize"):
+        LRUCache(maxsize=0)
+    with pytest.raises(ValueError, match="ttl"):
+        LRUCache(ttl=0)
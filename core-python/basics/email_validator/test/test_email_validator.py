@@ -1,5 +1,12 @@
 import pytest
-from module.email_validator import is_valid_email, extract_domain, generate_report
+from module.email_validator import (
+    is_valid_email,
+    extract_domain,
+    generate_report,
+    parse_email,
+    validate_many,
+    category_matcher,
+)
 
 def test_is_valid_email() -> None:
     """Test email validation function."""
@@ -60,3 +67,29 @@ def test_generate_report_edge_cases() -> None:
     # Test: No matching category
     report = generate_report(["alice@gmail.com"], "work")
     assert report == {}, "No matching emails should return empty report"
+
+def test_parse_email_matches_per_call_helpers() -> None:
+    """Test that parse_email agrees with is_valid_email and extract_domain."""
+    for email in ["alice@gmail.com", "invalid.email", "no@domain", "", "a@b.c@d", "@x.io"]:
+        record = parse_email(email)
+        assert record.valid == is_valid_email(email), f"Validity should match for {email!r}"
+        assert record.domain == extract_domain(email), f"Domain should match for {email!r}"
+    assert parse_email("bob@work.com") == ("bob", "work.com", True), "Should split local and domain"
+
+def test_validate_many_is_lazy() -> None:
+    """Test batch validation over a stream of emails."""
+    stream = (f"user{i}@site{i % 3}.com" for i in range(5))
+    records = validate_many(stream)
+    assert next(records).domain == "site0.com", "Should yield records one at a time"
+    assert [record.local for record in records] == ["user1", "user2", "user3", "user4"]
+
+def test_category_matcher() -> None:
+    """Test the combined, case-insensitive category matcher."""
+    matches = category_matcher(["Personal", "work", "a.b"])
+    assert matches("charlie.PERSONAL@yahoo.com") is True, "Should ignore case"
+    assert matches("bob@work.com") is True, "Should match any category"
+    assert matches("axb@gmail.com") is False, "Categories should match literally"
+    assert generate_report(["x@WORK.com", "y@home.com"], "work", "home") == {
+        "WORK.com": ["x@WORK.com"],
+        "home.com": ["y@home.com"],
+    }, "Report should keep emails matching any category"
@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from module.email_cache import LRUCache
+from module.email_validator import generate_report
+from module.parallel_report import (
+    generate_report_parallel,
+    iter_queue,
+    merge_reports,
+    report_updates,
+)
+
+EMAILS: list[str] = [
+    f"user{i}.{'work' if i % 3 else 'personal'}@{['a.com', 'b.org', 'c.net'][i % 7 % 3]}"
+    if i % 5
+    else f"invalid{i}"
+    for i in range(200)
+]
+
+def test_parallel_matches_serial() -> None:
+    """Test that chunked reports merge to the serial result, order included."""
+    for categories, options in [((), {}), (("personal",), {"show_invalid": True})]:
+        expected = generate_report(EMAILS, *categories, **options)
+        for workers in (1, 2):
+            result = generate_report_parallel(
+                iter(EMAILS), *categories, workers=workers, chunk_size=7, max_pending=2, **options
+            )
+            assert result == expected, f"Report should match with {workers} workers"
+            assert list(result) == list(expected), "Domain order should match"
+
+def test_merge_reports_keeps_order() -> None:
+    """Test merging partial reports."""
+    total = merge_reports({"a.com": ["x@a.com"]}, {"b.com": ["y@b.com"], "a.com": ["z@a.com"]})
+    assert total == {"a.com": ["x@a.com", "z@a.com"], "b.com": ["y@b.com"]}, "Should append in order"
+
+def test_report_updates_from_queue() -> None:
+    """Test async report updates fed from an asyncio.Queue."""
+
+    async def run() -> tuple[list[dict[str, list[str]]], int]:
+        queue: asyncio.Queue[str | None] = asyncio.Queue()
+        ticks = 0
+
+        async def producer() -> None:
+            for email in EMAILS:
+                await queue.put(email)
+            await queue.put(None)
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        tasks = [asyncio.create_task(producer()), asyncio.create_task(ticker())]
+        updates = [update async for update in report_updates(iter_queue(queue), batch_size=16)]
+        tasks[1].cancel()
+        return updates, ticks
+
+    updates, ticks = asyncio.run(run())
+    total: dict[str, list[str]] = {}
+    for update in updates:
+        merge_reports(total, update)
+    assert total == generate_report(EMAILS), "Merged updates should equal the full report"
+    assert len(updates) == 13, "One update per batch of 16 (the last one partial)"
+    assert ticks > 0, "Other tasks should run while the report is built"
+
+def test_invalid_options() -> None:
+    """Test option validation."""
+    with pytest.raises(ValueError):
+        generate_report_parallel(EMAILS, chunk_size=0)
+    with pytest.raises(ValueError, match="cannot be shared with worker processes"):
+        generate_report_parallel(EMAILS, workers=2, cache=LRUCache())
+    cache = LRUCache()
+    assert generate_report_parallel(EMAILS, workers=1, cache=cache) == generate_report(EMAILS)
+    assert cache.misses > 0, "A shared cache should be used in-process"
+
+    async def drain() -> None:
+        async for _ in report_updates(iter_queue(asyncio.Queue()), batch_size=0):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(drain())
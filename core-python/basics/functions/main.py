@@ -1,7 +1,8 @@
 """Function"""
 
 from typing import Callable, Any
-from module.functions import process_numbers
+from module.functions import ProcessStats, iter_process_numbers, memoize_call, memoize_operation, process_numbers
+from module.profiling import PROFILER
 
 def main() -> None:
     """Main function to demonstrate the use of process_numbers with decorators"""
@@ -35,6 +36,29 @@ def main() -> None:
     invalid_result = process_numbers(invalid_numbers, square)
     print(f"Invalid input result: {invalid_result}")
 
+    # Lazy, fused pass: square then add one, invalid inputs only counted
+    print("\nProcessing a stream with square then +1:")
+    stats = ProcessStats()
+    stream = (x if x % 4 else "bad" for x in range(1, 11))
+    fused = list(iter_process_numbers(stream, square, lambda x: x + 1, stats=stats))
+    print(f"Results: {fused}")
+    print(stats)
+
+    # Memoized operation: repeated inputs are computed once
+    print("\nProcessing repeated numbers with a memoized cube:")
+    cached_cube = memoize_operation(cube, policy="lfu", maxsize=128)
+    process_numbers(numbers * 100, cached_cube)
+    print(f"Cache: {cached_cube.cache.info()}, hit rate {cached_cube.cache.hit_rate:.0%}")
+
+    # Memoized call: the same list and operation return the stored result
+    cached_process = memoize_call(process_numbers, max_bytes=1 << 20)
+    cached_process(numbers, square)
+    print(f"Memoized call: {cached_process(numbers, square)}, hits {cached_process.cache.hits}")
+
+    # Timings recorded by timing_decorator
+    print("\nTimings:")
+    print(PROFILER.report())
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,224 @@
+"""Bounded result cache: LRU or LFU eviction, byte cap, hit rate and pickle persistence"""
+
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple
+
+POLICIES: tuple[str, ...] = ("lru", "lfu")
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    """Counters of a ResultCache"""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    nbytes: int
+
+
+def sizeof(value: Any) -> int:
+    """Approximate bytes held by a value (containers: one level deep)"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(map(sys.getsizeof, value))
+    elif isinstance(value, dict):
+        size += sum(map(sys.getsizeof, value)) + sum(map(sys.getsizeof, value.values()))
+    return size
+
+
+class ResultCache:
+    """Memoized results, bounded by entry count and/or bytes
+
+    policy "lru" evicts the least recently used entry, "lfu" the least
+    frequently used one (the oldest among equals). With path set, a
+    decorator using the cache loads saved entries when it wraps its
+    function and save() writes them back, so results survive between runs.
+    A lock makes every operation safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        policy: str = "lru",
+        maxsize: int | None = 4096,
+        max_bytes: int | None = None,
+        path: str | None = None,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(POLICIES)}")
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.policy = policy
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.path = path
+        self.namespace: str | None = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._reset()
+
+    def _reset(self) -> None:
+        self._values: dict[Hashable, Any] = {}
+        self._sizes: dict[Hashable, int] = {}
+        # LRU: keys from least to most recently used
+        self._order: OrderedDict[Hashable, None] = OrderedDict()
+        # LFU: use count of each key, and keys by use count (oldest first)
+        self._uses: dict[Hashable, int] = {}
+        self._by_uses: dict[int, OrderedDict[Hashable, None]] = {}
+        self._min_uses = 0
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a cached value (counted as a hit) or default (a miss)"""
+        with self._lock:
+            value = self._values.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            if self.policy == "lru":
+                self._order.move_to_end(key)
+            else:
+                self._touch(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting entries to stay within the bounds"""
+        size = sizeof(value)
+        with self._lock:
+            self._put(key, value, size)
+
+    def _put(self, key: Hashable, value: Any, size: int) -> None:
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # would evict everything else and still not fit
+        if key in self._values:
+            self._remove(key)
+        while self._values and (
+            (self.maxsize is not None and len(self._values) >= self.maxsize)
+            or (self.max_bytes is not None and self.nbytes + size > self.max_bytes)
+        ):
+            self._remove(self._victim())
+            self.evictions += 1
+        self._values[key] = value
+        self._sizes[key] = size
+        self.nbytes += size
+        if self.policy == "lru":
+            self._order[key] = None
+        else:
+            self._uses[key] = 1
+            self._by_uses.setdefault(1, OrderedDict())[key] = None
+            self._min_uses = 1
+
+    def _touch(self, key: Hashable) -> None:
+        uses = self._uses[key]
+        bucket = self._by_uses[uses]
+        del bucket[key]
+        if not bucket:
+            del self._by_uses[uses]
+            if self._min_uses == uses:
+                self._min_uses = uses + 1
+        self._uses[key] = uses + 1
+        self._by_uses.setdefault(uses + 1, OrderedDict())[key] = None
+
+    def _regroup_uses(self) -> None:
+        """Rebuild the LFU buckets from _uses, keeping the order within a count"""
+        by_uses: dict[int, OrderedDict[Hashable, None]] = {}
+        for uses in sorted(self._by_uses):
+            for key in self._by_uses[uses]:
+                by_uses.setdefault(self._uses[key], OrderedDict())[key] = None
+        self._by_uses = by_uses
+        self._min_uses = min(by_uses, default=0)
+
+    def _victim(self) -> Hashable:
+        if self.policy == "lru":
+            return next(iter(self._order))
+        return next(iter(self._by_uses[self._min_uses]))
+
+    def _remove(self, key: Hashable) -> None:
+        del self._values[key]
+        self.nbytes -= self._sizes.pop(key)
+        if self.policy == "lru":
+            del self._order[key]
+            return
+        uses = self._uses.pop(key)
+        bucket = self._by_uses[uses]
+        del bucket[key]
+        if not bucket:
+            del self._by_uses[uses]
+            if self._min_uses == uses:
+                self._min_uses = min(self._by_uses, default=0)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, len(self._values), self.nbytes)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def bind(self, namespace: str) -> None:
+        """Attach the cache to one function and load its saved entries, if any
+
+        The namespace identifies the function (see the decorators), so a
+        file saved for another function is ignored rather than misused.
+        """
+        if self.namespace is not None and self.namespace != namespace and self.path:
+            raise ValueError("A persistent cache can back only one function")
+        self.namespace = namespace
+        if not self.path or not os.path.exists(self.path):
+            return
+        # Pickle: only load cache files this program wrote itself
+        with open(self.path, "rb") as file:
+            saved_namespace, entries = pickle.load(file)
+        if saved_namespace != namespace:
+            return
+        with self._lock:
+            # Entries come least used first, so evictions while loading drop those
+            for key, value, _ in entries:
+                self._put(key, value, sizeof(value))
+            if self.policy == "lfu":
+                for key, _, uses in entries:
+                    if key in self._uses:
+                        self._uses[key] = uses
+                self._regroup_uses()
+
+    def save(self) -> int:
+        """Write the entries to path (atomically); return how many were saved"""
+        if not self.path:
+            raise ValueError("No path set for this cache")
+        with self._lock:
+            # Saved oldest / least used first, so loading rebuilds the same order
+            keys = list(self._order) if self.policy == "lru" else [
+                key for uses in sorted(self._by_uses) for key in self._by_uses[uses]
+            ]
+            entries = [(key, self._values[key], self._uses.get(key, 1)) for key in keys]
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump((self.namespace, entries), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, self.path)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+        return len(entries)
@@ -1,43 +1,451 @@
-import time
-from typing import Callable, Any
+import copy
+import dis
+import inspect
+import os
+import pickle
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from functools import wraps
+from hashlib import blake2b
+from itertools import islice
+from types import BuiltinFunctionType, CodeType, ModuleType
+from typing import Callable, Any, Generator, Iterable
+from weakref import WeakKeyDictionary
+
+from module.caching import ResultCache
+from module.profiling import PROFILER
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only needed for execution="vectorized"
+    np = None
+
+EXECUTION_MODES: tuple[str, ...] = ("serial", "vectorized", "threads", "processes")
+CHUNK_SIZE: int = 100_000
+BATCH_SIZE: int = 8192
 
 
 def timing_decorator(func: Callable[..., Any]) -> Callable[..., Any]:
-    """Print how long a func takes to run"""
+    """Record how long a func takes to run in the shared PROFILER
 
-    @wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        start_time: float = time.time()
-        result = func(*args, **kwargs)
-        end_time: float = time.time()
-        print(f"{func.__name__} took {end_time - start_time:.4f} seconds")
+    Nothing is printed per call; use PROFILER.report(), to_json() or
+    to_prometheus() to read the timings.
+    """
+    return PROFILER.profile(func)
+
+
+def callable_key(func: Callable[..., Any]) -> str:
+    """Identify a function by its code, defaults, closure values and globals
+
+    Decorators are looked through (__wrapped__). Defaults, closure values
+    and the globals the code reads must be constants (numbers, strings,
+    tuples...), classes, modules or functions (keyed the same way, so a
+    changed helper changes the key), so the key is the same in every run
+    and is computed once per function. Other values, e.g. a captured or
+    global list, raise TypeError: their content may change after the key
+    is taken.
+    """
+    try:
+        return _CALLABLE_KEYS[func]
+    except (KeyError, TypeError):  # TypeError: not weakly referenceable
+        pass
+    key = _callable_key(func, set())
+    try:
+        _CALLABLE_KEYS[func] = key
+    except TypeError:
+        pass
+    return key
+
+
+# Keys of live functions, dropped with them
+_CALLABLE_KEYS: "WeakKeyDictionary[Callable[..., Any], str]" = WeakKeyDictionary()
+
+
+def _callable_key(func: Callable[..., Any], seen: set[int]) -> str:
+    func = inspect.unwrap(func)
+    name = f"{getattr(func, '__module__', None)}.{getattr(func, '__qualname__', None)}"
+    if isinstance(func, BuiltinFunctionType):
+        return name
+    code = getattr(func, "__code__", None)
+    if code is None:
+        raise TypeError(f"No stable key for {type(func).__name__} objects")
+    if id(func) in seen:  # recursive closure: the outer key covers it
+        return name
+    seen.add(id(func))
+    closure = tuple(cell.cell_contents for cell in getattr(func, "__closure__", None) or ())
+    kwdefaults = tuple(sorted((getattr(func, "__kwdefaults__", None) or {}).items()))
+    namespace = getattr(func, "__globals__", None) or {}
+    # Builtins and names not defined yet are left out: only module globals count
+    global_values = tuple(
+        (name, namespace[name]) for name in sorted(_global_names(code)) if name in namespace
+    )
+    state = (
+        code,
+        getattr(func, "__defaults__", None),
+        kwdefaults,
+        closure,
+        getattr(func, "__self__", None),
+        global_values,
+    )
+    digest = blake2b(_stable_repr(state, seen).encode(), digest_size=16)
+    return f"{name}:{digest.hexdigest()}"
+
+
+def _global_names(code: CodeType) -> set[str]:
+    """Names read as globals by code and the functions nested in it"""
+    names = {
+        instruction.argval
+        for instruction in dis.get_instructions(code)
+        if instruction.opname in ("LOAD_GLOBAL", "LOAD_NAME")
+    }
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _global_names(const)
+    return names
+
+
+def _stable_repr(value: Any, seen: set[int]) -> str:
+    """repr() that is the same in every run, for constants, code and functions"""
+    if value is None or value is Ellipsis or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    if isinstance(value, tuple):
+        return "(" + ",".join(_stable_repr(item, seen) for item in value) + ")"
+    if isinstance(value, frozenset):  # iteration order of str varies between runs
+        return "frozenset(" + ",".join(sorted(_stable_repr(item, seen) for item in value)) + ")"
+    if isinstance(value, CodeType):
+        # Not marshal: its output depends on reference counts
+        parts = (value.co_code, value.co_consts, value.co_names, value.co_varnames, value.co_freevars)
+        return "code" + _stable_repr(parts, seen)
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, ModuleType):
+        return f"module {value.__name__}"
+    if callable(value):
+        return _callable_key(value, seen)
+    raise TypeError(f"No stable key for {type(value).__name__} values")
+
+
+def content_hash(value: Any) -> bytes:
+    """128-bit digest of a picklable value (1 and 1.0 hash differently)"""
+    return blake2b(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16).digest()
+
+
+def _namespace(func: Callable[..., Any], cache: ResultCache, namespace: str | None) -> str:
+    """Name the function a cache belongs to: namespace, else callable_key()"""
+    if namespace is not None:
+        return namespace
+    try:
+        return callable_key(func)
+    except TypeError as e:
+        if cache.path:
+            raise ValueError(f"{e}: pass namespace= to persist the cache of {func!r}") from e
+        # Nothing is saved: the name only has to be unique within this run
+        return f"{func!r}:{id(func)}"
+
+
+def memoize_operation(
+    operation: Callable[[Any], Any] | None = None,
+    *,
+    cache: ResultCache | None = None,
+    namespace: str | None = None,
+    **cache_options: Any,
+) -> Any:
+    """Cache an operation's result per input value, e.g. for process_numbers
+
+    Usable bare or with ResultCache options (policy, maxsize, max_bytes,
+    path). Errors are not cached, so process_numbers still skips invalid
+    inputs; unhashable inputs are passed through uncached. A saved cache
+    is reloaded for the same callable_key(); name it with namespace= when
+    the operation captures values that have no stable key.
+    """
+    if operation is None:
+        return lambda op: memoize_operation(op, cache=cache, namespace=namespace, **cache_options)
+    cache = ResultCache(**cache_options) if cache is None else cache
+    cache.bind(_namespace(operation, cache, namespace))
+    get, put, missing = cache.get, cache.put, object()
+
+    @wraps(operation)
+    def wrapper(value: Any) -> Any:
+        # Keyed with the type too: 2 and 2.0 are equal but 2 ** 0.5 is not 2.0 ** 0.5 in general.
+        # Floats by their exact value: -0.0 == 0.0, and nan != nan would never hit
+        cls = value.__class__
+        key = (cls, value.hex()) if cls is float else (cls, value)
+        try:
+            result = get(key, missing)
+        except TypeError:  # unhashable input
+            return operation(value)
+        if result is missing:
+            result = operation(value)
+            put(key, result)
         return result
 
+    wrapper.cache = cache  # type: ignore[attr-defined]
     return wrapper
 
 
-@timing_decorator
-def process_numbers(
-    numbers: list[float], operation: Callable[[float], float]
-) -> list[float]:
-    """Transform numbers using a provided lambda"""
-    if not numbers:
-        raise ValueError("Input list cannot be empty")
+def memoize_call(
+    func: Callable[..., Any] | None = None,
+    *,
+    cache: ResultCache | None = None,
+    namespace: str | None = None,
+    **cache_options: Any,
+) -> Any:
+    """Cache whole calls, keyed on a content hash of all the arguments
+
+    Functions among the arguments (e.g. the operation of process_numbers)
+    are keyed by callable_key(). A hit returns a shallow copy of the
+    stored result and does not repeat the call's side effects (prints).
+    Calls with unpicklable arguments, or functions without a stable key,
+    are not cached. namespace= works as in memoize_operation.
+    """
+    if func is None:
+        return lambda f: memoize_call(f, cache=cache, namespace=namespace, **cache_options)
+    cache = ResultCache(**cache_options) if cache is None else cache
+    cache.bind(_namespace(func, cache, namespace))
+    missing = object()
+
+    def argument_key(value: Any) -> Any:
+        return callable_key(value) if callable(value) else value
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            key = content_hash(
+                ([argument_key(arg) for arg in args], sorted((k, argument_key(v)) for k, v in kwargs.items()))
+            )
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return func(*args, **kwargs)
+        result = cache.get(key, missing)
+        if result is missing:
+            result = func(*args, **kwargs)
+            cache.put(key, result)
+        return copy.copy(result)
+
+    wrapper.cache = cache  # type: ignore[attr-defined]
+    return wrapper
 
+
+def _apply(
+    numbers: list[Any],
+    operation: Callable[[float], float],
+    on_zero_division: Callable[[str], None],
+) -> tuple[list[float], list[Any]]:
+    """Serial loop: return (results, invalid inputs), report divisions by zero"""
     results: list[float] = []
     invalid_inputs: list[Any] = []
-
+    append = results.append
     for num in numbers:
         try:
-            result = operation(num)
-            results.append(result)
+            append(operation(num))
         except TypeError:
             invalid_inputs.append(num)
         except ZeroDivisionError as e:
-            print(f"{e} - float division by zero")
+            on_zero_division(f"{e} - float division by zero")
+    return results, invalid_inputs
+
+
+def _apply_chunk(
+    numbers: list[Any], operation: Callable[[float], float]
+) -> tuple[list[float], list[Any], list[str]]:
+    """Pool task: like _apply, but collect the messages for the caller to print"""
+    messages: list[str] = []
+    results, invalid_inputs = _apply(numbers, operation, messages.append)
+    return results, invalid_inputs, messages
+
+
+def _apply_vectorized(
+    numbers: list[Any], operation: Callable[[float], float]
+) -> list[float] | None:
+    """Apply operation to the whole array at once; None if that would differ
+
+    Only all-numeric input qualifies, and any floating point error (e.g. a
+    division by zero, which numpy would turn into inf) or an operation numpy
+    cannot broadcast means the serial loop must run instead.
+    """
+    if np is None:
+        return None
+    array = np.asarray(numbers)
+    if array.ndim != 1 or array.dtype.kind not in "biuf":
+        return None
+    try:
+        with np.errstate(all="raise"):
+            result = operation(array.astype(np.float64, copy=False))
+    except Exception:
+        return None
+    if not isinstance(result, np.ndarray) or result.shape != array.shape:
+        return None
+    return result.tolist()
+
+
+def _apply_pool(
+    numbers: list[Any],
+    operation: Callable[[float], float],
+    executor: Executor,
+    chunk_size: int,
+) -> tuple[list[float], list[Any]]:
+    """Run chunks in a pool, then merge and report in input order"""
+    chunks = [numbers[i : i + chunk_size] for i in range(0, len(numbers), chunk_size)]
+    results: list[float] = []
+    invalid_inputs: list[Any] = []
+    for chunk_results, chunk_invalid, messages in executor.map(
+        _apply_chunk, chunks, [operation] * len(chunks)
+    ):
+        for message in messages:
+            print(message)
+        results.extend(chunk_results)
+        invalid_inputs.extend(chunk_invalid)
+    return results, invalid_inputs
+
+
+@timing_decorator
+def process_numbers(
+    numbers: list[float],
+    operation: Callable[[float], float],
+    execution: str = "serial",
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> list[float]:
+    """Transform numbers using a provided lambda
+
+    execution: "serial" (default), "vectorized" (one numpy call on the whole
+    array; falls back to serial without numpy or when results could
+    differ), "threads" or "processes" (chunks of chunk_size across a
+    pool; processes need a picklable operation, not a lambda).
+    """
+    if not numbers:
+        raise ValueError("Input list cannot be empty")
+    if execution not in EXECUTION_MODES:
+        raise ValueError(f"execution must be one of {', '.join(EXECUTION_MODES)}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    if execution == "vectorized":
+        vectorized = _apply_vectorized(numbers, operation)
+        if vectorized is not None:
+            return vectorized
+
+    if execution in ("threads", "processes") and len(numbers) > chunk_size:
+        workers = workers or os.cpu_count() or 1
+        if execution == "processes":
+            try:
+                pickle.dumps(operation)
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                raise ValueError(
+                    f"execution='processes' needs a picklable operation: {e}"
+                ) from e
+            executor: Executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers)
+        with executor:
+            results, invalid_inputs = _apply_pool(numbers, operation, executor, chunk_size)
+    else:
+        results, invalid_inputs = _apply(numbers, operation, print)
 
     if invalid_inputs:
         print(f"Skipped invalid inputs: {invalid_inputs}")
 
     return results
+
+
+class ProcessStats:
+    """Counters of a lazy run: invalid inputs are counted, only a few kept"""
+
+    def __init__(self, sample_size: int = 10) -> None:
+        self.sample_size = sample_size
+        self.processed: int = 0
+        self.invalid: int = 0
+        self.zero_divisions: int = 0
+        self.invalid_sample: list[Any] = []
+
+    def add_invalid(self, value: Any) -> None:
+        self.invalid += 1
+        if len(self.invalid_sample) < self.sample_size:
+            self.invalid_sample.append(value)
+
+    def __repr__(self) -> str:
+        return (
+            f"ProcessStats(processed={self.processed}, invalid={self.invalid}, "
+            f"zero_divisions={self.zero_divisions}, sample={self.invalid_sample})"
+        )
+
+
+def chain_operations(*operations: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Fuse operations into one: chain_operations(f, g)(x) == g(f(x))"""
+    if not operations:
+        raise ValueError("At least one operation is required")
+    if len(operations) == 1:
+        return operations[0]
+    # Direct nested calls for short chains: no inner loop per element
+    if len(operations) == 2:
+        first, second = operations
+        return lambda value: second(first(value))
+    if len(operations) == 3:
+        first, second, third = operations
+        return lambda value: third(second(first(value)))
+
+    def chained(value: Any) -> Any:
+        for operation in operations:
+            value = operation(value)
+        return value
+
+    return chained
+
+
+def iter_process_numbers(
+    numbers: Iterable[Any],
+    *operations: Callable[[Any], Any],
+    stats: ProcessStats | None = None,
+) -> Generator[Any, None, None]:
+    """Lazily yield operations applied in order to each number, in one pass
+
+    Unlike process_numbers nothing is printed and no list is built: invalid
+    inputs and divisions by zero are counted in `stats`.
+    """
+    operation = chain_operations(*operations)
+    stats = ProcessStats() if stats is None else stats
+    processed = 0
+    try:
+        for num in numbers:
+            processed += 1
+            try:
+                value = operation(num)
+            except TypeError:
+                stats.add_invalid(num)
+                continue
+            except ZeroDivisionError:
+                stats.zero_divisions += 1
+                continue
+            yield value
+    finally:
+        # Also runs when the consumer stops early (generator closed)
+        stats.processed += processed
+
+
+def iter_process_batches(
+    numbers: Iterable[Any],
+    *operations: Callable[[Any], Any],
+    batch_size: int = BATCH_SIZE,
+    stats: ProcessStats | None = None,
+) -> Generator[array, None, None]:
+    """Like iter_process_numbers, but yield array('d') batches of results
+
+    Results that are not real numbers, or too large for a double, count
+    as invalid.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    stats = ProcessStats() if stats is None else stats
+    results = iter_process_numbers(numbers, *operations, stats=stats)
+    while chunk := list(islice(results, batch_size)):
+        try:
+            # Whole chunk converted in C; element by element only if a result is not a float
+            batch = array("d", chunk)
+        except (TypeError, OverflowError):
+            batch = array("d")
+            for value in chunk:
+                try:
+                    batch.append(value)
+                except (TypeError, OverflowError):  # e.g. an int beyond 1e308
+                    stats.add_invalid(value)
+        if batch:
+            yield batch
@@ -0,0 +1,311 @@
+"""Low-overhead call timing: sampled perf_counter_ns histograms and exports"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from array import array
+from functools import wraps
+from types import ModuleType
+from typing import Any, Callable, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+SUB_BUCKETS: int = 8  # per power of two: bucket bounds within 12.5%
+_BUCKETS: int = 64 * SUB_BUCKETS
+
+
+def bucket_index(ns: int) -> int:
+    """Histogram bucket of a duration: exact below 8 ns, then 8 per power of two"""
+    if ns < SUB_BUCKETS:
+        return max(ns, 0)
+    shift = ns.bit_length() - 4
+    return shift * SUB_BUCKETS + (ns >> shift)
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """Return the [low, high) nanosecond range of a bucket"""
+    if index < SUB_BUCKETS:
+        return index, index + 1
+    shift, mantissa = divmod(index, SUB_BUCKETS)
+    shift -= 1
+    mantissa += SUB_BUCKETS
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class Histogram:
+    """Log-linear histogram of durations in nanoseconds (fixed 4 KiB)"""
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all samples"""
+        self.counts = array("Q", bytes(8 * _BUCKETS))
+        self.count: int = 0
+        self.total_ns: int = 0
+        self.min_ns: int = 0
+        self.max_ns: int = 0
+
+    def record(self, ns: int) -> None:
+        # bucket_index() inlined: this runs on every sampled call
+        if ns < SUB_BUCKETS:
+            self.counts[max(ns, 0)] += 1
+        else:
+            shift = ns.bit_length() - 4
+            self.counts[shift * SUB_BUCKETS + (ns >> shift)] += 1
+        if ns > self.max_ns:
+            self.max_ns = ns
+        if ns < self.min_ns or not self.count:
+            self.min_ns = ns
+        self.count += 1
+        self.total_ns += ns
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile in ns, interpolated inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count > rank:
+                low, high = bucket_bounds(index)
+                estimate = low + (high - low) * (rank - seen + 0.5) / count
+                return min(max(estimate, self.min_ns), self.max_ns)
+            seen += count
+        return float(self.max_ns)
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Add the samples of another histogram"""
+        if other.count:
+            self.counts = array("Q", map(sum, zip(self.counts, other.counts)))
+            self.min_ns = min(self.min_ns, other.min_ns) if self.count else other.min_ns
+            self.max_ns = max(self.max_ns, other.max_ns)
+            self.count += other.count
+            self.total_ns += other.total_ns
+        return self
+
+
+class FunctionStats:
+    """Counters of one instrumented function"""
+
+    def __init__(self, name: str, sample_every: int, track_memory: bool) -> None:
+        self.name = name
+        self.sample_every = sample_every
+        self.track_memory = track_memory
+        self.calls: int = 0
+        self.errors: int = 0
+        self.durations = Histogram()
+        self.peak_alloc_bytes: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        durations = self.durations
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "sampled": durations.count,
+            "mean_ns": durations.total_ns / durations.count if durations.count else 0.0,
+            "min_ns": durations.min_ns,
+            "max_ns": durations.max_ns,
+            "p50_ns": durations.quantile(0.50),
+            "p95_ns": durations.quantile(0.95),
+            "p99_ns": durations.quantile(0.99),
+            "peak_alloc_bytes": self.peak_alloc_bytes,
+        }
+
+
+class Profiler:
+    """Registry of instrumented functions
+
+    Every call and every error is counted; only every `sample_every`-th
+    call is timed (and, with track_memory, traced by tracemalloc), so the
+    overhead of hot functions stays bounded. Nothing is printed while
+    functions run.
+    """
+
+    def __init__(self, sample_every: int = 1) -> None:
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.sample_every = sample_every
+        self.stats: dict[str, FunctionStats] = {}
+
+    def profile(
+        self,
+        func: F | None = None,
+        *,
+        name: str | None = None,
+        sample_every: int | None = None,
+        track_memory: bool = False,
+    ) -> Any:
+        """Decorator, usable bare (@profiler.profile) or with options"""
+        if func is None:
+            return lambda f: self.profile(
+                f, name=name, sample_every=sample_every, track_memory=track_memory
+            )
+        key = name or f"{func.__module__}.{func.__qualname__}"
+        every = sample_every or self.sample_every
+        stats = self.stats.setdefault(key, FunctionStats(key, every, track_memory))
+        durations = stats.durations
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            stats.calls += 1
+            if stats.calls % every:
+                try:
+                    return func(*args, **kwargs)
+                except BaseException:
+                    stats.errors += 1
+                    raise
+            if stats.track_memory:
+                return _traced_call(stats, func, args, kwargs)
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                stats.errors += 1
+                raise
+            finally:
+                durations.record(clock() - start)
+
+        wrapper.stats = stats  # type: ignore[attr-defined]
+        return wrapper
+
+    def instrument_module(self, module: ModuleType, **options: Any) -> list[str]:
+        """Wrap every public function defined in a module, in place
+
+        Names imported elsewhere with `from module import f` before this
+        call keep pointing at the original function.
+        """
+        wrapped: list[str] = []
+        for attr, value in list(vars(module).items()):
+            if (
+                not attr.startswith("_")
+                and callable(value)
+                and getattr(value, "__module__", None) == module.__name__
+                and not isinstance(value, type)
+                and not hasattr(value, "stats")
+            ):
+                setattr(module, attr, self.profile(value, **options))
+                wrapped.append(attr)
+        return wrapped
+
+    def reset(self) -> None:
+        """Forget all recorded calls (instrumented functions stay wrapped)"""
+        for stats in self.stats.values():
+            stats.calls = stats.errors = stats.peak_alloc_bytes = 0
+            # In place: the wrappers hold on to their histogram
+            stats.durations.clear()
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        return {name: stats.to_dict() for name, stats in self.stats.items() if stats.calls}
+
+    def to_json(self, path: str | None = None) -> str:
+        """Return the stats as JSON, also writing them to `path` if given"""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path:
+            _write_atomic(path, text + "\n")
+        return text
+
+    def to_prometheus(self, path: str | None = None) -> str:
+        """Return the stats in Prometheus text format (e.g. for node_exporter's textfile collector)"""
+        lines = [
+            "# HELP function_calls_total Calls of an instrumented function",
+            "# TYPE function_calls_total counter",
+        ]
+        stats = self.to_dict()
+        labels = {name: f"function={_label_value(name)}" for name in stats}
+        lines += [f'function_calls_total{{{labels[n]}}} {s["calls"]}' for n, s in stats.items()]
+        lines += [
+            "# HELP function_duration_seconds Duration of sampled calls",
+            "# TYPE function_duration_seconds summary",
+        ]
+        for name, values in stats.items():
+            label = labels[name]
+            for q in ("0.5", "0.95", "0.99"):
+                seconds = values[f"p{round(float(q) * 100)}_ns"] / 1e9
+                lines.append(f'function_duration_seconds{{{label},quantile="{q}"}} {seconds:.9g}')
+            total = self.stats[name].durations.total_ns / 1e9
+            lines.append(f"function_duration_seconds_sum{{{label}}} {total:.9g}")
+            lines.append(f"function_duration_seconds_count{{{label}}} {values['sampled']}")
+        lines += [
+            "# HELP function_peak_alloc_bytes Largest extra memory of a traced call",
+            "# TYPE function_peak_alloc_bytes gauge",
+        ]
+        lines += [
+            f'function_peak_alloc_bytes{{{labels[n]}}} {s["peak_alloc_bytes"]}'
+            for n, s in stats.items()
+            if self.stats[n].track_memory
+        ]
+        text = "\n".join(lines) + "\n"
+        if path:
+            _write_atomic(path, text)
+        return text
+
+    def report(self) -> str:
+        """Human-readable table of the recorded stats"""
+        rows = [f"{'function':<40} {'calls':>8} {'p50':>10} {'p95':>10} {'p99':>10}"]
+        for name, values in self.to_dict().items():
+            rows.append(
+                f"{name:<40} {values['calls']:>8} "
+                + " ".join(f"{_format_ns(values[key]):>10}" for key in ("p50_ns", "p95_ns", "p99_ns"))
+            )
+        return "\n".join(rows)
+
+
+def _traced_call(
+    stats: FunctionStats, func: Callable[..., Any], args: Any, kwargs: Any
+) -> Any:
+    """Timed call that also records the peak memory allocated by tracemalloc"""
+    # Trace only this call unless tracing was already on: tracemalloc
+    # slows down every allocation while it runs
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter_ns()
+    try:
+        return func(*args, **kwargs)
+    except BaseException:
+        stats.errors += 1
+        raise
+    finally:
+        stats.durations.record(time.perf_counter_ns() - start)
+        peak = tracemalloc.get_traced_memory()[1] - base
+        if peak > stats.peak_alloc_bytes:
+            stats.peak_alloc_bytes = peak
+        if started:
+            tracemalloc.stop()
+
+
+def _format_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f}{unit}"
+    return f"{ns:.0f}ns"
+
+
+def _label_value(value: str) -> str:
+    """Quote a Prometheus label value, escaping backslashes, quotes and newlines"""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+def _write_atomic(path: str, text: str) -> None:
+    # Scrapers must never read a half-written file; a unique temporary
+    # name keeps concurrent writers from clobbering each other's file
+    fd, temp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+
+# Shared default profiler, used by timing_decorator
+PROFILER = Profiler()
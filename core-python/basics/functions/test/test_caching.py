@@ -0,0 +1,190 @@
+import math
+import pickle
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+from typing import Any
+from main import process_numbers
+from module.caching import ResultCache, sizeof
+from module.functions import callable_key, memoize_call, memoize_operation
+
+def test_result_cache_lru() -> None:
+    """Test that LRU evicts the least recently used entry."""
+    cache = ResultCache("lru", maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1, "Should return a cached value"
+    cache.put("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache, "Should evict b, used least recently"
+    assert cache.get("b") is None, "Should miss an evicted key"
+    assert cache.info()[:4] == (1, 1, 1, 2), "Should count hits, misses, evictions and size"
+    assert cache.hit_rate == 0.5, "Should report the hit rate"
+
+def test_result_cache_lfu() -> None:
+    """Test that LFU evicts the least frequently used entry, oldest first."""
+    cache = ResultCache("lfu", maxsize=3)
+    for key in "abc":
+        cache.put(key, key)
+    for key in "aab":
+        cache.get(key)
+    cache.put("d", "d")
+    assert "c" not in cache, "Should evict c, never read"
+    cache.put("e", "e")
+    assert "d" not in cache and set("abe") <= set(cache._values), "Should evict the oldest of the least used"
+
+def test_result_cache_max_bytes() -> None:
+    """Test the byte cap."""
+    value = [1.0] * 100
+    cache = ResultCache(maxsize=None, max_bytes=2 * sizeof(value))
+    for key in range(5):
+        cache.put(key, list(value))
+    assert len(cache) == 2 and cache.nbytes <= 2 * sizeof(value), "Should stay within max_bytes"
+    cache.put("huge", [1.0] * 1000)
+    assert "huge" not in cache and len(cache) == 2, "Should not store a value larger than the cap"
+    with pytest.raises(ValueError, match="policy must be one of"):
+        ResultCache("fifo")
+
+def square(x: float) -> float:
+    """Module-level operation (its key must not change between runs)."""
+    return x ** 2
+
+@pytest.mark.parametrize("policy", ["lru", "lfu"])
+def test_result_cache_persistence(policy: str, tmp_path: Path) -> None:
+    """Test that saved entries are loaded by the next run, for the same function only."""
+    path = str(tmp_path / "cache.pickle")
+    first = memoize_operation(square, policy=policy, path=path)
+    assert [first(x) for x in (1.0, 2.0, 2.0)] == [1.0, 4.0, 4.0], "Should compute results"
+    assert first.cache.save() == 2, "Should save both entries"
+    second = memoize_operation(square, policy=policy, path=path)
+    assert second(2.0) == 4.0 and (second.cache.hits, second.cache.misses) == (1, 0), "Should reuse the saved results"
+    other = memoize_operation(lambda x: -x, policy=policy, path=path)
+    assert other(2.0) == -2.0 and len(other.cache) == 1, "Should ignore another function's file"
+
+def test_result_cache_lfu_reload_keeps_use_counts(tmp_path: Path) -> None:
+    """Test that reloading sets the saved use counts at once and evicts by them."""
+    path = str(tmp_path / "lfu.pickle")
+    first = ResultCache("lfu", path=path)
+    first.bind("counts")
+    for key in "abc":
+        first.put(key, key)
+    for key in "aaaaabb":
+        first.get(key)
+    assert first.save() == 3
+    second = ResultCache("lfu", maxsize=3, path=path)
+    second.bind("counts")
+    assert second._uses == {"a": 6, "b": 3, "c": 1}, "Should restore the use counts"
+    second.put("d", "d")
+    second.put("e", "e")
+    assert set(second._values) == set("abe"), "Should evict the least used, c then d"
+    with open(path, "wb") as file:
+        pickle.dump(("counts", [("x", "x", 10**9)]), file)
+    third = ResultCache("lfu", path=path)
+    third.bind("counts")
+    assert third._uses == {"x": 10**9}, "Should set a huge count without replaying it"
+
+def test_memoize_operation_with_process_numbers() -> None:
+    """Test per-element memoization keeps process_numbers' results and error handling."""
+    calls: list[Any] = []
+
+    @memoize_operation(maxsize=8)
+    def reciprocal(x: float) -> float:
+        calls.append(x)
+        return 1 / x
+
+    numbers: list[Any] = [2.0, 0.0, "x", 2.0, 4.0, 2, [1]]
+    assert process_numbers(numbers, reciprocal) == [0.5, 0.5, 0.25, 0.5], "Should match the plain operation"
+    assert calls.count(2.0) == 2, "Should compute 2.0 once, and 2 (an int) separately"
+    assert calls.count(0.0) == 1 and reciprocal.cache.hits == 1, "Should not cache errors"
+
+def test_memoize_operation_signed_zero_and_nan() -> None:
+    """Test that -0.0 and 0.0 get their own entries and NaN is found again."""
+    sign = memoize_operation(lambda x: math.copysign(1.0, x), maxsize=8)
+    assert [sign(0.0), sign(-0.0), sign(0.0)] == [1.0, -1.0, 1.0], "Should not serve 0.0's result for -0.0"
+    assert [sign(math.nan) for _ in range(3)] == [1.0] * 3
+    assert len(sign.cache) == 3 and sign.cache.hits == 3, "NaN should hit its single entry"
+
+def test_memoize_call() -> None:
+    """Test whole-call memoization keyed on the content of the arguments."""
+    calls: list[Any] = []
+
+    @memoize_call(maxsize=4)
+    def total(numbers: list[float], operation: Any) -> list[float]:
+        calls.append(numbers)
+        return [operation(x) for x in numbers]
+
+    double = lambda x: x * 2
+    result = total([1.0, 2.0], double)
+    result.append(99.0)
+    assert total([1.0, 2.0], double) == [2.0, 4.0], "Should return a copy of the cached result"
+    assert total([1, 2], double) == [2, 4] and len(calls) == 2, "Should tell ints from floats"
+    factors = [3, 4]
+    scaled = [total([1.0], lambda x, f=f: x * f) for f in factors]
+    assert scaled == [[3.0], [4.0]], "Should key operations by their captured values"
+    assert total([object()], lambda x: x) and len(calls) == 5, "Should call through unpicklable arguments"
+    assert callable_key(double) == callable_key(double), "Should give stable keys"
+
+def test_callable_key_is_stable_across_runs() -> None:
+    """Test that a profiled function gets the same key in a new interpreter."""
+    code = "from main import process_numbers\nfrom module.functions import callable_key\nprint(callable_key(process_numbers))"
+    keys = {
+        subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        for _ in range(2)
+    }
+    assert keys == {callable_key(process_numbers) + "\n"}, "Key should not depend on the profiler's state"
+
+def test_callable_key_rejects_mutable_captures(tmp_path: Path) -> None:
+    """Test captured mutable values: no stable key, unless a namespace is given."""
+    factors = [3.0]
+    scale = lambda x: x * factors[0]
+    with pytest.raises(TypeError, match="list"):
+        callable_key(scale)
+    path = str(tmp_path / "cache.pickle")
+    with pytest.raises(ValueError, match="namespace="):
+        memoize_operation(scale, path=path)
+    memoized = memoize_operation(scale, path=path, namespace="scale-v1")
+    assert memoized(2.0) == 6.0 and memoized.cache.save() == 1, "Should persist under the namespace"
+    assert memoize_operation(scale, path=path, namespace="scale-v1").cache.get((float, (2.0).hex())) == 6.0, "Reloaded"
+    assert memoize_operation(scale)(2.0) == 6.0, "Should still memoize in memory without a path"
+
+def test_callable_key_covers_globals() -> None:
+    """Test that changing a global constant or helper changes the key, and mutable globals have none."""
+    def key(source: str, **global_values: Any) -> str:
+        namespace = dict(global_values)
+        exec(source, namespace)
+        return callable_key(namespace["scale"])
+
+    source = "def scale(x):\n    return helper(x) * FACTOR\n"
+    helper = "def helper(x):\n    return x + OFFSET\n"
+    assert key(source, FACTOR=2, helper=square) == key(source, FACTOR=2, helper=square), "Same globals, same key"
+    assert key(source, FACTOR=2, helper=square) != key(source, FACTOR=3, helper=square), "Constant changed"
+    helpers = [{"OFFSET": 1}, {"OFFSET": 2}]
+    for namespace in helpers:
+        exec(helper, namespace)
+    assert key(source, FACTOR=2, helper=helpers[0]["helper"]) != key(
+        source, FACTOR=2, helper=helpers[1]["helper"]
+    ), "A helper's own globals should count too"
+    with pytest.raises(TypeError, match="list"):
+        key(source, FACTOR=[2], helper=square)
+    assert key("def scale(x):\n    return [FACTOR for _ in range(x)]\n", FACTOR=1) != key(
+        "def scale(x):\n    return [FACTOR for _ in range(x)]\n", FACTOR=2
+    ), "Globals read in nested code should count"
+
+def test_memoize_call_reloads_process_numbers(tmp_path: Path) -> None:
+    """Test that a saved process_numbers call is found again by a new wrapper."""
+    path = str(tmp_path / "calls.pickle")
+    first = memoize_call(process_numbers, path=path)
+    assert first([1.0, 2.0], square) == [1.0, 4.0]
+    assert first.cache.save() == 1, "Should save the call"
+    second = memoize_call(process_numbers, path=path)
+    assert second([1.0, 2.0], square) == [1.0, 4.0] and second.cache.hits == 1, "Should reload the saved call"
+
+@pytest.mark.parametrize("policy", ["lru", "lfu"])
+def test_result_cache_shared_between_threads(policy: str) -> None:
+    """Test a small memoized operation under execution="threads"."""
+    reciprocal = memoize_operation(lambda x: 1 / x, policy=policy, maxsize=8)
+    numbers = [float(i % 50 + 1) for i in range(20_000)]
+    results = process_numbers(numbers, reciprocal, execution="threads", workers=8, chunk_size=100)
+    assert results == [1 / x for x in numbers], "Threads should see consistent cache entries"
+    info = reciprocal.cache.info()
+    assert info.hits + info.misses == len(numbers) and info.size <= 8, "Counters and bounds should hold"
@@ -1,6 +1,8 @@
 import pytest
+from array import array
 from typing import Callable, Any
 from main import process_numbers
+from module.functions import ProcessStats, chain_operations, iter_process_batches, iter_process_numbers
 
 def test_process_numbers_valid_input() -> None:
     """Test process_numbers with valid numeric inputs."""
@@ -29,3 +31,76 @@ def test_process_numbers_invalid_operation() -> None:
     invalid_op: Callable[[float], float] = lambda x: x / 0  # Causes ZeroDivisionError
     result = process_numbers(numbers, invalid_op)
     assert result == [], "Should return empty list for invalid operation"
+
+def reciprocal(x: float) -> float:
+    """Module-level operation, picklable for execution="processes"."""
+    return 1 / x
+
+@pytest.mark.parametrize("execution", ["serial", "vectorized", "threads", "processes"])
+def test_process_numbers_execution_modes(execution: str, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that every execution mode gives the same results and messages."""
+    numbers: list[Any] = [1.0, 2.0, "x", 0.0, 4.0, None, 5.0] * 3
+    process_numbers(numbers, reciprocal)
+    expected_output = capsys.readouterr().out
+    result = process_numbers(numbers, reciprocal, execution=execution, workers=2, chunk_size=4)
+    assert result == [1.0, 0.5, 0.25, 0.2] * 3, f"{execution} should skip invalid inputs"
+    assert capsys.readouterr().out == expected_output, f"{execution} should report the same errors"
+
+def test_process_numbers_vectorized() -> None:
+    """Test the numpy path on all-numeric input."""
+    np = pytest.importorskip("numpy")
+    numbers: list[float] = [float(i) for i in range(1, 1001)]
+    result = process_numbers(numbers, lambda x: x ** 2 + np.sqrt(x), execution="vectorized")
+    assert result == pytest.approx([x ** 2 + x ** 0.5 for x in numbers]), "Should match the serial loop"
+
+def test_process_numbers_invalid_execution() -> None:
+    """Test option validation."""
+    with pytest.raises(ValueError, match="execution must be one of"):
+        process_numbers([1.0], lambda x: x, execution="gpu")
+    with pytest.raises(ValueError, match="picklable"):
+        process_numbers([1.0, 2.0], lambda x: x, execution="processes", chunk_size=1)
+
+def test_iter_process_numbers_fused_chain() -> None:
+    """Test that a fused chain matches one process_numbers pass per operation."""
+    numbers: list[Any] = [1.0, "x", 2.0, 0.0, None, 4.0]
+    square: Callable[[float], float] = lambda x: x ** 2
+    expected = process_numbers(process_numbers(numbers, square), reciprocal)
+    stats = ProcessStats()
+    assert list(iter_process_numbers(numbers, square, reciprocal, stats=stats)) == expected, "Should fuse operations"
+    assert (stats.processed, stats.invalid, stats.zero_divisions) == (6, 2, 1), "Should count instead of printing"
+    assert stats.invalid_sample == ["x", None], "Should keep the invalid inputs"
+    for count in (1, 4):
+        add = [lambda x: x + 1] * count
+        assert chain_operations(*add)(0) == count, f"Should chain {count} operations"
+    with pytest.raises(ValueError, match="At least one operation"):
+        chain_operations()
+
+def test_iter_process_numbers_lazy() -> None:
+    """Test that inputs are read only as results are consumed, with a capped sample."""
+    stats = ProcessStats(sample_size=2)
+    stream = (value for value in ["a", 1.0, "b", "c", 2.0, 3.0])
+    results = iter_process_numbers(stream, lambda x: x / 2, stats=stats)
+    assert next(results) == 0.5, "Should yield the first result"
+    assert stats.processed == 0, "Should count processed inputs when the iterator stops"
+    results.close()
+    assert stats.processed == 2, "Should have read only two inputs"
+    assert list(stream) == ["b", "c", 2.0, 3.0], "Should leave the rest of the stream unread"
+    list(iter_process_numbers(["a", "b", "c"], lambda x: x / 2, stats=stats))
+    assert stats.invalid == 4 and stats.invalid_sample == ["a", "a"], "Should cap the invalid sample"
+
+def test_iter_process_batches() -> None:
+    """Test array('d') batches and results that are not floats."""
+    batches = list(iter_process_batches(range(10), lambda x: x / 2, batch_size=4))
+    assert [len(batch) for batch in batches] == [4, 4, 2], "Should cut fixed-size batches"
+    assert all(batch.typecode == "d" for batch in batches), "Should yield arrays of doubles"
+    assert [x for batch in batches for x in batch] == [x / 2 for x in range(10)], "Should keep the order"
+    stats = ProcessStats()
+    batches = list(iter_process_batches([1.0, 2.0, 3.0], lambda x: x if x != 2.0 else "two", stats=stats))
+    assert batches == [array("d", [1.0, 3.0])], "Should drop non-float results"
+    assert stats.invalid_sample == ["two"], "Should count non-float results as invalid"
+    stats = ProcessStats()
+    batches = list(iter_process_batches([1, 10**400, 3], lambda x: x, stats=stats))
+    assert batches == [array("d", [1.0, 3.0])], "Should drop ints too large for a double"
+    assert stats.invalid_sample == [10**400], "Should count them as invalid"
+    with pytest.raises(ValueError, match="batch_size"):
+        list(iter_process_batches([1.0], lambda x: x, batch_size=0))
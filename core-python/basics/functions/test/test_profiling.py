@@ -0,0 +1,78 @@
+import json
+import types
+import pytest
+from module.profiling import Histogram, Profiler, bucket_bounds, bucket_index
+
+def test_buckets_contain_their_durations() -> None:
+    """Test that every duration falls inside its bucket bounds."""
+    for ns in [0, 1, 7, 8, 15, 16, 999, 10**6, 10**9 + 7, 2**62]:
+        low, high = bucket_bounds(bucket_index(ns))
+        assert low <= ns < high, f"{ns} should be in [{low}, {high})"
+        assert high - low <= max(1, low // 8), "Buckets should be within 12.5%"
+
+def test_histogram_quantiles() -> None:
+    """Test approximate percentiles against exact ones."""
+    histogram = Histogram()
+    for ns in range(1000, 101000, 10):
+        histogram.record(ns)
+    assert abs(histogram.quantile(0.5) - 51000) < 51000 * 0.07, "p50 within a bucket"
+    assert abs(histogram.quantile(0.99) - 99000) < 99000 * 0.07, "p99 within a bucket"
+    assert histogram.min_ns == 1000 and histogram.max_ns == 100990, "Exact min/max"
+    assert Histogram().quantile(0.5) == 0.0, "Empty histogram"
+
+def test_profile_counts_and_samples() -> None:
+    """Test call counting, sampling and error counting."""
+    profiler = Profiler()
+
+    @profiler.profile(name="double", sample_every=4)
+    def double(x: float) -> float:
+        if x < 0:
+            raise ValueError("negative")
+        return x * 2
+
+    assert [double(x) for x in range(10)] == [x * 2 for x in range(10)], "Results unchanged"
+    assert double.__name__ == "double", "Metadata should be kept"
+    for _ in range(4):
+        with pytest.raises(ValueError):
+            double(-1)
+    stats = profiler.to_dict()["double"]
+    assert stats["calls"] == 14 and stats["sampled"] == 3, "Every call counted, every 4th timed"
+    assert stats["errors"] == 4, "Unsampled calls should record errors too"
+    profiler.reset()
+    for x in range(4):
+        double(x)
+    assert profiler.to_dict()["double"]["sampled"] == 1, "Should keep recording after reset"
+
+def test_track_memory_and_exports(tmp_path) -> None:
+    """Test tracemalloc tracking and the JSON/Prometheus exports."""
+    profiler = Profiler()
+    allocate = profiler.profile(lambda n: len([0] * n), name="allocate", track_memory=True)
+    allocate(100_000)
+    assert profiler.stats["allocate"].peak_alloc_bytes >= 8 * 100_000, "Should see the list"
+
+    data = json.loads(profiler.to_json(str(tmp_path / "stats.json")))
+    assert data["allocate"]["calls"] == 1, "JSON export"
+    assert (tmp_path / "stats.json").read_text().strip() == profiler.to_json(), "JSON file"
+    text = profiler.to_prometheus(str(tmp_path / "stats.prom"))
+    assert 'function_calls_total{function="allocate"} 1' in text, "Prometheus counter"
+    assert 'function_duration_seconds{function="allocate",quantile="0.99"}' in text, "Summary"
+    assert "function_peak_alloc_bytes" in (tmp_path / "stats.prom").read_text(), "Memory gauge"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["stats.json", "stats.prom"], "No temp files left"
+
+def test_prometheus_escapes_label_values() -> None:
+    """Test that backslashes, quotes and newlines in names are escaped."""
+    profiler = Profiler()
+    profiler.profile(lambda: None, name='odd\\name "x"\nnext')()
+    text = profiler.to_prometheus()
+    assert 'function_calls_total{function="odd\\\\name \\"x\\"\\nnext"} 1' in text, "Escaped label"
+    assert len(text.splitlines()) == 12, "A name should never break a line"
+
+def test_instrument_module() -> None:
+    """Test wrapping every public function of a module."""
+    module = types.ModuleType("fake")
+    exec("def public(x):\n    return x + 1\ndef _private(x):\n    return x\n", module.__dict__)
+    profiler = Profiler()
+    assert profiler.instrument_module(module) == ["public"], "Only public functions"
+    assert profiler.instrument_module(module) == [], "Never wrap twice"
+    assert module.public(1) == 2
+    assert profiler.to_dict()["fake.public"]["calls"] == 1, "Calls recorded"
@@ -1,27 +1,18 @@
 """Grade Calculator"""
 
+import argparse
+
+# module/__init__.py makes the shared core-python/modules package importable
+from module.grade_stream import iter_students, stream_passing_students
+from module.gradebook import GradeBook
+from modules.bulk_writer import BulkWriter
+
 
 def read_grades(file_path: str) -> list[tuple[str, list[int]]]:
     """Read student grades from a text file."""
-
-    students: list[tuple[str, list[int]]] = []
+    # Each line: "name,grade1,grade2,..." (any number of grades)
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            for line in file:
-                # Each line: "name,grade1,grade2,grade3"
-                parts = line.strip().split(",")
-                if len(parts) != 4:
-                    print(f"Skipping invalid line format: {line.strip()}")
-                    continue
-                name: str = parts[0]
-                valid_grades: list[int] = []
-                try:
-                    valid_grades = [int(grade) for grade in parts[1:]]
-                    students.append((name, valid_grades))
-                except ValueError:
-                    print(f"Skipping student '{name}' due to invalid grades.")
-                    continue
-        return students
+        return list(iter_students(file_path, on_invalid=print))
     except FileNotFoundError:
         print(f"Error: File {file_path} not found.")
         return []
@@ -33,34 +24,62 @@ def calculate_average(grades: list[int]) -> float:
 
 
 def write_passing_students(
-    students: list[tuple[str, list[int]]],
+    students: GradeBook | list[tuple[str, list[int]]],
     output_file: str,
     passing_threshold: float = 60.0,
+    atomic: bool = False,
 ) -> None:
-    """Write students with a passing average to a file"""
+    """Write students with a passing average to a file
+
+    Pass a GradeBook to reuse the averages it has already computed.
+    """
+    book = students if isinstance(students, GradeBook) else GradeBook.from_students(students)
     try:
-        with open(output_file, "w", encoding="utf-8") as file:
-            for name, grades in students:
-                avg = calculate_average(grades)
-                if avg >= passing_threshold:
-                    file.write(f"{name}: {avg:.2f}\n")
-        print(f"Passing students written to {output_file}")
+        with BulkWriter(output_file, atomic=atomic) as writer:
+            writer.write_rows("%s: %.2f\n", book.passing(passing_threshold))
+        print(f"Passing students written to {output_file} ({writer.summary()})")
     except IOError as e:
         print(f"Error writing to {output_file}: {e}")
 
 
 def main():
     """Main function to read grades, calculate averages, and write passing students."""
-    input_file = "grades.txt"
+    parser = argparse.ArgumentParser(description="Write students with a passing average")
+    parser.add_argument("input_file", nargs="?", default="grades.txt", help="grades file")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="write passing students while reading and print cohort statistics (any file size)",
+    )
+    args = parser.parse_args()
+
+    input_file = args.input_file
     output_file = "passing_students.txt"
+
+    if args.stream:
+        try:
+            stats = stream_passing_students(input_file, output_file, on_invalid=print)
+        except IOError as e:
+            if isinstance(e, FileNotFoundError) and e.filename == input_file:
+                print(f"Error: File {input_file} not found.")
+            else:
+                print(f"Error writing to {output_file}: {e}")
+            return
+        print(f"Passing students written to {output_file}")
+        print("Cohort Statistics:")
+        for key, value in stats.to_dict().items():
+            print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+        return
+
     students = read_grades(input_file)
 
     if students:
+        # Averages are computed once here and reused for the output file
+        book = GradeBook.from_students(students)
         print("Student Averages:")
-        for name, grades in students:
-            avg = calculate_average(grades)
+        for name, avg in zip(book.names, book.averages()):
             print(f"{name}: {avg:.2f}")
-        write_passing_students(students, output_file)
+        write_passing_students(book, output_file)
     else:
         print("No valid student data to process.")
 
@@ -0,0 +1,230 @@
+"""Streaming grade ingestion with running cohort statistics in bounded memory"""
+
+import math
+from typing import Any, Callable, Iterable, Iterator
+
+from modules.bulk_writer import BulkWriter
+
+QUANTILES: tuple[float, ...] = (0.5, 0.9)
+
+
+def parse_students(
+    lines: Iterable[str], on_invalid: Callable[[str], None] | None = None
+) -> Iterator[tuple[str, list[int]]]:
+    """Lazily yield (name, grades) from lines "name,grade1,grade2,..."
+
+    Each line holds one or more grades. Invalid lines are skipped;
+    on_invalid (e.g. print) receives a message for each.
+    """
+    for line in lines:
+        parts = line.strip().split(",")
+        if len(parts) < 2:
+            if on_invalid is not None:
+                on_invalid(f"Skipping invalid line format: {line.strip()}")
+            continue
+        name = parts[0]
+        try:
+            grades = [int(grade) for grade in parts[1:]]
+        except ValueError:
+            if on_invalid is not None:
+                on_invalid(f"Skipping student '{name}' due to invalid grades.")
+            continue
+        yield name, grades
+
+
+def iter_students(
+    file_path: str, on_invalid: Callable[[str], None] | None = None
+) -> Iterator[tuple[str, list[int]]]:
+    """Lazily yield (name, grades) from a grades.txt-style file"""
+    with open(file_path, "r", encoding="utf-8") as file:
+        yield from parse_students(file, on_invalid)
+
+
+class RunningStats:
+    """Count, mean, variance (Welford), min and max in O(1) memory"""
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.mean: float = 0.0
+        self._m2: float = 0.0  # sum of squared distances from the mean
+        self.min: float = math.inf
+        self.max: float = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        # Welford: no sum of squares, so no catastrophic cancellation
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Fold in the stats of another shard (Chan et al.)"""
+        if other.count:
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self._m2 += other._m2 + delta * delta * self.count * other.count / count
+            self.mean += delta * other.count / count
+            self.count = count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance, 0.0 for fewer than two values"""
+        return self._m2 / self.count if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """Streaming estimate of one quantile in five markers (P² algorithm)
+
+    Jain and Chlamtac (1985): marker heights are adjusted with a
+    piecewise-parabolic formula as values arrive, so memory is constant
+    whatever the number of values. Exact for the first five values.
+    """
+
+    def __init__(self, q: float) -> None:
+        if not 0 < q < 1:
+            raise ValueError("q must be between 0 and 1")
+        self.q = q
+        self.count: int = 0
+        self._heights: list[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        # Desired marker positions after n values: start + (n - 5) * increment
+        self._start = (1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0)
+        self._increments = (0.0, q / 2, q, (1 + q) / 2, 1.0)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        # Move the markers above the value's cell; the extremes track min and max
+        positions = self._positions
+        if value < heights[0]:
+            heights[0] = value
+            first = 1
+        elif value >= heights[4]:
+            heights[4] = value
+            first = 4
+        elif value < heights[2]:
+            first = 1 if value < heights[1] else 2
+        else:
+            first = 3 if value < heights[3] else 4
+        for i in range(first, 5):
+            positions[i] += 1
+
+        extra = self.count - 5
+        for i in (1, 2, 3):
+            offset = self._start[i] + extra * self._increments[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or (
+                offset <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (
+                        positions[i + step] - positions[i]
+                    )
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        h, n = self._heights, self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float:
+        """Current estimate (0.0 before any value)"""
+        heights = self._heights
+        if not heights:
+            return 0.0
+        if self.count <= 5:
+            # Few values: interpolate between the sorted values themselves
+            pos = (len(heights) - 1) * self.q
+            low = int(pos)
+            high = min(low + 1, len(heights) - 1)
+            return heights[low] + (heights[high] - heights[low]) * (pos - low)
+        return heights[2]
+
+
+class CohortStats:
+    """Running statistics of student averages, bounded whatever the cohort size"""
+
+    def __init__(self, passing_threshold: float = 60.0, quantiles: Iterable[float] = QUANTILES) -> None:
+        self.passing_threshold = passing_threshold
+        self.averages = RunningStats()
+        self.quantiles = {q: P2Quantile(q) for q in quantiles}
+        self.passing: int = 0
+        self.skipped: int = 0
+
+    def add(self, average: float) -> bool:
+        """Record one student's average; return whether the student passes"""
+        self.averages.add(average)
+        for sketch in self.quantiles.values():
+            sketch.add(average)
+        passed = average >= self.passing_threshold
+        if passed:
+            self.passing += 1
+        return passed
+
+    def to_dict(self) -> dict[str, Any]:
+        averages = self.averages
+        return {
+            "students": averages.count,
+            "passing": self.passing,
+            "skipped": self.skipped,
+            "mean": averages.mean,
+            "stdev": averages.stdev,
+            "min": averages.min if averages.count else 0.0,
+            "max": averages.max if averages.count else 0.0,
+            **{f"p{q * 100:g}": sketch.value() for q, sketch in self.quantiles.items()},
+        }
+
+
+def stream_passing_students(
+    input_file: str,
+    output_file: str,
+    passing_threshold: float = 60.0,
+    atomic: bool = False,
+    quantiles: Iterable[float] = QUANTILES,
+    on_invalid: Callable[[str], None] | None = None,
+) -> CohortStats:
+    """Write passing students while reading, in one pass and bounded memory
+
+    Same output file as write_passing_students(read_grades(...)), but no
+    student is kept after its line: memory depends only on the number of
+    quantiles, not on the size of the file.
+    """
+    stats = CohortStats(passing_threshold, quantiles)
+
+    def count_invalid(message: str) -> None:
+        stats.skipped += 1
+        if on_invalid is not None:
+            on_invalid(message)
+
+    def passing_rows(lines: Iterable[str]) -> Iterator[tuple[str, float]]:
+        add = stats.add
+        for name, grades in parse_students(lines, count_invalid):
+            average = sum(grades) / len(grades)
+            if add(average):
+                yield name, average
+
+    # Input opened first: a missing file must not truncate the output
+    with open(input_file, "r", encoding="utf-8") as file:
+        with BulkWriter(output_file, atomic=atomic) as writer:
+            writer.write_rows("%s: %.2f\n", passing_rows(file))
+    return stats
@@ -0,0 +1,103 @@
+"""Grades in compressed sparse rows, with averages computed once for all students"""
+
+import sys
+from array import array
+from itertools import accumulate, compress
+from typing import Iterable, Iterator, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, averages then run on the arrays in pure Python
+    np = None
+
+
+class GradeBook:
+    """Keep every grade in one array('i'), one row of it per student
+
+    Student i owns grades[offsets[i]:offsets[i + 1]] (CSR layout), so each
+    student may have any number of grades without padding. Averages are
+    computed in one pass over all rows (vectorized with NumPy when
+    installed) and kept until the next add().
+    """
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.grades = array("i")
+        self.offsets = array("q", [0])
+        self._averages: array | None = None
+
+    @classmethod
+    def from_students(cls, students: Iterable[tuple[str, Sequence[int]]]) -> "GradeBook":
+        """Build a book from (name, grades) tuples, as returned by read_grades()"""
+        book = cls()
+        for name, grades in students:
+            book.add(name, grades)
+        return book
+
+    def add(self, name: str, grades: Sequence[int]) -> None:
+        """Add one student and invalidate the cached averages"""
+        try:
+            self.grades.extend(array("i", grades))
+        except (TypeError, OverflowError) as e:
+            raise ValueError(f"Invalid grades for '{name}': {e}") from e
+        self.names.append(sys.intern(name))
+        self.offsets.append(len(self.grades))
+        self._averages = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[tuple[str, array]]:
+        grades, offsets = self.grades, self.offsets
+        for row, name in enumerate(self.names):
+            yield name, grades[offsets[row] : offsets[row + 1]]
+
+    def counts(self) -> list[int]:
+        """Number of grades of each student"""
+        offsets = self.offsets
+        return [end - start for start, end in zip(offsets, offsets[1:])]
+
+    def averages(self) -> array:
+        """Average of each student (0.0 without grades), computed once"""
+        if self._averages is None:
+            self._averages = self._compute_averages()
+        return self._averages
+
+    def _compute_averages(self) -> array:
+        offsets = self.offsets
+        if np is not None and len(self.grades):
+            # Row sums as differences of one prefix sum: also right for empty rows
+            prefix = np.concatenate(([0], np.cumsum(np.frombuffer(self.grades, dtype=np.int32), dtype=np.int64)))
+            ends = np.frombuffer(offsets, dtype=np.int64)
+            sums = prefix[ends[1:]] - prefix[ends[:-1]]
+            counts = np.diff(ends)
+            means = np.divide(sums, counts, out=np.zeros(len(counts)), where=counts > 0)
+            return array("d", means.tobytes())
+        prefix = list(accumulate(self.grades, initial=0))
+        return array(
+            "d",
+            [
+                (prefix[end] - prefix[start]) / (end - start) if end > start else 0.0
+                for start, end in zip(offsets, offsets[1:])
+            ],
+        )
+
+    def passing_mask(self, threshold: float = 60.0) -> bytearray:
+        """1 for each student whose average is >= threshold, else 0"""
+        averages = self.averages()
+        if np is not None:
+            return bytearray((np.frombuffer(averages, dtype=np.float64) >= threshold).tobytes())
+        return bytearray(average >= threshold for average in averages)
+
+    def count_passing(self, threshold: float = 60.0) -> int:
+        """Number of students whose average is >= threshold"""
+        return self.passing_mask(threshold).count(1)
+
+    def passing(self, threshold: float = 60.0) -> list[tuple[str, float]]:
+        """(name, average) of passing students, in input order"""
+        return list(compress(zip(self.names, self.averages()), self.passing_mask(threshold)))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the grade and offset arrays (names excluded)"""
+        return sum(column.itemsize * len(column) for column in (self.grades, self.offsets))
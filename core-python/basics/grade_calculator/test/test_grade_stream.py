@@ -0,0 +1,123 @@
+import random
+import statistics
+import sys
+import pytest
+from pathlib import Path
+from main import main, read_grades, write_passing_students
+from module.grade_stream import CohortStats, P2Quantile, RunningStats, parse_students, stream_passing_students
+
+def running(values: list[float]) -> RunningStats:
+    """RunningStats of values, added one by one"""
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    return stats
+
+def test_running_stats_match_statistics() -> None:
+    """Test Welford's mean and variance against the statistics module."""
+    rng = random.Random(3)
+    values = [rng.uniform(0, 100) + 1e6 for _ in range(5000)]  # large offset: no cancellation
+    stats = running(values)
+    assert stats.count == 5000 and (stats.min, stats.max) == (min(values), max(values)), "Exact count and extremes"
+    assert stats.mean == pytest.approx(statistics.fmean(values), rel=1e-12), "Mean"
+    assert stats.variance == pytest.approx(statistics.pvariance(values), rel=1e-9), "Population variance"
+    assert stats.stdev == pytest.approx(statistics.pstdev(values), rel=1e-9), "Standard deviation"
+    assert running([]).variance == 0.0 and running([5.0]).variance == 0.0, "Fewer than two values"
+
+def test_running_stats_merge_equals_single_pass() -> None:
+    """Test that merged shards give the stats of one pass over all values."""
+    rng = random.Random(5)
+    values = [rng.gauss(70, 15) for _ in range(3000)]
+    whole = running(values)
+    merged = RunningStats()
+    for start in range(0, 3000, 700):
+        merged.merge(running(values[start : start + 700]))
+    merged.merge(RunningStats())
+    assert merged.count == whole.count and (merged.min, merged.max) == (whole.min, whole.max), "Counts and extremes"
+    assert merged.mean == pytest.approx(whole.mean, rel=1e-12), "Mean"
+    assert merged.variance == pytest.approx(whole.variance, rel=1e-9), "Variance"
+
+def test_p2_few_values_are_exact() -> None:
+    """Test the first five values: interpolation between the sorted values."""
+    assert P2Quantile(0.5).value() == 0.0, "No value yet"
+    for values in ([7.0], [3.0, 1.0], [4.0, 1.0, 3.0, 2.0], [5.0, 5.0, 1.0, 9.0, 2.0]):
+        for q in (0.1, 0.5, 0.9):
+            sketch = P2Quantile(q)
+            for value in values:
+                sketch.add(value)
+            ordered = sorted(values)
+            pos = (len(ordered) - 1) * q
+            low = int(pos)
+            high = min(low + 1, len(ordered) - 1)
+            expected = ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+            assert sketch.value() == pytest.approx(expected), f"q={q} of {values}"
+    with pytest.raises(ValueError):
+        P2Quantile(1.0)
+
+@pytest.mark.parametrize(
+    "draw, expected",
+    [
+        (lambda rng: rng.uniform(0, 100), {0.5: 50.0, 0.9: 90.0}),
+        (lambda rng: rng.gauss(70, 10), {0.5: 70.0, 0.9: 70 + 10 * 1.2816}),
+        (lambda rng: rng.expovariate(1 / 20), {0.5: 20 * 0.6931, 0.9: 20 * 2.3026}),
+    ],
+)
+def test_p2_known_distributions(draw, expected) -> None:
+    """Test P² estimates against the exact quantiles of known distributions."""
+    rng = random.Random(11)
+    sketches = {q: P2Quantile(q) for q in expected}
+    for _ in range(20_000):
+        value = draw(rng)
+        for sketch in sketches.values():
+            sketch.add(value)
+    for q, exact in expected.items():
+        assert sketches[q].value() == pytest.approx(exact, abs=1.5), f"p{q * 100:g} should be close"
+
+def test_p2_ties() -> None:
+    """Test constant input and heavily tied grades."""
+    constant = P2Quantile(0.9)
+    for _ in range(1000):
+        constant.add(60.0)
+    assert constant.value() == 60.0, "Constant input should give that value"
+    rng = random.Random(13)
+    ties = [float(rng.choice([50, 60, 60, 70])) for _ in range(5000)]
+    sketch = P2Quantile(0.5)
+    for value in ties:
+        sketch.add(value)
+    assert 50.0 <= sketch.value() <= 70.0 and abs(sketch.value() - statistics.median(ties)) <= 5.0, "Near the median"
+
+def test_stream_output_matches_batch(tmp_path: Path) -> None:
+    """Test byte-identical output with write_passing_students(read_grades(...))."""
+    rng = random.Random(17)
+    lines = [f"student{i}," + ",".join(str(rng.randint(0, 100)) for _ in range(rng.randint(1, 6))) for i in range(500)]
+    lines[10:10] = ["broken", "bad,grade,x", "", "Solo,60"]
+    source = tmp_path / "grades.txt"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    batch, stream = tmp_path / "batch.txt", tmp_path / "stream.txt"
+    write_passing_students(read_grades(str(source)), str(batch))
+    stats = stream_passing_students(str(source), str(stream))
+    assert stream.read_bytes() == batch.read_bytes(), "Streaming should write the same bytes"
+    students = list(parse_students(lines))
+    assert stats.averages.count == len(students) == 501 and stats.skipped == 3, "Should count students and skipped lines"
+    assert stats.passing == len(stream.read_text().splitlines()), "Should count passing students"
+
+def test_cohort_stats_to_dict() -> None:
+    """Test the summary of a small cohort."""
+    stats = CohortStats(quantiles=(0.5,))
+    for average in (50.0, 60.0, 90.0):
+        stats.add(average)
+    summary = stats.to_dict()
+    assert (summary["students"], summary["passing"], summary["min"], summary["max"]) == (3, 2, 50.0, 90.0)
+    assert summary["p50"] == 60.0 and CohortStats().to_dict()["min"] == 0.0, "Median, empty cohort"
+
+def test_main_stream_reports_write_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    """Test that --stream reports an unwritable output like the batch path."""
+    (tmp_path / "grades.txt").write_text("Alice,90\n", encoding="utf-8")
+    (tmp_path / "passing_students.txt").mkdir()  # a directory cannot be opened for writing
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["main.py", "--stream"])
+    main()
+    assert "Error writing to passing_students.txt" in capsys.readouterr().out, "Should report, not raise"
+    monkeypatch.setattr(sys, "argv", ["main.py", "--stream", "missing.txt"])
+    main()
+    assert "Error: File missing.txt not found." in capsys.readouterr().out, "Missing input"
@@ -0,0 +1,65 @@
+import pytest
+from array import array
+from typing import Any
+import module.gradebook
+from module.gradebook import GradeBook
+
+STUDENTS: list[tuple[str, list[int]]] = [
+    ("Alice", [85, 90, 78]),
+    ("Bob", [50]),
+    ("Charlie", []),
+    ("Dana", [60, 60, 59, 61]),
+    ("Eve", [100, 0]),
+]
+
+def averages(students: list[tuple[str, list[int]]]) -> list[float]:
+    """Reference: one average per student, 0.0 without grades"""
+    return [sum(grades) / len(grades) if grades else 0.0 for _, grades in students]
+
+def test_csr_layout() -> None:
+    """Test that each student owns one row of the shared grade array."""
+    book = GradeBook.from_students(STUDENTS)
+    assert len(book) == 5 and book.names == [name for name, _ in STUDENTS], "Should keep input order"
+    assert list(book.offsets) == [0, 3, 4, 4, 8, 10], "Offsets should delimit the rows"
+    assert book.grades == array("i", [g for _, grades in STUDENTS for g in grades]), "One flat array"
+    assert [(name, list(row)) for name, row in book] == STUDENTS, "Rows should give back the grades"
+    assert book.counts() == [3, 1, 0, 4, 2], "Should count grades per student"
+    assert book.nbytes == 4 * 10 + 8 * 6, "Should report the bytes of both arrays"
+
+def test_averages_are_cached_until_add() -> None:
+    """Test that averages are computed once and invalidated by add()."""
+    book = GradeBook.from_students(STUDENTS)
+    first = book.averages()
+    assert list(first) == averages(STUDENTS), "Should match per-student averages"
+    assert book.averages() is first, "Should reuse the computed averages"
+    book.add("Fay", [70, 80])
+    assert book.averages() is not first and book.averages()[-1] == 75.0, "add() should recompute"
+
+def test_passing() -> None:
+    """Test passing students, the mask and the count, threshold included."""
+    book = GradeBook.from_students(STUDENTS)
+    assert book.passing() == [("Alice", 253 / 3), ("Dana", 60.0)], "Average >= 60 passes, in input order"
+    assert book.passing_mask() == bytearray([1, 0, 0, 1, 0]), "Should mark passing students"
+    assert book.count_passing(50.0) == 4 and book.count_passing(101.0) == 0, "Should follow the threshold"
+
+def test_from_students_empty() -> None:
+    """Test books without students or without any grade."""
+    empty = GradeBook()
+    assert len(empty) == 0 and list(empty.averages()) == [] and empty.passing() == [], "Empty book"
+    book = GradeBook.from_students([("Ann", []), ("Ben", [])])
+    assert list(book.averages()) == [0.0, 0.0] and book.count_passing() == 0, "No grades average 0.0"
+    with pytest.raises(ValueError, match="Invalid grades for 'Cid'"):
+        book.add("Cid", [1, "2"])  # type: ignore[list-item]
+    assert len(book) == 2 and len(book.grades) == 0, "A rejected student should not be added"
+
+def test_numpy_matches_pure_python(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the vectorized averages and mask against the pure-Python ones."""
+    pytest.importorskip("numpy")
+    students: list[tuple[str, Any]] = STUDENTS + [(f"s{i}", list(range(i % 7))) for i in range(200)]
+    vectorized = GradeBook.from_students(students)
+    expected_averages = list(vectorized.averages())
+    expected_mask = vectorized.passing_mask(2.5)
+    monkeypatch.setattr(module.gradebook, "np", None)
+    plain = GradeBook.from_students(students)
+    assert list(plain.averages()) == pytest.approx(expected_averages), "Averages should match"
+    assert plain.passing_mask(2.5) == expected_mask, "Passing masks should match"
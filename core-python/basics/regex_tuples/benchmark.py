@@ -0,0 +1,64 @@
+"""Benchmark log parsing throughput (lines/sec) on a synthetic log"""
+
+import argparse
+import random
+import re
+import time
+from itertools import cycle, islice
+from typing import Tuple
+
+from module.regex_tuples import extract_log_info, LOG_PATTERN
+
+
+def legacy_extract_log_info(log: str) -> Tuple[str, str] | None:
+    """The original implementation: raw pattern string passed to re.match"""
+    try:
+        match = re.match(LOG_PATTERN.pattern, log)
+        if match:
+            return (match.group(1), match.group(2))
+        return None
+    except TypeError:
+        return None
+
+
+def synthetic_logs(count: int, seed: int = 42) -> list[str]:
+    """Return `count` access-log lines, about 10% of them malformed"""
+    rng = random.Random(seed)
+    paths = ["/api", "/login", "/data", "/static/app.js", "/health"]
+    logs: list[str] = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            logs.append(rng.choice(["invalid log entry", "- - -", "999.1.1.1 [x]"]))
+            continue
+        ip = ".".join(str(rng.randint(0, 255)) for _ in range(4))
+        logs.append(
+            f"{ip} [2025-08-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:"
+            f"{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}] "
+            f"{rng.choice(['GET', 'POST'])} {rng.choice(paths)}"
+        )
+    return logs
+
+
+def main() -> None:
+    """Time each parser over the same stream of lines"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=10_000_000)
+    parser.add_argument("--distinct", type=int, default=100_000)
+    args = parser.parse_args()
+
+    pool = synthetic_logs(min(args.lines, args.distinct))
+    parsers = [
+        ("re.match(pattern string)", legacy_extract_log_info),
+        ("precompiled + '[' filter", extract_log_info),
+    ]
+    print(f"Parsing {args.lines:,} lines:")
+    for name, parse in parsers:
+        start = time.perf_counter()
+        for log in islice(cycle(pool), args.lines):
+            parse(log)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<26} {args.lines / elapsed:>12,.0f} lines/sec ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
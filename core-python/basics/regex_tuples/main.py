@@ -1,10 +1,99 @@
 """Regex Tuple"""
 
+import argparse
+import time
 from typing import List
+from module.log_pipeline import count_log_hours
+from module.parallel_logs import count_by_hour_parallel
 from module.regex_tuples import extract_log_info, filter_logs, count_by_hour
+from module.rolling_counts import RollingCounter, follow
+
+def count_source(
+    source: str, ip_prefix: str, cidrs: List[str] | None, workers: int
+) -> None:
+    """Stream a log file (or stdin, or .gz) and print counts by hour"""
+    try:
+        if workers:
+            counts = count_by_hour_parallel(source, ip_prefix, workers, cidrs=cidrs)
+        else:
+            counts = count_log_hours(source, ip_prefix, cidrs=cidrs)
+    except FileNotFoundError:
+        print(f"Error: File {source} not found.")
+        return
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    label = f"CIDR blocks: {', '.join(cidrs)}" if cidrs else f"IP prefix: '{ip_prefix}'"
+    print(f"Log Counts by Hour ({label}):")
+    for hour, count in counts.items():
+        print(f"{hour}: {count} logs")
+
+
+def follow_source(source: str, ip_prefix: str, every: float) -> None:
+    """Tail a growing log and print rolling counts every `every` seconds
+
+    Reports also come while the log is idle, with windows ending now, so
+    counts decay when traffic stops.
+    """
+    counter = RollingCounter(["", ip_prefix])
+    last_report = time.monotonic()
+
+    def report_if_due() -> None:
+        nonlocal last_report
+        if time.monotonic() - last_report < every:
+            return
+        now = time.time()
+        print(
+            f"Last 5 min: {counter.count(ip_prefix, 5, now=now)} logs from '{ip_prefix}'"
+            f" ({counter.count('', 5, now=now)} total),"
+            f" last hour: {counter.count(ip_prefix, 60, now=now)}"
+        )
+        last_report = time.monotonic()
+
+    try:
+        for line in follow(source, poll_interval=min(1.0, every), on_idle=report_if_due):
+            counter.add_line(line)
+            report_if_due()
+    except FileNotFoundError:
+        print(f"Error: File {source} not found.")
+    except KeyboardInterrupt:
+        pass
+
 
 def main() -> None:
     """Main function to demonstrate log extraction and filtering"""
+    parser = argparse.ArgumentParser(description="Extract and count log entries")
+    parser.add_argument(
+        "source", nargs="?", help="log file (or directory with --workers), '-' for stdin"
+    )
+    parser.add_argument("--prefix", default="192.168", help="IP prefix to keep")
+    parser.add_argument(
+        "--cidr",
+        action="append",
+        help="CIDR block to keep (repeatable, overrides --prefix)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="count a file or directory of logs with N processes (0 = serial)",
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="keep reading the file as it grows and print rolling counts",
+    )
+    parser.add_argument(
+        "--every", type=float, default=5.0, help="seconds between --follow reports"
+    )
+    args = parser.parse_args()
+    if args.source and args.follow:
+        follow_source(args.source, args.prefix, args.every)
+        return
+    if args.source:
+        count_source(args.source, args.prefix, args.cidr, args.workers)
+        return
+
     # Sample log entries
     logs: List[str] = [
         "192.168.1.1 [2025-08-14 11:49:00] GET /api",
@@ -22,7 +111,7 @@ def main() -> None:
         print(f"Log: {log} -> {result}")
 
     # Filter logs by IP Prefix
-    ip_prefix: str = "192.168"
+    ip_prefix: str = args.prefix
     filtered_logs = filter_logs(logs, ip_prefix)
     print(f"\nFiltered Logs (IP prefix: '{ip_prefix}'):")
     for ip, timestamp in filtered_logs:
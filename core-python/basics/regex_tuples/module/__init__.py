@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Make the shared core-python/modules package importable
+_CORE_PYTHON = str(Path(__file__).resolve().parents[3])
+if _CORE_PYTHON not in sys.path:
+    sys.path.append(_CORE_PYTHON)
@@ -0,0 +1,82 @@
+"""Integer-range index for matching IPs against many CIDR blocks at once"""
+
+import ipaddress
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Tuple
+
+from module.regex_tuples import LogParser, extract_log_info
+
+
+def ip_to_int(ip: str) -> int:
+    """Convert a dotted IPv4 address to a 32-bit integer"""
+    octets = ip.split(".")
+    if len(octets) != 4:
+        raise ValueError(f"Invalid IPv4 address: {ip}")
+    # bytes() rejects values outside 0-255 with ValueError
+    return int.from_bytes(bytes(map(int, octets)), "big")
+
+
+class CidrIndex:
+    """Sorted, merged integer ranges built from a list of CIDR blocks
+
+    Lookups are one binary search over the ranges, so matching against
+    thousands of blocks costs about as much as matching against one.
+    """
+
+    def __init__(self, cidrs: Iterable[str]) -> None:
+        ranges: list[tuple[int, int]] = []
+        for cidr in cidrs:
+            network = ipaddress.IPv4Network(cidr.strip(), strict=False)
+            ranges.append(
+                (int(network.network_address), int(network.broadcast_address))
+            )
+        ranges.sort()
+
+        # Merge overlapping and adjacent ranges
+        self.starts: array = array("L")
+        self.ends: array = array("L")
+        for start, end in ranges:
+            if self.ends and start <= self.ends[-1] + 1:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def contains_int(self, value: int) -> bool:
+        """Return True if the 32-bit address falls inside any block"""
+        i = bisect_right(self.starts, value) - 1
+        return i >= 0 and value <= self.ends[i]
+
+    def __contains__(self, ip: object) -> bool:
+        if not isinstance(ip, str):
+            return False
+        try:
+            return self.contains_int(ip_to_int(ip))
+        except ValueError:
+            return False
+
+
+def iter_filter_cidrs(
+    logs: Iterable[str],
+    cidrs: Iterable[str] | CidrIndex,
+    parser: LogParser = extract_log_info,
+) -> Iterator[Tuple[str, str]]:
+    """Lazily yield (IP, timestamp) tuples whose IP is inside any CIDR block"""
+    index = cidrs if isinstance(cidrs, CidrIndex) else CidrIndex(cidrs)
+    for log in logs:
+        result = parser(log)
+        if result and result[0] in index:
+            yield result
+
+
+def filter_logs_cidr(
+    logs: List[str],
+    cidrs: Iterable[str] | CidrIndex,
+    parser: LogParser = extract_log_info,
+) -> List[Tuple[str, str]]:
+    """Returns List of (IP, timestamp) tuples whose IP is inside any CIDR block"""
+    return list(iter_filter_cidrs(logs, cidrs, parser))
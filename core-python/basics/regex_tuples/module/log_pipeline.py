@@ -0,0 +1,61 @@
+"""One-pass, constant-memory log pipeline: read -> extract -> filter -> count"""
+
+import gzip
+import io
+import sys
+from typing import BinaryIO, Iterable, Iterator
+
+from module.ip_index import CidrIndex, iter_filter_cidrs
+from module.regex_tuples import (
+    LogParser,
+    count_by_hour,
+    extract_log_info,
+    iter_filter_logs,
+)
+
+GZIP_MAGIC: bytes = b"\x1f\x8b"
+
+
+def read_log_lines(source: str | BinaryIO = "-") -> Iterator[str]:
+    """Yield lines from a file path, "-" (stdin) or a binary stream
+
+    Gzip input is detected from its magic bytes, so "access.log.gz" and
+    "zcat"-less pipes both work. Undecodable bytes are replaced, not fatal.
+    """
+    if source == "-":
+        raw: BinaryIO = sys.stdin.buffer
+    elif isinstance(source, str):
+        raw = open(source, "rb")
+    else:
+        raw = source
+    owned = isinstance(source, str) and source != "-"
+
+    stream: BinaryIO = raw
+    peek = getattr(raw, "peek", None)
+    if peek is not None and peek(2)[:2] == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=raw, mode="rb")  # type: ignore[assignment]
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")
+    try:
+        yield from text
+    finally:
+        text.detach()  # don't let the wrapper close stdin or a caller's stream
+        if stream is not raw:
+            stream.close()
+        if owned:
+            raw.close()
+
+
+def count_log_hours(
+    source: str | BinaryIO = "-",
+    ip_prefix: str = "",
+    parser: LogParser = extract_log_info,
+    cidrs: Iterable[str] | CidrIndex | None = None,
+) -> dict[str, int]:
+    """Count matching log lines per hour in one streaming pass
+
+    With `cidrs`, IPs are matched against those blocks instead of `ip_prefix`.
+    """
+    lines = read_log_lines(source)
+    if cidrs is not None:
+        return count_by_hour(iter_filter_cidrs(lines, cidrs, parser))
+    return count_by_hour(iter_filter_logs(lines, ip_prefix, parser))
@@ -0,0 +1,121 @@
+"""Sharded, multi-process hour counting with mergeable Counter partials"""
+
+import io
+import os
+import re
+from collections import Counter
+from typing import Iterable, Iterator
+
+from modules.ordered_pool import map_ordered
+
+from module.ip_index import iter_filter_cidrs
+from module.log_pipeline import GZIP_MAGIC, read_log_lines
+from module.regex_tuples import count_by_hour, iter_filter_logs
+
+# (path, start, end) byte range of one log file; end == -1 means "whole file"
+Shard = tuple[str, int, int]
+
+CHUNK_SIZE: int = 32 << 20
+
+_DIGITS = re.compile(r"(\d+)")
+_ROTATED = re.compile(r"(.+)\.(\d+)(?:\.gz)?")
+
+
+def rotation_key(name: str) -> tuple[tuple[str | int, ...], int]:
+    """Sort key putting rotated logs oldest first: .10, .2, .1, then the live file
+
+    Base names compare digit runs as numbers, so app2.log sorts before app10.log.
+    """
+    rotated = _ROTATED.fullmatch(name)
+    base, number = (rotated[1], int(rotated[2])) if rotated else (name, 0)
+    parts = _DIGITS.split(base)
+    # Digit runs are always at odd positions, so str and int never meet
+    natural = tuple(int(part) if i % 2 else part for i, part in enumerate(parts))
+    return natural, -number
+
+
+def list_log_files(source: str) -> list[str]:
+    """Return the file itself, or every file of a directory in rotation order
+
+    Rotated copies of a log come oldest first (access.log.10 ... access.log.1)
+    and the live access.log last, so lines are read in the order they were written.
+    """
+    if os.path.isdir(source):
+        names = sorted(os.listdir(source), key=rotation_key)
+        paths = [os.path.join(source, name) for name in names]
+        return [path for path in paths if os.path.isfile(path)]
+    if not os.path.isfile(source):
+        raise FileNotFoundError(source)
+    return [source]
+
+
+def plan_shards(paths: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[Shard]:
+    """Cut plain files into newline-aligned ranges; gzip files stay whole"""
+    for path in paths:
+        with open(path, "rb") as file:
+            if file.read(2) == GZIP_MAGIC:
+                yield path, 0, -1
+                continue
+            size = os.fstat(file.fileno()).st_size
+            start = 0
+            while start < size:
+                file.seek(min(start + chunk_size, size) - 1)
+                # Extend the range to the end of the line it stops in
+                tail = file.readline()
+                end = file.tell() if tail else size
+                yield path, start, end
+                start = end
+
+
+def count_shard(
+    shard: Shard, ip_prefix: str = "", cidrs: list[str] | None = None
+) -> Counter[str]:
+    """Parse, filter and count one shard exactly like the serial pipeline"""
+    path, start, end = shard
+    if end == -1:
+        lines: Iterable[str] = read_log_lines(path)
+    else:
+        with open(path, "rb") as file:
+            file.seek(start)
+            data = file.read(end - start)
+        text = data.decode("utf-8", errors="replace")
+        lines = io.StringIO(text, newline=None)
+    if cidrs is not None:
+        entries = iter_filter_cidrs(lines, cidrs)
+    else:
+        entries = iter_filter_logs(lines, ip_prefix)
+    return count_by_hour(entries, Counter())
+
+
+def merge_counts(total: Counter[str], partial: Counter[str]) -> Counter[str]:
+    """Add a partial count into the running total (keeps first-seen hour order)"""
+    total.update(partial)
+    return total
+
+
+def count_by_hour_parallel(
+    source: str,
+    ip_prefix: str = "",
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    max_pending: int | None = None,
+    cidrs: list[str] | None = None,
+) -> dict[str, int]:
+    """Count matching log lines per hour across processes
+
+    `source` is a log file or a directory of (rotated, maybe gzipped) logs.
+    At most `max_pending` shards are in flight at once (default: 2 per
+    worker), and partials are merged in shard order, so the result equals
+    count_by_hour(filter_logs(...)) over the same lines, dict order included.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    shards = plan_shards(list_log_files(source), chunk_size)
+
+    total: Counter[str] = Counter()
+    for partial in map_ordered(
+        count_shard, shards, ip_prefix, cidrs, workers=workers, max_pending=max_pending
+    ):
+        merge_counts(total, partial)
+    return dict(total)
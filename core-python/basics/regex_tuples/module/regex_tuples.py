@@ -1,13 +1,28 @@
 import re
-from typing import Tuple, List
+from typing import Callable, Iterable, Iterator, MutableMapping, Tuple, List, TypeVar, overload
+
+# Compiled once at import, so hot loops never depend on re's internal cache
+# Match IP (e.g., 192.168.1.1) and timestamp (e.g., 2025-08-14 11:49:00)
+LOG_PATTERN = re.compile(
+    r"((?:(?:25[0-5]|2[0-4]\d|1\d\d|\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|\d?\d))\s+\[(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\]"
+)
+# Hour part of a timestamp (e.g., '2025-08-14 11' from '2025-08-14 11:49:00')
+HOUR_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2}\s+\d{2})")
+
+# A parser turns one log line into (IP, timestamp) or None
+LogParser = Callable[[str], Tuple[str, str] | None]
+
+# Any mapping count_by_hour can add to (dict, Counter, ...)
+Counts = TypeVar("Counts", bound=MutableMapping[str, int])
 
 
 def extract_log_info(log: str) -> Tuple[str, str] | None:
     """Return (IP, timestamp) tuple or None if invalid"""
     try:
-        # Match IP (e.g., 192.168.1.1) and timestamp (e.g., 2025-08-14 11:49:00)
-        pattern = r"((?:(?:25[0-5]|2[0-4]\d|1\d\d|\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|\d?\d))\s+\[(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\]"
-        match = re.match(pattern, log)
+        # Cheap pre-filter: no '[' means no timestamp, skip the regex
+        if "[" not in log:
+            return None
+        match = LOG_PATTERN.match(log)
         if match:
             return (match.group(1), match.group(2))
         return None
@@ -15,25 +30,44 @@ def extract_log_info(log: str) -> Tuple[str, str] | None:
         return None
 
 
-def filter_logs(logs: List[str], ip_prefix: str) -> List[Tuple[str, str]]:
-    """Returns List of (IP, timestamp) tuples for matching IPs."""
-    filtered: List[Tuple[str, str]] = []
+def iter_filter_logs(
+    logs: Iterable[str], ip_prefix: str, parser: LogParser = extract_log_info
+) -> Iterator[Tuple[str, str]]:
+    """Lazily yield (IP, timestamp) tuples for matching IPs."""
     for log in logs:
-        result = extract_log_info(log)
+        result = parser(log)
         if result and result[0].startswith(ip_prefix):
-            filtered.append(result)
-    return filtered
+            yield result
+
+
+def filter_logs(
+    logs: List[str], ip_prefix: str, parser: LogParser = extract_log_info
+) -> List[Tuple[str, str]]:
+    """Returns List of (IP, timestamp) tuples for matching IPs."""
+    return list(iter_filter_logs(logs, ip_prefix, parser))
+
+
+@overload
+def count_by_hour(logs: Iterable[Tuple[str, str]]) -> dict[str, int]: ...
+
+
+@overload
+def count_by_hour(logs: Iterable[Tuple[str, str]], counts: Counts) -> Counts: ...
+
 
+def count_by_hour(
+    logs: Iterable[Tuple[str, str]], counts: MutableMapping[str, int] | None = None
+) -> MutableMapping[str, int]:
+    """Groups logs by hour and count occurrences
 
-def count_by_hour(logs: List[Tuple[str, str]]) -> dict[str, int]:
-    """Groups logs by hour and count occurrences"""
-    counts: dict[str, int] = {}
+    Pass an existing `counts` mapping (dict, Counter) to keep adding to it
+    (e.g. per batch); it is returned with its own type.
+    """
+    counts = {} if counts is None else counts
     for ip, timestamp in logs:
         try:
-            # Extract hour part (e.g., '2025-08-14 11' from '2025-08-14 11:49:00')
-            pattern = r"(\d{4}-\d{2}-\d{2}\s+\d{2})"
             hour = timestamp[:13]
-            if re.match(pattern, hour):
+            if HOUR_PATTERN.match(hour):
                 counts[hour] = counts.get(hour, 0) + 1
         except (TypeError, ValueError):
             continue
@@ -0,0 +1,215 @@
+"""Bounded-memory rolling counts over a growing log, plus a tail -f reader"""
+
+import os
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Callable, Generator, Iterable, Iterator
+
+from module.regex_tuples import extract_log_info
+
+# Bucket width in seconds for each granularity
+UNITS: dict[str, int] = {"minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_timestamp(timestamp: str) -> int:
+    """Convert 'YYYY-MM-DD HH:MM:SS' (UTC) to epoch seconds"""
+    date_part, time_part = timestamp.split()
+    year, month, day = date_part.split("-")
+    hour, minute, second = time_part.split(":")
+    moment = datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour),
+        int(minute),
+        int(second),
+        tzinfo=timezone.utc,
+    )
+    return int(moment.timestamp())
+
+
+class _Ring:
+    """Fixed number of time buckets; each bucket counts hits per tracked prefix"""
+
+    def __init__(self, width: int, size: int, prefixes: int) -> None:
+        self.width = width
+        self.size = size
+        self.prefixes = prefixes
+        self.epochs = array("q", [-1]) * size  # which bucket each slot holds
+        self.counts = array("q", [0]) * (size * prefixes)
+
+    def add(self, ts: int, hits: list[int]) -> None:
+        epoch = ts // self.width
+        slot = epoch % self.size
+        held = self.epochs[slot]
+        if held != epoch:
+            if held > epoch:
+                return  # older than the history this ring keeps
+            self.epochs[slot] = epoch
+            base = slot * self.prefixes
+            self.counts[base : base + self.prefixes] = array("q", [0]) * self.prefixes
+        base = slot * self.prefixes
+        for i in hits:
+            self.counts[base + i] += 1
+
+    def total(self, prefix: int, last: int, now: int) -> int:
+        """Sum the last `last` buckets up to and including the one holding `now`"""
+        current = now // self.width
+        total = 0
+        for epoch in range(current - last + 1, current + 1):
+            slot = epoch % self.size
+            if self.epochs[slot] == epoch:
+                total += self.counts[slot * self.prefixes + prefix]
+        return total
+
+    def buckets(self, prefix: int) -> Iterator[tuple[int, int]]:
+        """Yield (bucket start epoch seconds, count) for retained buckets, oldest first"""
+        for epoch in sorted(e for e in self.epochs if e >= 0):
+            slot = epoch % self.size
+            yield epoch * self.width, self.counts[slot * self.prefixes + prefix]
+
+
+class RollingCounter:
+    """Per-minute/hour/day request counts for a fixed set of IP prefixes
+
+    Memory is fixed by the ring sizes (default: 24h of minutes, 7 days of
+    hours, 30 days of days), and "requests per prefix in the last N units"
+    is answered from at most N buckets, without rescanning any log.
+    """
+
+    def __init__(
+        self,
+        prefixes: Iterable[str] = ("",),
+        minutes: int = 24 * 60,
+        hours: int = 7 * 24,
+        days: int = 30,
+    ) -> None:
+        self.prefixes: list[str] = list(dict.fromkeys(prefixes))
+        if not self.prefixes:
+            raise ValueError("At least one prefix is required ('' counts all IPs)")
+        sizes = {"minute": minutes, "hour": hours, "day": days}
+        self.rings: dict[str, _Ring] = {
+            unit: _Ring(UNITS[unit], sizes[unit], len(self.prefixes)) for unit in UNITS
+        }
+        self.latest: int = 0  # newest timestamp seen, in epoch seconds
+
+    def add(self, ip: str, timestamp: str) -> None:
+        """Count one (IP, timestamp) entry"""
+        ts = parse_timestamp(timestamp)
+        hits = [i for i, prefix in enumerate(self.prefixes) if ip.startswith(prefix)]
+        if not hits:
+            return
+        for ring in self.rings.values():
+            ring.add(ts, hits)
+        self.latest = max(self.latest, ts)
+
+    def add_line(self, log: str) -> bool:
+        """Parse a raw log line with extract_log_info(); return True if counted"""
+        result = extract_log_info(log)
+        if result is None:
+            return False
+        try:
+            self.add(*result)
+        except ValueError:  # e.g. '2025-13-40 ...' passes the regex
+            return False
+        return True
+
+    def count(
+        self,
+        prefix: str = "",
+        last: int = 5,
+        unit: str = "minute",
+        now: float | None = None,
+    ) -> int:
+        """Return requests from `prefix` in the last `last` units
+
+        `now` defaults to the newest log timestamp seen; pass time.time()
+        to measure against the wall clock instead.
+        """
+        ring = self._ring(unit)
+        if not 0 < last <= ring.size:
+            raise ValueError(f"last must be between 1 and {ring.size} {unit}s")
+        reference = self.latest if now is None else int(now)
+        return ring.total(self._prefix_index(prefix), last, reference)
+
+    def hour_counts(self, prefix: str = "") -> dict[str, int]:
+        """Return retained hourly counts in count_by_hour() format"""
+        counts: dict[str, int] = {}
+        for start, count in self.rings["hour"].buckets(self._prefix_index(prefix)):
+            if count:
+                hour = datetime.fromtimestamp(start, timezone.utc)
+                counts[hour.strftime("%Y-%m-%d %H")] = count
+        return counts
+
+    def _ring(self, unit: str) -> _Ring:
+        if unit not in self.rings:
+            raise ValueError(f"Unknown unit: {unit} (use one of {', '.join(UNITS)})")
+        return self.rings[unit]
+
+    def _prefix_index(self, prefix: str) -> int:
+        try:
+            return self.prefixes.index(prefix)
+        except ValueError:
+            raise ValueError(f"Prefix '{prefix}' is not tracked") from None
+
+
+def follow(
+    path: str,
+    poll_interval: float = 1.0,
+    from_start: bool = False,
+    stop: Callable[[], bool] | None = None,
+    on_idle: Callable[[], None] | None = None,
+) -> Generator[str, None, None]:
+    """Yield complete lines appended to a file, like `tail -F`
+
+    Partial lines wait until their newline arrives. If the file is rotated
+    (new inode) or truncated, reading restarts from its beginning.
+    `stop` is checked, and `on_idle` called (e.g. to refresh a dashboard),
+    every poll_interval while no new data is available.
+    """
+    file = open(path, "rb")
+    try:
+        if not from_start:
+            file.seek(0, os.SEEK_END)
+        pending = b""
+        while True:
+            chunk = file.readline()
+            if chunk:
+                pending += chunk
+                if pending.endswith(b"\n"):
+                    yield pending.decode("utf-8", errors="replace")
+                    pending = b""
+                continue
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:  # mid-rotation: keep the old file for now
+                current = None
+            if current is not None and (
+                current.st_ino != os.fstat(file.fileno()).st_ino
+                or current.st_size < file.tell()
+            ):
+                file.close()
+                file = open(path, "rb")
+                pending = b""
+                continue
+            if stop is not None and stop():
+                return
+            if on_idle is not None:
+                on_idle()
+            time.sleep(poll_interval)
+    finally:
+        file.close()
+
+
+def tail_counts(
+    path: str,
+    counter: RollingCounter,
+    poll_interval: float = 1.0,
+    from_start: bool = False,
+    stop: Callable[[], bool] | None = None,
+) -> RollingCounter:
+    """Feed every new line of a growing log into a RollingCounter"""
+    for line in follow(path, poll_interval, from_start, stop):
+        counter.add_line(line)
+    return counter
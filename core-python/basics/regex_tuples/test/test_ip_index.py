@@ -0,0 +1,40 @@
+import pytest
+from typing import List, Tuple
+from module.ip_index import CidrIndex, ip_to_int, filter_logs_cidr
+
+def test_ip_to_int() -> None:
+    """Test IPv4 to integer conversion."""
+    assert ip_to_int("0.0.0.0") == 0, "Lowest address should be 0"
+    assert ip_to_int("255.255.255.255") == 2**32 - 1, "Highest address should be 2**32 - 1"
+    assert ip_to_int("10.1.0.1") == (10 << 24) + (1 << 16) + 1, "Should pack octets big-endian"
+    with pytest.raises(ValueError):
+        ip_to_int("256.0.0.1")
+    with pytest.raises(ValueError):
+        ip_to_int("10.1.1")
+
+def test_cidr_index_membership() -> None:
+    """Test matching IPs against several CIDR blocks."""
+    index = CidrIndex(["10.1.0.0/16", "192.168.1.0/24", "192.168.0.0/24", "8.8.8.8/32"])
+    assert len(index) == 3, "Adjacent /24 blocks should merge into one range"
+    assert "10.1.255.255" in index, "Last address of a block should match"
+    assert "10.10.0.1" not in index, "10.10.x.x is not inside 10.1.0.0/16"
+    assert "192.168.0.7" in index and "192.168.1.200" in index, "Merged range should match both blocks"
+    assert "192.168.2.1" not in index, "Address after the merged range should not match"
+    assert "8.8.8.8" in index and "8.8.8.9" not in index, "Single-host block should match exactly"
+    assert None not in index and "bad" not in index, "Invalid input should not match"
+    assert "1.2.3.4" not in CidrIndex([]), "Empty index should match nothing"
+
+def test_filter_logs_cidr() -> None:
+    """Test CIDR-based log filtering."""
+    logs: List[str] = [
+        "10.1.0.1 [2025-08-14 11:49:00] GET /api",
+        "10.10.0.1 [2025-08-14 11:50:00] POST /login",
+        "192.168.1.2 [2025-08-14 12:01:00] GET /data",
+        "invalid log entry",
+    ]
+    expected: List[Tuple[str, str]] = [
+        ("10.1.0.1", "2025-08-14 11:49:00"),
+        ("192.168.1.2", "2025-08-14 12:01:00")
+    ]
+    assert filter_logs_cidr(logs, ["10.1.0.0/16", "192.168.0.0/16"]) == expected, "Should keep IPs inside the blocks"
+    assert filter_logs_cidr(logs, []) == [], "No blocks should keep nothing"
@@ -0,0 +1,42 @@
+import gzip
+import io
+from typing import List
+from module.log_pipeline import read_log_lines, count_log_hours
+from module.regex_tuples import count_by_hour, filter_logs
+
+LOGS: List[str] = [
+    "192.168.1.1 [2025-08-14 11:49:00] GET /api",
+    "10.0.0.1 [2025-08-14 11:50:00] POST /login",
+    "192.168.1.2 [2025-08-14 12:01:00] GET /data",
+    "invalid log entry",
+    "192.168.1.3 [2025-08-14 11:55:00] GET /api",
+]
+
+def test_count_log_hours_plain_file(tmp_path) -> None:
+    """Test the streaming pipeline against the list-based functions."""
+    path = tmp_path / "access.log"
+    path.write_text("\n".join(LOGS) + "\n", encoding="utf-8")
+    expected = count_by_hour(filter_logs(LOGS, "192.168"))
+    assert count_log_hours(str(path), "192.168") == expected, "Should match the list-based result"
+    assert count_log_hours(str(path)) == {"2025-08-14 11": 3, "2025-08-14 12": 1}, "Empty prefix keeps all IPs"
+    assert count_log_hours(str(path), cidrs=["10.0.0.0/8"]) == {"2025-08-14 11": 1}, "CIDR blocks replace the prefix"
+
+def test_count_log_hours_gzip(tmp_path) -> None:
+    """Test that gzip input is detected from its content."""
+    path = tmp_path / "access.log.1"
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        file.write("\n".join(LOGS))
+    assert count_log_hours(str(path), "192.168") == {"2025-08-14 11": 2, "2025-08-14 12": 1}, "Should read gzip logs"
+
+def test_read_log_lines_stream() -> None:
+    """Test reading from a binary stream, including undecodable bytes."""
+    stream = io.BufferedReader(io.BytesIO(b"a\n\xff b\n"))  # type: ignore[arg-type]
+    assert list(read_log_lines(stream)) == ["a\n", "� b\n"], "Should yield decoded lines"
+    assert not stream.closed, "Caller's stream should stay open"
+
+def test_count_by_hour_incremental() -> None:
+    """Test adding counts batch by batch into the same dict."""
+    counts: dict[str, int] = {}
+    for batch in (LOGS[:2], LOGS[2:]):
+        count_by_hour(filter_logs(batch, ""), counts)
+    assert counts == count_by_hour(filter_logs(LOGS, "")), "Batches should add up to the full count"
@@ -0,0 +1,68 @@
+import gzip
+import pytest
+from collections import Counter
+from typing import List
+from hypothesis import HealthCheck, given, settings, strategies as st
+from module.parallel_logs import count_by_hour_parallel, list_log_files, plan_shards
+from module.regex_tuples import count_by_hour, filter_logs
+
+OCTETS = st.sampled_from(["0", "1", "10", "192", "168", "255", "256", "01"])
+VALID_LINES = st.builds(
+    "{}.{}.{}.{} [2025-08-{:02d} {:02d}:{:02d}:00] GET /{}".format,
+    OCTETS, OCTETS, OCTETS, OCTETS,
+    st.integers(1, 3), st.integers(0, 23), st.integers(0, 59), st.text("abc", max_size=3),
+)
+LINES = st.lists(
+    st.one_of(VALID_LINES, st.text(alphabet="0123456789. [-:]é\r", max_size=40)),
+    max_size=60,
+)
+
+@settings(max_examples=40, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(lines=LINES, prefix=st.sampled_from(["", "1", "10.", "192.168"]), chunk_size=st.integers(1, 200))
+def test_parallel_matches_serial(tmp_path, lines: List[str], prefix: str, chunk_size: int) -> None:
+    """Property: sharded counting equals count_by_hour(filter_logs(...))."""
+    path = tmp_path / "access.log"
+    path.write_text("\n".join(lines), encoding="utf-8", newline="")
+    with open(path, encoding="utf-8") as file:
+        expected = count_by_hour(filter_logs(list(file), prefix))
+    result = count_by_hour_parallel(str(path), prefix, workers=2, chunk_size=chunk_size, max_pending=2)
+    assert result == expected, "Parallel counts should equal serial counts"
+    assert list(result) == list(expected), "Hour order should match too"
+
+def test_parallel_directory_with_gzip(tmp_path) -> None:
+    """Test a directory of rotated logs, one of them gzipped."""
+    logs: List[str] = [
+        "192.168.1.1 [2025-08-14 11:49:00] GET /api",
+        "10.0.0.1 [2025-08-14 11:50:00] POST /login",
+        "192.168.1.2 [2025-08-14 12:01:00] GET /data",
+    ]
+    (tmp_path / "access.log").write_text("\n".join(logs[:2]) + "\n")
+    with gzip.open(tmp_path / "access.log.1.gz", "wt") as file:
+        file.write(logs[2] + "\n")
+    assert len(list(plan_shards(list_log_files(str(tmp_path)), chunk_size=10))) == 3, "Plain file splits, gzip stays whole"
+    expected = count_by_hour(filter_logs(logs, "192.168"))
+    assert count_by_hour_parallel(str(tmp_path), "192.168", workers=1) == expected, "In-process mode should match"
+    assert count_by_hour_parallel(str(tmp_path), "192.168", workers=2, chunk_size=10) == expected, "Pool mode should match"
+    assert count_by_hour_parallel(str(tmp_path), cidrs=["10.0.0.0/8"], workers=2) == {"2025-08-14 11": 1}, "Should filter by CIDR"
+
+def test_list_log_files_rotation_order(tmp_path) -> None:
+    """Test that rotated logs come oldest first, numerically, with the live log last."""
+    names = ["access.log.10", "access.log.2.gz", "access.log", "access.log.1", "error.log"]
+    for name in names:
+        (tmp_path / name).write_text("")
+    (tmp_path / "archive").mkdir()
+    files = [path.rsplit("/", 1)[-1] for path in list_log_files(str(tmp_path))]
+    assert files == ["access.log.10", "access.log.2.gz", "access.log.1", "access.log", "error.log"], "Should read .10 before .2 and the live log last"
+
+def test_count_by_hour_keeps_mapping_type() -> None:
+    """Test that count_by_hour adds to and returns the mapping it is given."""
+    counts: Counter[str] = Counter({"2025-08-14 11": 1})
+    result = count_by_hour([("1.1.1.1", "2025-08-14 11:00:00")], counts)
+    assert result is counts and counts["2025-08-14 11"] == 2, "Should update the given Counter"
+
+def test_parallel_invalid_options(tmp_path) -> None:
+    """Test option validation and missing sources."""
+    with pytest.raises(FileNotFoundError):
+        count_by_hour_parallel(str(tmp_path / "missing.log"))
+    with pytest.raises(ValueError):
+        count_by_hour_parallel(str(tmp_path), chunk_size=0)
@@ -60,3 +60,16 @@ def test_count_by_hour_edge_cases() -> None:
         (None, None)  # type: ignore
     ]
     assert count_by_hour(logs) == {}, "Invalid timestamps should return empty dict"
+
+def test_filter_logs_custom_parser() -> None:
+    """Test plugging a different parser into filter_logs."""
+    logs: List[str] = ["2025-08-14 11:49:00", "2025-08-14 12:01:00"]
+    parser = lambda log: ("10.0.0.1", log)
+    expected: List[Tuple[str, str]] = [
+        ("10.0.0.1", "2025-08-14 11:49:00"),
+        ("10.0.0.1", "2025-08-14 12:01:00")
+    ]
+    assert filter_logs(logs, "10.", parser) == expected, "Should use the given parser for every line"
+
+    # Lines without '[' are rejected before the regex runs
+    assert extract_log_info("192.168.1.1 2025-08-14 11:49:00") is None, "No '[' should return None"
@@ -0,0 +1,81 @@
+import threading
+import time
+import pytest
+from typing import Generator
+from module.rolling_counts import RollingCounter, follow, parse_timestamp, tail_counts
+
+def test_parse_timestamp() -> None:
+    """Test timestamp conversion to epoch seconds (UTC)."""
+    assert parse_timestamp("1970-01-01 00:01:00") == 60, "Should count seconds since the epoch"
+    with pytest.raises(ValueError):
+        parse_timestamp("2025-13-01 00:00:00")
+
+def test_rolling_counter_windows() -> None:
+    """Test per-prefix counts over the last N minutes and hours."""
+    counter = RollingCounter(["", "192.168"], minutes=10)
+    counter.add("192.168.1.1", "2025-08-14 11:49:00")
+    counter.add("10.0.0.1", "2025-08-14 11:50:30")
+    counter.add("192.168.1.2", "2025-08-14 11:55:00")
+    assert counter.count("", last=1) == 1, "Only the newest minute"
+    assert counter.count("", last=6) == 2, "11:50 to 11:55"
+    assert counter.count("192.168", last=10) == 2, "Should count the prefix only"
+    assert counter.count("", last=1, unit="hour") == 3, "Whole hour"
+    assert counter.hour_counts("192.168") == {"2025-08-14 11": 2}, "Should match count_by_hour format"
+    with pytest.raises(ValueError):
+        counter.count("", last=11)
+    with pytest.raises(ValueError):
+        counter.count("172.16")
+
+def test_rolling_counter_memory_is_bounded() -> None:
+    """Test that old buckets are recycled and late events are dropped."""
+    counter = RollingCounter(minutes=5)
+    for minute in range(30):
+        counter.add("10.0.0.1", f"2025-08-14 11:{minute:02d}:00")
+    assert len(counter.rings["minute"].epochs) == 5, "Ring size is fixed"
+    assert counter.count(last=5) == 5, "Only the last 5 minutes are kept"
+    counter.add("10.0.0.1", "2025-08-14 11:00:00")  # older than the minute ring
+    assert counter.count(last=5) == 5, "Late events should not overwrite newer buckets"
+    assert counter.count(last=1, unit="hour") == 31, "The hour ring still counts them"
+    assert counter.add_line("invalid log entry") is False, "Invalid lines are ignored"
+
+def test_tail_counts_follows_appends(tmp_path) -> None:
+    """Test following a growing log file, including a partial line."""
+    path = tmp_path / "access.log"
+    path.write_text("192.168.1.1 [2025-08-14 11:49:00] old line\n")
+    counter = RollingCounter()
+    done = threading.Event()
+
+    def writer() -> None:
+        with open(path, "a") as file:
+            file.write("192.168.1.2 [2025-08-14 11:50:00] GET")
+            file.flush()
+            time.sleep(0.05)
+            file.write(" /api\n10.0.0.1 [2025-08-14 11:51:00] GET /\n")
+        time.sleep(0.05)
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    tail_counts(str(path), counter, poll_interval=0.01, from_start=True, stop=done.is_set)
+    thread.join()
+    assert counter.count(last=5) == 3, "Existing and appended lines should be counted"
+
+def test_follow_restarts_after_truncation(tmp_path) -> None:
+    """Test that a truncated file is read again from the start."""
+    path = tmp_path / "access.log"
+    path.write_text("a longer first line\n")
+    lines: Generator[str, None, None] = follow(str(path), poll_interval=0.01, from_start=True)
+    assert next(lines) == "a longer first line\n", "Should read existing lines from the start"
+    path.write_text("")
+    with open(path, "a") as file:
+        file.write("b\n")
+    assert next(lines) == "b\n", "Should restart after truncation"
+    lines.close()
+
+def test_follow_calls_on_idle(tmp_path) -> None:
+    """Test that on_idle runs on every poll while no line arrives."""
+    path = tmp_path / "access.log"
+    path.write_text("")
+    idle: list[int] = []
+    lines = follow(str(path), poll_interval=0.001, stop=lambda: len(idle) >= 3, on_idle=lambda: idle.append(1))
+    assert list(lines) == [] and len(idle) == 3, "Should refresh while the log is idle"
@@ -0,0 +1,141 @@
+"""Batched, optionally atomic and compressed text output"""
+
+import gzip
+import os
+import time
+import uuid
+from itertools import islice
+from types import TracebackType
+from typing import IO, Any, Iterable
+
+try:
+    import zstandard
+except ImportError:  # optional dependency, only needed for .zst output
+    zstandard = None
+
+CHUNK_ROWS: int = 8192
+
+
+def infer_compression(path: str) -> str | None:
+    """Return "gzip", "zstd" or None based on the file extension"""
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return None
+
+
+class BulkWriter:
+    """Collect rows in memory and write them as large joined buffers
+
+    Use as a context manager. With atomic=True rows go to a temporary file
+    next to the target, which replaces the target only if no error occurred.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        atomic: bool = False,
+        compression: str | None = None,
+        chunk_rows: int = CHUNK_ROWS,
+        encoding: str = "utf-8",
+    ) -> None:
+        compression = compression or infer_compression(path)
+        if compression not in (None, "gzip", "zstd"):
+            raise ValueError(f"Unsupported compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd output requires the 'zstandard' package")
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+
+        self.path = path
+        self.atomic = atomic
+        self.compression = compression
+        self.chunk_rows = chunk_rows
+        self.encoding = encoding
+        self.rows: int = 0
+        self._buffer: list[str] = []
+        self._target = f"{path}.{uuid.uuid4().hex[:8]}.tmp" if atomic else path
+        self._raw: IO[bytes] | None = None
+        self._stream: Any = None
+        self._start: float = 0.0
+        self._elapsed: float = 0.0
+
+    def __enter__(self) -> "BulkWriter":
+        # "xb" never clobbers an existing file and keeps the usual umask
+        self._raw = open(self._target, "xb" if self.atomic else "wb")
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        elif self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._raw)
+        else:
+            self._stream = self._raw
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        try:
+            # Each step runs even if the previous one failed: the file is always closed
+            try:
+                if exc_type is None:
+                    self.flush()
+            finally:
+                try:
+                    if self._stream is not self._raw:
+                        self._stream.close()
+                finally:
+                    if self._raw is not None:
+                        self._raw.close()
+        except BaseException:
+            self._discard()
+            raise
+        self._elapsed = time.perf_counter() - self._start
+        if exc_type is not None:
+            self._discard()
+        elif self.atomic:
+            os.replace(self._target, self.path)
+
+    def write_row(self, row: str) -> None:
+        """Queue one already formatted row (including its newline)"""
+        self._buffer.append(row)
+        self.rows += 1
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def write_rows(self, template: str, records: Iterable[tuple[Any, ...]]) -> None:
+        """Format records with a %-style template, one chunk at a time"""
+        self.flush()
+        records = iter(records)
+        while chunk := list(islice(records, self.chunk_rows)):
+            self._write("".join([template % record for record in chunk]))
+            self.rows += len(chunk)
+
+    def flush(self) -> None:
+        """Write queued rows as a single buffer"""
+        if self._buffer:
+            self._write("".join(self._buffer))
+            self._buffer.clear()
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Rows written per second (so far, or over the whole run once closed)"""
+        elapsed = self._elapsed or time.perf_counter() - self._start
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Return a short throughput report, e.g. '1000 rows, 2,500,000 rows/sec'"""
+        return f"{self.rows} rows, {self.rows_per_sec:,.0f} rows/sec"
+
+    def _write(self, text: str) -> None:
+        if self._stream is None:
+            raise ValueError("BulkWriter must be used as a context manager")
+        self._stream.write(text.encode(self.encoding))
+
+    def _discard(self) -> None:
+        if self.atomic and os.path.exists(self._target):
+            os.remove(self._target)
@@ -0,0 +1,41 @@
+"""Process-pool map with bounded read-ahead and results in input order"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_ordered(
+    func: Callable[..., R],
+    tasks: Iterable[T],
+    *args: Any,
+    workers: int = 1,
+    max_pending: int | None = None,
+) -> Iterator[R]:
+    """Yield func(task, *args) for each task, in task order
+
+    With workers > 1 the calls run in a ProcessPoolExecutor (func and its
+    arguments must pickle), and at most `max_pending` tasks (default: 2
+    per worker) are in flight, so a lazy stream of tasks is never read far
+    ahead of the workers. workers == 1 calls func in this process.
+    """
+    max_pending = max_pending or 2 * workers
+    if workers < 1 or max_pending < 1:
+        raise ValueError("workers and max_pending must be at least 1")
+    if workers == 1:
+        for task in tasks:
+            yield func(task, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[R]] = deque()
+        for task in tasks:
+            if len(pending) >= max_pending:
+                # Backpressure: wait for the oldest task before submitting more
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, task, *args))
+        while pending:
+            yield pending.popleft().result()
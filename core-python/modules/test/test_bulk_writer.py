@@ -0,0 +1,75 @@
+import gzip
+import os
+import pytest
+from modules.bulk_writer import BulkWriter, infer_compression
+
+def test_write_rows_matches_per_row_writes(tmp_path) -> None:
+    """Test that chunked formatting produces the same text as f-string writes."""
+    books = [(f"Book {i}", i * 1.255) for i in range(1000)]
+    path = tmp_path / "out.txt"
+    with BulkWriter(str(path), chunk_rows=64) as writer:
+        writer.write_rows("%s: $%.2f\n", books)
+    expected = "".join(f"{title}: ${price:.2f}\n" for title, price in books)
+    assert path.read_text(encoding="utf-8") == expected, "Output should match f-string rows"
+    assert writer.rows == 1000, "Should count written rows"
+    assert writer.rows_per_sec > 0, "Should report throughput"
+
+def test_write_row_and_rows_keep_order(tmp_path) -> None:
+    """Test mixing single rows with batches."""
+    path = tmp_path / "out.txt"
+    with BulkWriter(str(path), chunk_rows=2) as writer:
+        writer.write_row("a\n")
+        writer.write_rows("%s\n", [("b",), ("c",)])
+        writer.write_row("d\n")
+    assert path.read_text() == "a\nb\nc\nd\n", "Rows should keep their order"
+
+def test_atomic_write_replaces_only_on_success(tmp_path) -> None:
+    """Test that an atomic write leaves the old file in place on error."""
+    path = tmp_path / "out.txt"
+    path.write_text("old\n")
+    with pytest.raises(RuntimeError):
+        with BulkWriter(str(path), atomic=True) as writer:
+            writer.write_row("new\n")
+            raise RuntimeError("boom")
+    assert path.read_text() == "old\n", "Failed atomic write should keep the old file"
+    assert os.listdir(tmp_path) == ["out.txt"], "Temporary file should be removed"
+
+    with BulkWriter(str(path), atomic=True) as writer:
+        writer.write_row("new\n")
+    assert path.read_text() == "new\n", "Successful atomic write should replace the file"
+
+def test_gzip_output(tmp_path) -> None:
+    """Test gzip output inferred from the file extension."""
+    path = tmp_path / "out.txt.gz"
+    with BulkWriter(str(path)) as writer:
+        writer.write_rows("%s\n", [("x",), ("y",)])
+    with gzip.open(path, "rt") as file:
+        assert file.read() == "x\ny\n", "Gzip output should decompress to the rows"
+
+def test_zstd_output(tmp_path) -> None:
+    """Test zstd output when the optional package is installed."""
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "out.txt.zst"
+    with BulkWriter(str(path)) as writer:
+        writer.write_row("x\n")
+    with open(path, "rb") as file:
+        data = zstandard.ZstdDecompressor().stream_reader(file).read()
+    assert data == b"x\n", "Zstd output should decompress to the rows"
+
+@pytest.mark.parametrize("name", ["out.txt", "out.txt.gz"])
+def test_failed_final_flush_closes_and_removes_temp(tmp_path, name) -> None:
+    """Test that a flush error on exit still closes the file and removes the temp file."""
+    writer = BulkWriter(str(tmp_path / name), atomic=True)
+    with pytest.raises(UnicodeEncodeError):
+        with writer:
+            writer.write_row("\udc80 lone surrogate\n")  # only encoded by the final flush
+    assert writer._raw is not None and writer._raw.closed, "Should close the file"
+    assert os.listdir(tmp_path) == [], "Should remove the temp file"
+
+def test_invalid_options() -> None:
+    """Test validation of writer options."""
+    assert infer_compression("a.txt") is None, "Plain files are not compressed"
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        BulkWriter("out.txt", compression="lz4")
+    with pytest.raises(ValueError, match="chunk_rows"):
+        BulkWriter("out.txt", chunk_rows=0)
@@ -0,0 +1,34 @@
+import pytest
+from typing import Iterator
+from modules.ordered_pool import map_ordered
+
+def scale(task: int, factor: int) -> int:
+    """Module-level task function, picklable for worker processes."""
+    return task * factor
+
+def test_map_ordered_keeps_task_order() -> None:
+    """Test that results come back in task order, in-process and in a pool."""
+    for workers in (1, 2):
+        result = list(map_ordered(scale, range(20), 3, workers=workers, max_pending=2))
+        assert result == [i * 3 for i in range(20)], f"Should keep order with {workers} workers"
+
+def test_map_ordered_reads_tasks_lazily() -> None:
+    """Test that tasks are read ahead at most max_pending deep."""
+    read: list[int] = []
+
+    def tasks() -> Iterator[int]:
+        for i in range(100):
+            read.append(i)
+            yield i
+
+    results = map_ordered(scale, tasks(), 1, workers=2, max_pending=3)
+    assert next(results) == 0
+    assert len(read) <= 4, "Should not read tasks far ahead of the workers"
+    assert list(results) == list(range(1, 100)), "Should yield the remaining results"
+
+def test_map_ordered_invalid_options() -> None:
+    """Test option validation."""
+    with pytest.raises(ValueError):
+        list(map_ordered(scale, [1], 1, workers=0))
+    with pytest.raises(ValueError):
+        list(map_ordered(scale, [1], 1, workers=2, max_pending=-1))